@@ -1,11 +1,12 @@
 from multipledispatch import dispatch
 from src.application.club.commands import ChangeClubOwnerCommand, CreateClubCommand
-from src.common.cqrs.messages import CommandHandler, IAuthService, IEventPublisher
+from src.common.cqrs.messages import CommandHandler, IAuthService, IEventPublisher, RetryPolicy
 from src.common.eventsourcing.event_stores import IEventStore
 from src.common.eventsourcing.repositories import IEventStoreRepository
 from src.domains.club.model import Club, ClubCreateData
 
 class ClubService(CommandHandler):
+    retry_policy = RetryPolicy(max_attempts=3)
 
     def __init__(self, auth_service: IAuthService, event_publisher: IEventPublisher, club_repo: IEventStoreRepository[Club]):
         super().__init__(auth_service, event_publisher)
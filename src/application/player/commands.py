@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from src.common.cqrs.messages import Command
 from src.common.enums import LicenseType
@@ -13,4 +13,29 @@ class RegisterPlayerCommand(Command):
     date_of_birth: date
     season: str
     license_number: str | None = None
-    license_type: LicenseType | None = None
\ No newline at end of file
+    license_type: LicenseType | None = None
+
+@dataclass
+class PlayerRegistration:
+    first_name: str
+    last_name: str
+    gender: Gender
+    date_of_birth: date
+    license_number: str | None = None
+    license_type: LicenseType | None = None
+
+@dataclass
+class RegisterPlayersCommand(Command):
+    club_id: str
+    season: str
+    players: list[PlayerRegistration]
+
+@dataclass
+class PlayerRegistrationError:
+    row: int
+    message: str
+
+@dataclass
+class RegisterPlayersResult:
+    player_ids: list[str] = field(default_factory=list)
+    errors: list[PlayerRegistrationError] = field(default_factory=list)
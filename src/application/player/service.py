@@ -1,13 +1,15 @@
 from multipledispatch import dispatch
-from src.application.player.commands import RegisterPlayerCommand
-from src.common.cqrs.messages import CommandHandler, IAuthService, IEventPublisher
+from src.application.player.commands import PlayerRegistration, PlayerRegistrationError, RegisterPlayerCommand, RegisterPlayersCommand, RegisterPlayersResult
+from src.common.cqrs.messages import CommandHandler, IAuthService, IEventPublisher, RetryPolicy
 from src.common.eventsourcing.exceptions import InvalidOperationError
+from src.common.exceptions import GenericError
 from src.common.eventsourcing.repositories import IEventStoreRepository
 from src.domains.club.model import Club
 from src.domains.federation.model import Federation
 from src.domains.player.model import Player, PlayerRegisterData
 
 class PlayerService(CommandHandler):
+    retry_policy = RetryPolicy(max_attempts=5)
 
     def __init__(self, auth_service: IAuthService, event_publisher: IEventPublisher, player_repo: IEventStoreRepository[Player], club_repo: IEventStoreRepository[Club], federation_repo: IEventStoreRepository[Federation]):
         super().__init__(auth_service, event_publisher)
@@ -21,14 +23,38 @@ class PlayerService(CommandHandler):
         federation = await self._federation_repo.get_singleton_aggregate()
         if command.license_number and federation.get_player_license(command.license_number):
             raise InvalidOperationError(f"License {command.license_number} already registered")
-        player = Player(player_create_data=PlayerRegisterData(
-            actor_id=command.actor_id,
-            first_name=command.first_name, 
-            last_name=command.last_name, 
-            gender=command.gender, 
-            date_of_birth=command.date_of_birth, 
-            license_number=command.license_number))
-        federation.register_player_license(player.id, command.license_number, command.license_type, command.actor_id)
-        player.register_to_club(command.club_id, command.season, command.license_type, command.actor_id)
+        player = self.__register(federation, command.actor_id, command.club_id, command.season, command)
         await self._federation_repo.save(federation, -1)
         await self._player_repo.save(player, -1)
+
+    @dispatch(RegisterPlayersCommand)
+    async def _handle(self, command: RegisterPlayersCommand) -> RegisterPlayersResult:
+        await self._club_repo.get_by_id(command.club_id)
+        federation = await self._federation_repo.get_singleton_aggregate()
+        result = RegisterPlayersResult()
+        players = []
+        for row, registration in enumerate(command.players):
+            try:
+                if registration.license_number and federation.get_player_license(registration.license_number):
+                    raise InvalidOperationError(f"License {registration.license_number} already registered")
+                players.append(self.__register(federation, command.actor_id, command.club_id, command.season, registration))
+            except GenericError as e:
+                result.errors.append(PlayerRegistrationError(row=row, message=e.message))
+        if players:
+            await self._player_repo.save_all([federation, *players])
+        result.player_ids = [player.id for player in players]
+        return result
+
+    @staticmethod
+    def __register(federation: Federation, actor_id: str, club_id: str, season: str, registration: PlayerRegistration | RegisterPlayerCommand) -> Player:
+        player = Player(player_create_data=PlayerRegisterData(
+            actor_id=actor_id,
+            first_name=registration.first_name,
+            last_name=registration.last_name,
+            gender=registration.gender,
+            date_of_birth=registration.date_of_birth,
+            license_number=registration.license_number))
+        if registration.license_number:
+            federation.register_player_license(player.id, registration.license_number, registration.license_type, actor_id)
+        player.register_to_club(club_id, season, registration.license_type, actor_id)
+        return player
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import date
+import unittest
+
+from src.application.player.commands import PlayerRegistration, RegisterPlayersCommand
+from src.application.player.service import PlayerService
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.common.cqrs.testing import AllowAll, CountingEventStore, FakeBus
+from src.common.enums import Gender, LicenseType
+from src.common.eventsourcing.event import IEvent
+from src.common.eventsourcing.repositories import EventStoreRepository
+from src.domains.club.model import Club, ClubCreateData
+from src.domains.federation.model import Federation
+from src.domains.player.model import Player
+
+
+class ConflictingEventStore(CountingEventStore):
+    """
+    In-memory store registering a license on the federation right before the first append it receives.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.conflict = True
+
+    async def save_events_batch(self, appends : list[tuple[str, list[IEvent], int]]) -> None:
+        if self.conflict and any(aggregate_id == Federation.to_stream_id(Federation().id) for aggregate_id, _, _ in appends):
+            self.conflict = False
+            federation_repo = EventStoreRepository(self, Federation)
+            federation = await federation_repo.get_singleton_aggregate()
+            federation.register_player_license("player-elsewhere", "L0", LicenseType.A, SYSTEM_ACTOR_ID)
+            await federation_repo.save(federation, federation.version)
+        await super().save_events_batch(appends)
+
+
+class TestPlayerService(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.store = CountingEventStore()
+        self.club = Club(club_create_data=ClubCreateData(actor_id=SYSTEM_ACTOR_ID, name="Club", owner_id="1"))
+        asyncio.run(EventStoreRepository(self.store, Club).save(self.club, -1))
+        self.player_repo = EventStoreRepository(self.store, Player)
+        self.federation_repo = EventStoreRepository(self.store, Federation)
+        self.service = PlayerService(AllowAll(), FakeBus(), self.player_repo, EventStoreRepository(self.store, Club), self.federation_repo)
+
+    def test_players_are_registered_in_a_single_append_with_per_row_errors(self) -> None:
+        self.store.appends = 0
+        players = [PlayerRegistration(first_name=f"First {i}", last_name="Last", gender=Gender.M, date_of_birth=date(2010, 1, 1), license_number=f"L{i}", license_type=LicenseType.A) for i in range(5)]
+        players.append(PlayerRegistration(first_name="Twin", last_name="Last", gender=Gender.M, date_of_birth=date(2010, 1, 1), license_number="L2", license_type=LicenseType.A))
+        players.append(PlayerRegistration(first_name="Unlicensed", last_name="Last", gender=Gender.F, date_of_birth=date(2010, 1, 1)))
+        players.append(PlayerRegistration(first_name="Unlicensed", last_name="Too", gender=Gender.F, date_of_birth=date(2010, 1, 1)))
+
+        result = asyncio.run(self.service.handle(RegisterPlayersCommand(actor_id=SYSTEM_ACTOR_ID, club_id=self.club.id, season="2025/2026", players=players)))
+
+        assert self.store.appends == 1
+        assert [(error.row, error.message) for error in result.errors] == [(5, "License L2 already registered")]
+        assert len(set(result.player_ids)) == 7
+        federation = asyncio.run(self.federation_repo.get_singleton_aggregate())
+        assert set(federation.player_licenses) == {f"L{i}" for i in range(5)}
+        player = asyncio.run(self.player_repo.get_by_id(result.player_ids[-1]))
+        assert (player.first_name, player.club_id) == ("Unlicensed", self.club.id)
+
+    def test_a_federation_conflict_is_retried(self) -> None:
+        store = ConflictingEventStore()
+        club = Club(club_create_data=ClubCreateData(actor_id=SYSTEM_ACTOR_ID, name="Club", owner_id="1"))
+        asyncio.run(EventStoreRepository(store, Club).save(club, -1))
+        federation_repo = EventStoreRepository(store, Federation)
+        service = PlayerService(AllowAll(), FakeBus(), EventStoreRepository(store, Player), EventStoreRepository(store, Club), federation_repo)
+        players = [PlayerRegistration(first_name=f"First {i}", last_name="Last", gender=Gender.M, date_of_birth=date(2010, 1, 1), license_number=f"L{i}", license_type=LicenseType.A) for i in range(3)]
+
+        result = asyncio.run(service.handle(RegisterPlayersCommand(actor_id=SYSTEM_ACTOR_ID, club_id=club.id, season="2025/2026", players=players)))
+
+        # the retry sees the license registered concurrently
+        assert [(error.row, error.message) for error in result.errors] == [(0, "License L0 already registered")]
+        assert len(result.player_ids) == 2
+        federation = asyncio.run(federation_repo.get_singleton_aggregate())
+        assert federation.player_licenses["L0"].player_id == "player-elsewhere"
+        assert set(federation.player_licenses) == {"L0", "L1", "L2"}
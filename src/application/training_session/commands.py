@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from src.common.cqrs.messages import Command
 from src.common.enums import TrainingSessionPlayerStatus
 from datetime import datetime
@@ -19,6 +19,20 @@ class ChangePlayerTrainingSessionStatusCommand(Command):
     arrival_time: datetime | None = None
     with_reason: bool = False
 
+@dataclass
+class ChangePlayersTrainingSessionStatusCommand(Command):
+    """
+    Set the status of several players at once, the given players or, when none are given, every member of the collective.
+    """
+    club_id: str
+    training_session_id: str
+    status: TrainingSessionPlayerStatus
+    player_ids: list[str] = field(default_factory=list)
+    collective_id: str | None = None
+    reason: str | None = None
+    arrival_time: datetime | None = None
+    with_reason: bool = False
+
 @dataclass
 class RemovePlayerFromTrainingSessionCommand(Command):
     club_id: str
@@ -1,18 +1,35 @@
+import asyncio
 from multipledispatch import dispatch
-from src.application.training_session.commands import ChangePlayerTrainingSessionStatusCommand, CreateTrainingSessionCommand, RemovePlayerFromTrainingSessionCommand
-from src.common.cqrs.messages import CommandHandler, IAuthService, IEventPublisher
+from src.application.training_session.commands import ChangePlayerTrainingSessionStatusCommand, ChangePlayersTrainingSessionStatusCommand, CreateTrainingSessionCommand, RemovePlayerFromTrainingSessionCommand
+from src.common.cqrs.messages import CommandHandler, IAuthService, IEventPublisher, RetryPolicy
 from src.common.eventsourcing.exceptions import InvalidOperationError
 from src.common.eventsourcing.repositories import IEventStoreRepository
+from src.domains.collective.model import Collective
 from src.domains.player.model import Player
 from src.domains.training_session.model import TrainingSession, TrainingSessionCreate
+from src.read_facades.player_membership_index import PlayerMembershipIndex
 from src.common.loggers import app_logger
 
 class TrainingSessionService(CommandHandler):
+    retry_policy = RetryPolicy(max_attempts=5)
 
-    def __init__(self, auth_service: IAuthService, event_publisher: IEventPublisher, training_session_repo: IEventStoreRepository[TrainingSession], player_repo: IEventStoreRepository[Player]):
+    def __init__(self, auth_service: IAuthService, event_publisher: IEventPublisher, training_session_repo: IEventStoreRepository[TrainingSession], player_repo: IEventStoreRepository[Player], collective_repo: IEventStoreRepository[Collective], membership_index: PlayerMembershipIndex | None = None):
         super().__init__(auth_service, event_publisher)
         self._training_session_repo = training_session_repo
         self._player_repo = player_repo
+        self._collective_repo = collective_repo
+        self._membership_index = membership_index
+
+    async def _player_club_id(self, player_id: str) -> str | None:
+        """
+        Club of a player, from the membership index while it is up to date with the player stream, from the aggregate otherwise.
+        """
+        if self._membership_index:
+            membership = self._membership_index.get(player_id)
+            if membership and membership.version == await self._player_repo.get_version(player_id):
+                return membership.club_id
+        player = await self._player_repo.get_by_id(player_id)
+        return player.club_id
 
     @dispatch(CreateTrainingSessionCommand)
     async def _handle(self, command: CreateTrainingSessionCommand) -> None:
@@ -30,13 +47,35 @@ class TrainingSessionService(CommandHandler):
         app_logger.info(f"Training session: {training_session.id} {training_session.club_id} {command.club_id}")
         if training_session.club_id != command.club_id:
             raise InvalidOperationError("Training session is not in the club")
-        player = await self._player_repo.get_by_id(command.player_id)
-        if player.club_id != command.club_id:
+        if await self._player_club_id(command.player_id) != command.club_id:
             raise InvalidOperationError("Player is not in the club")
         
         training_session.change_player_status(actor_id=command.actor_id, player_id=command.player_id, status=command.status, reason=command.reason, with_reason=command.with_reason, arrival_time=command.arrival_time)
         await self._training_session_repo.save(training_session, training_session.version)
 
+    @dispatch(ChangePlayersTrainingSessionStatusCommand)
+    async def _handle(self, command: ChangePlayersTrainingSessionStatusCommand) -> None:
+        training_session = await self._training_session_repo.get_by_id(command.training_session_id)
+        if training_session.club_id != command.club_id:
+            raise InvalidOperationError("Training session is not in the club")
+        if command.collective_id:
+            collective = await self._collective_repo.get_by_id(command.collective_id)
+            if collective.club_id != command.club_id:
+                raise InvalidOperationError("Collective is not in the club")
+            player_ids = command.player_ids or collective.players
+            if outsiders := set(player_ids) - set(collective.players):
+                raise InvalidOperationError(f"Players {sorted(outsiders)} are not in the collective")
+        elif not command.player_ids:
+            raise InvalidOperationError("No players given")
+        else:
+            player_ids = command.player_ids
+            club_ids = await asyncio.gather(*[self._player_club_id(player_id) for player_id in dict.fromkeys(player_ids)])
+            if outsiders := [player_id for player_id, club_id in zip(dict.fromkeys(player_ids), club_ids) if club_id != command.club_id]:
+                raise InvalidOperationError(f"Players {sorted(outsiders)} are not in the club")
+
+        training_session.change_players_status(actor_id=command.actor_id, player_ids=list(dict.fromkeys(player_ids)), status=command.status, reason=command.reason, with_reason=command.with_reason, arrival_time=command.arrival_time)
+        await self._training_session_repo.save(training_session, training_session.version)
+
     @dispatch(RemovePlayerFromTrainingSessionCommand)
     async def _handle(self, command: RemovePlayerFromTrainingSessionCommand) -> None:
         training_session = await self._training_session_repo.get_by_id(command.training_session_id)
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import date, datetime
+import os
+import tempfile
+import unittest
+
+import pytest
+
+from src.application.training_session.commands import ChangePlayerTrainingSessionStatusCommand, ChangePlayersTrainingSessionStatusCommand
+from src.application.training_session.service import TrainingSessionService
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.common.cqrs.testing import AllowAll, CountingEventStore, FakeBus
+from src.common.enums import Gender, LicenseType, TrainingSessionPlayerStatus
+from src.common.eventsourcing.event_stores import JsonLinesEventStore
+from src.common.eventsourcing.exceptions import InvalidOperationError
+from src.common.eventsourcing.repositories import EventStoreRepository
+from src.domains.collective.model import Collective, CollectiveCreateData
+from src.domains.player.events import PlayerRegistered
+from src.domains.player.model import Player, PlayerRegisterData
+from src.domains.training_session.model import TrainingSession, TrainingSessionCreate
+from src.read_facades.player_membership_index import PlayerMembership, PlayerMembershipIndex
+
+
+class TestTrainingSessionService(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.store = CountingEventStore()
+        self.training_session_repo = EventStoreRepository(self.store, TrainingSession)
+        collective_repo = EventStoreRepository(self.store, Collective)
+        self.training_session = TrainingSession(create=TrainingSessionCreate(actor_id=SYSTEM_ACTOR_ID, club_id="club-1", start_time=datetime(2025, 10, 2, 18), end_time=datetime(2025, 10, 2, 20)))
+        asyncio.run(self.training_session_repo.save(self.training_session, -1))
+        self.collective = Collective(collective_create_data=CollectiveCreateData(actor_id=SYSTEM_ACTOR_ID, club_id="club-1", name="U13"))
+        for i in range(3):
+            self.collective.add_player(f"player-{i}", SYSTEM_ACTOR_ID)
+        asyncio.run(collective_repo.save(self.collective, -1))
+        self.service = TrainingSessionService(AllowAll(), FakeBus(), self.training_session_repo, EventStoreRepository(self.store, Player), collective_repo)
+
+    def test_every_collective_member_is_marked_in_a_single_append(self) -> None:
+        self.store.appends = 0
+        asyncio.run(self.service.handle(ChangePlayersTrainingSessionStatusCommand(actor_id=SYSTEM_ACTOR_ID, club_id="club-1", training_session_id=self.training_session.id, collective_id=self.collective.id, status=TrainingSessionPlayerStatus.ABSENT, reason="school trip", with_reason=True)))
+
+        assert self.store.appends == 1
+        training_session = asyncio.run(self.training_session_repo.get_by_id(self.training_session.id))
+        assert training_session.players == {f"player-{i}": TrainingSessionPlayerStatus.ABSENT for i in range(3)}
+        assert training_session.attendance["player-2"].reason == "school trip"
+
+    def test_players_outside_the_collective_are_rejected(self) -> None:
+        with pytest.raises(InvalidOperationError):
+            asyncio.run(self.service.handle(ChangePlayersTrainingSessionStatusCommand(actor_id=SYSTEM_ACTOR_ID, club_id="club-1", training_session_id=self.training_session.id, collective_id=self.collective.id, player_ids=["player-0", "player-9"], status=TrainingSessionPlayerStatus.PRESENT)))
+
+        assert asyncio.run(self.training_session_repo.get_by_id(self.training_session.id)).players == {}
+
+
+class CountingRepository(EventStoreRepository):
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.loads = 0
+
+    async def get_by_id(self, id: str):
+        self.loads += 1
+        return await super().get_by_id(id)
+
+
+class TestPlayerMembershipValidation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = PlayerMembershipIndex()
+        self.store = JsonLinesEventStore(os.path.join(self.directory.name, "event_store.jsonl"), [self.index])
+        self.training_session_repo = EventStoreRepository(self.store, TrainingSession)
+        self.player_repo = CountingRepository(self.store, Player)
+        self.training_session = TrainingSession(create=TrainingSessionCreate(actor_id=SYSTEM_ACTOR_ID, club_id="club-1", start_time=datetime(2025, 10, 2, 18), end_time=datetime(2025, 10, 2, 20)))
+        asyncio.run(self.training_session_repo.save(self.training_session, -1))
+        self.player = Player(player_create_data=PlayerRegisterData(actor_id=SYSTEM_ACTOR_ID, first_name="Tom", last_name="Bernard", gender=Gender.M, date_of_birth=date(2010, 1, 1)))
+        self.player.register_to_club("club-1", "2025/2026", LicenseType.A, SYSTEM_ACTOR_ID)
+        asyncio.run(self.player_repo.save(self.player, -1))
+
+    def tearDown(self) -> None:
+        asyncio.run(self.store.close())
+        self.directory.cleanup()
+        super().tearDown()
+
+    def mark_present(self, membership_index: PlayerMembershipIndex) -> None:
+        service = TrainingSessionService(AllowAll(), FakeBus(), self.training_session_repo, self.player_repo, EventStoreRepository(self.store, Collective), membership_index)
+        asyncio.run(service.handle(ChangePlayerTrainingSessionStatusCommand(actor_id=SYSTEM_ACTOR_ID, club_id="club-1", training_session_id=self.training_session.id, player_id=self.player.id, status=TrainingSessionPlayerStatus.PRESENT)))
+
+    def test_an_up_to_date_index_spares_the_player_rehydration(self) -> None:
+        assert self.index.get(self.player.id) == PlayerMembership("club-1", "2025/2026", 1)
+        self.mark_present(self.index)
+        assert self.player_repo.loads == 0
+
+    def test_a_stale_index_falls_back_to_the_aggregate(self) -> None:
+        # the index missed the registration to the club, its entry says the player has none
+        stale_index = PlayerMembershipIndex()
+        stale_index.update_read_model(PlayerRegistered(actor_id=SYSTEM_ACTOR_ID, player_id=self.player.id, first_name="Tom", last_name="Bernard", gender=Gender.M, date_of_birth="2010-01-01"))
+        self.mark_present(stale_index)
+        assert self.player_repo.loads == 1
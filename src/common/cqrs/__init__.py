@@ -1 +1 @@
-from .messages import Command, IntegrationEvent, IntegrationEventHandler, CommandHandler, IAuthService, IMessageBroker
\ No newline at end of file
+from .messages import Command, IntegrationEvent, IntegrationEventHandler, CommandHandler, IAuthService, IMessageBroker, RetryPolicy
\ No newline at end of file
@@ -1,8 +1,12 @@
 import abc
+import asyncio
+import random
 
 from src.common.guid import guid
 from src.common.exceptions import GenericError
 from src.common.cqrs.exceptions import UnauthorizedError
+from src.common.eventsourcing.exceptions import ConcurrencyError
+from src.common.loggers import app_logger
 from multipledispatch import dispatch
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -51,7 +55,22 @@ class ICommandSender(abc.ABC):
 class IMessageBroker(IEventPublisher, ICommandSender):
     pass
 
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How many times a command is re-run when saving its aggregate raises a ConcurrencyError,
+    waiting a jittered exponential backoff between attempts.
+    """
+    max_attempts : int = 1
+    base_delay : float = 0.01
+    max_delay : float = 0.5
+
+    def backoff(self, attempt : int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
 class CommandHandler(abc.ABC):
+    retry_policy : RetryPolicy = RetryPolicy()
+
     def __init__(self, auth_service : "IAuthService", message_broker : "IEventPublisher") -> None:
         self._auth_service = auth_service
         self._message_broker = message_broker
@@ -62,7 +81,16 @@ class CommandHandler(abc.ABC):
 
     async def handle(self, command : "Command")  -> None:
         await self._auth_service.authorize_command(command)
-        await self._handle(command)
+        attempt = 1
+        while True:
+            try:
+                return await self._handle(command)
+            except ConcurrencyError:
+                if attempt >= self.retry_policy.max_attempts:
+                    raise
+                app_logger.debug(f"Concurrency conflict on {command.__class__.__name__} {command.command_id}, retry {attempt}")
+                await asyncio.sleep(self.retry_policy.backoff(attempt))
+                attempt += 1
 
 
 class IntegrationEventHandler(abc.ABC):
@@ -0,0 +1,46 @@
+import asyncio
+from dataclasses import dataclass
+import unittest
+
+import pytest
+from multipledispatch import dispatch
+
+from src.common.cqrs.messages import Command, CommandHandler, RetryPolicy
+from src.common.cqrs.testing import AllowAll, FakeBus
+from src.common.eventsourcing.exceptions import ConcurrencyError
+
+
+@dataclass
+class FlakyCommand(Command):
+    conflicts: int
+
+class FlakyHandler(CommandHandler):
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+    def __init__(self) -> None:
+        super().__init__(AllowAll(), FakeBus())
+        self.attempts = 0
+
+    @dispatch(FlakyCommand)
+    async def _handle(self, command: FlakyCommand) -> None:
+        self.attempts += 1
+        if self.attempts <= command.conflicts:
+            raise ConcurrencyError()
+
+
+class TestCommandHandlerRetry(unittest.TestCase):
+
+    def test_command_is_retried_on_concurrency_error(self) -> None:
+        handler = FlakyHandler()
+        asyncio.run(handler.handle(FlakyCommand(actor_id="1", conflicts=2)))
+        assert handler.attempts == 3
+
+    def test_concurrency_error_is_raised_once_attempts_are_exhausted(self) -> None:
+        handler = FlakyHandler()
+        with pytest.raises(ConcurrencyError):
+            asyncio.run(handler.handle(FlakyCommand(actor_id="1", conflicts=3)))
+        assert handler.attempts == 3
+
+    def test_backoff_is_bounded_by_max_delay(self) -> None:
+        policy = RetryPolicy(max_attempts=10, base_delay=0.1, max_delay=0.2)
+        assert all(0 <= policy.backoff(attempt) <= 0.2 for attempt in range(1, 10))
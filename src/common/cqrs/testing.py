@@ -1,4 +1,6 @@
-from src.common.cqrs.messages import IEventPublisher, IntegrationEvent
+from src.common.cqrs.messages import Command, IAuthService, IEventPublisher, IntegrationEvent
+from src.common.eventsourcing.event import IEvent
+from src.common.eventsourcing.event_stores import InMemEventStore
 
 
 class FakeBus(IEventPublisher):
@@ -7,4 +9,20 @@ class FakeBus(IEventPublisher):
         self.events : list[IntegrationEvent] = []
 
     async def publish(self, event : IntegrationEvent) -> None:
-        self.events.append(event)
\ No newline at end of file
+        self.events.append(event)
+
+class AllowAll(IAuthService):
+    async def _condition_are_met(self, command : Command) -> bool:
+        return True
+
+class CountingEventStore(InMemEventStore):
+    """
+    In-memory store counting the appends it receives, a batch counting as one.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.appends = 0
+
+    async def save_events_batch(self, appends : list[tuple[str, list[IEvent], int]]) -> None:
+        self.appends += 1
+        await super().save_events_batch(appends)
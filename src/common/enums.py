@@ -56,16 +56,30 @@ class Season:
     def display_name(self) -> str:
         return f"Season {self.value}"
     
+    @property
+    def start_date(self) -> date:
+        """First day of the season, included"""
+        return date(self.start_year, 8, 1)
+
+    @property
+    def end_date(self) -> date:
+        """First day of the next season, excluded"""
+        return date(self.end_year, 8, 1)
+
     @classmethod
     def current(cls) -> 'Season':
         """Get the current season based on current date"""
-        now = datetime.now()
+        return cls.from_date(datetime.now())
+
+    @classmethod
+    def from_date(cls, day: date) -> 'Season':
+        """Get the season a given date belongs to"""
         # Handball seasons typically start in August/September
         # If we're in the first half of the year, we're still in the previous season
-        if now.month < 8:
-            start_year = now.year - 1
+        if day.month < 8:
+            start_year = day.year - 1
         else:
-            start_year = now.year
+            start_year = day.year
         return cls(start_year, start_year + 1)
     
     @classmethod
@@ -1,3 +1,3 @@
-from .aggregates import AggregateRoot
+from .aggregates import AggregateRoot, SnapshotAggregateRoot
 from .repositories import IEventStoreRepository
-from .event import IEvent
\ No newline at end of file
+from .event import IEvent, Snapshot
\ No newline at end of file
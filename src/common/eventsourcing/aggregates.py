@@ -1,5 +1,6 @@
 import abc
-from .event import IEvent
+from typing import AsyncIterable
+from .event import IEvent, Snapshot
 
 class AggregateRoot(abc.ABC):
     """
@@ -40,7 +41,9 @@ class AggregateRoot(abc.ABC):
     def mark_changes_as_committed(self) -> None:
         """
         Mark all uncommitted changes as committed by clearing the changes list.
+        The version moves forward by the number of committed changes.
         """
+        self.__version += len(self.__changes)
         self.__changes.clear()
 
 
@@ -50,14 +53,31 @@ class AggregateRoot(abc.ABC):
         """
         self.__changes.clear()
         for e in history:
-            self.__apply_change(e, False)
-            self.__version += 1
+            self.__load_change(e)
+
+    async def loads_from_stream(self, history : AsyncIterable[IEvent]) -> None:
+        """
+        Load the aggregate root from a stream of events, applying each one as soon as it is read.
+        """
+        self.__changes.clear()
+        async for e in history:
+            self.__load_change(e)
 
     def _apply(self, e : "IEvent") -> None:
         """
         Abstract method to apply a change to the aggregate root.
         """
 
+    def __load_change(self, event : "IEvent") -> None:
+        """
+        Apply a committed change. A snapshot restores the version of the last event it replaces.
+        """
+        self.__apply_change(event, False)
+        if isinstance(event, Snapshot):
+            self.__version = event.archived_version
+        else:
+            self.__version += 1
+
     def __apply_change(self, event : "IEvent", is_new : bool) -> None:
         """
         Apply a change to the aggregate root and optionally mark it as new.
@@ -70,4 +90,14 @@ class AggregateRoot(abc.ABC):
         """
         Apply a new change to the aggregate root.
         """
-        self.__apply_change(event, True)
\ No newline at end of file
+        self.__apply_change(event, True)
+
+class SnapshotAggregateRoot(AggregateRoot):
+    """
+    Aggregate root whose history can be compacted into a snapshot event.
+    """
+    @abc.abstractmethod
+    def take_snapshot(self, archive : str) -> Snapshot:
+        """
+        Build a snapshot event of the current state, pointing to the archive segment of the events it replaces.
+        """
@@ -0,0 +1,107 @@
+import abc
+import json
+import os
+from dataclasses import dataclass, field
+
+from .aggregates import SnapshotAggregateRoot
+from .event import Snapshot
+from .event_stores import EventDescriptor, decode_event, get_event_class
+
+
+class CompactionPolicy(abc.ABC):
+    """
+    Decides which streams of an event log are archived, and how much of them.
+    Only the streams of aggregates able to take a snapshot can be compacted.
+    """
+    aggregate_type : type[SnapshotAggregateRoot]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        aggregate_type = cls.__dict__.get("aggregate_type")
+        if aggregate_type is not None and not issubclass(aggregate_type, SnapshotAggregateRoot):
+            raise TypeError(f"{aggregate_type.__name__} does not support snapshots")
+
+    @abc.abstractmethod
+    def matches(self, stream_id : str) -> bool:...
+
+    @abc.abstractmethod
+    def archived_count(self, stream_id : str, event_descriptors : list[dict]) -> int:
+        """
+        Number of leading events of the stream to move to the archive.
+        """
+
+    @abc.abstractmethod
+    def segment(self, stream_id : str, event_descriptors : list[dict]) -> str:
+        """
+        Name of the archive segment receiving the archived events of the stream.
+        """
+
+@dataclass
+class CompactionReport:
+    compacted_streams : int = 0
+    archived_events : int = 0
+    segments : set[str] = field(default_factory=set)
+
+def is_snapshot(event_descriptor : dict) -> bool:
+    return issubclass(get_event_class(event_descriptor["event_type"]), Snapshot)
+
+def compact_event_log(file_path : str, archive_dir : str, policies : list[CompactionPolicy]) -> CompactionReport:
+    """
+    Move the archived part of the matching streams of a JsonLinesEventStore log to segment files,
+    leaving a snapshot event in place of the last archived event of each stream.
+
+    This is an offline operation: the event store must not be running while the log is rewritten.
+    Segments are written (and synced) before the log is atomically replaced.
+    """
+    with open(file_path, "r") as f:
+        event_descriptors = [json.loads(line) for line in f if line.endswith("\n")]
+    streams : dict[str, list[int]] = {}
+    for position, event_descriptor in enumerate(event_descriptors):
+        streams.setdefault(event_descriptor["id"], []).append(position)
+
+    report = CompactionReport()
+    replaced : dict[int, dict | None] = {}
+    segments : dict[str, list[dict]] = {}
+    for stream_id, positions in streams.items():
+        policy = next((policy for policy in policies if policy.matches(stream_id)), None)
+        if policy is None:
+            continue
+        stream = [event_descriptors[position] for position in positions]
+        count = policy.archived_count(stream_id, stream)
+        archived = stream[:count]
+        if not [event_descriptor for event_descriptor in archived if not is_snapshot(event_descriptor)]:
+            continue
+        segment = policy.segment(stream_id, stream)
+        aggregate = policy.aggregate_type()
+        aggregate.loads_from_history([decode_event(event_descriptor) for event_descriptor in archived])
+        snapshot = aggregate.take_snapshot(f"{segment}.jsonl")
+        for position in positions[:count - 1]:
+            replaced[position] = None
+        replaced[positions[count - 1]] = EventDescriptor(stream_id, snapshot.type, json.dumps(snapshot.to_dict()), aggregate.version).to_dict()
+        # snapshots are derived data, only the original events go to the archive
+        segments.setdefault(segment, []).extend(event_descriptor for event_descriptor in archived if not is_snapshot(event_descriptor))
+        report.compacted_streams += 1
+        report.archived_events += count
+
+    if not replaced:
+        return report
+
+    os.makedirs(archive_dir, exist_ok=True)
+    for segment, archived in segments.items():
+        with open(os.path.join(archive_dir, f"{segment}.jsonl"), "a") as f:
+            for event_descriptor in archived:
+                f.write(json.dumps(event_descriptor) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        report.segments.add(segment)
+
+    tmp_path = f"{file_path}.compacting"
+    with open(tmp_path, "w") as f:
+        for position, event_descriptor in enumerate(event_descriptors):
+            event_descriptor = replaced.get(position, event_descriptor)
+            if event_descriptor is not None:
+                f.write(json.dumps(event_descriptor) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+    return report
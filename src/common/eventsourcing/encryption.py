@@ -1,8 +1,9 @@
+from collections import OrderedDict
 from functools import wraps
 from cryptography.fernet import Fernet
 import abc
-from copy import deepcopy
-from typing import Optional, List, Type, Callable
+import threading
+from typing import Iterable, Optional, List, Type, Callable
 from src.common.eventsourcing.data import Data
 
 class ICryptoStore(abc.ABC):
@@ -20,10 +21,55 @@ class ICryptoStore(abc.ABC):
     def remove(self, id: str) -> None:
         """Remove an encryption key by ID."""
 
+    def get_encryption_keys(self, ids: Iterable[str]) -> dict[str, bytes]:
+        """Retrieve the existing encryption keys of several IDs at once."""
+        keys = {id: self.get_encryption_key(id) for id in ids}
+        return {id: key for id, key in keys.items() if key is not None}
+
+    def add_missing(self, new_encryption_keys: dict[str, bytes]) -> dict[str, bytes]:
+        """Add the new keys of the IDs having none, returning the stored key of every ID."""
+        keys = self.get_encryption_keys(new_encryption_keys)
+        for id, new_encryption_key in new_encryption_keys.items():
+            if id not in keys:
+                self.add(id, new_encryption_key)
+                keys[id] = new_encryption_key
+        return keys
+
+    async def add_missing_async(self, new_encryption_keys: dict[str, bytes]) -> dict[str, bytes]:
+        """Add the new keys of the IDs having none without blocking the event loop."""
+        return self.add_missing(new_encryption_keys)
+
 class CryptoRepository:
-    """Repository for managing encryption keys."""
+    """
+    Repository for managing encryption keys.
+
+    Fernet instances are kept in an LRU cache per subject, including the subjects known to have
+    no key (e.g. shredded ones), so replaying a stream does not hit the store once per event.
+    The cache is shared with the threads decrypting event batches.
+    """
 
     crypto_store: ICryptoStore
+    fernet_cache_size: int = 10_000
+    __fernets: OrderedDict[str, Fernet | None] = OrderedDict()
+    __lock = threading.RLock()
+
+    @staticmethod
+    def __cache(id: str, fernet: Fernet | None) -> Fernet | None:
+        with CryptoRepository.__lock:
+            fernets = CryptoRepository.__fernets
+            fernets[id] = fernet
+            fernets.move_to_end(id)
+            while len(fernets) > CryptoRepository.fernet_cache_size:
+                fernets.popitem(last=False)
+            return fernet
+
+    @staticmethod
+    def __cached(id: str) -> tuple[bool, Fernet | None]:
+        with CryptoRepository.__lock:
+            if id not in CryptoRepository.__fernets:
+                return False, None
+            CryptoRepository.__fernets.move_to_end(id)
+            return True, CryptoRepository.__fernets[id]
 
     @staticmethod
     def get_existing_or_new(id: str) -> bytes:
@@ -35,6 +81,7 @@ class CryptoRepository:
 
         new_encryption_key = Fernet.generate_key()
         CryptoRepository.crypto_store.add(id=id, new_encryption_key=new_encryption_key)
+        CryptoRepository.__cache(id, Fernet(new_encryption_key))
         return new_encryption_key
 
     @staticmethod
@@ -42,10 +89,61 @@ class CryptoRepository:
         """Get an existing key or return None if not found."""
         return CryptoRepository.crypto_store.get_encryption_key(id=id)
 
+    @staticmethod
+    def get_fernet_or_new(id: str) -> Fernet:
+        """Get the cached Fernet of an ID, creating its encryption key if not found."""
+        _, fernet = CryptoRepository.__cached(id)
+        if fernet is not None:
+            return fernet
+        return CryptoRepository.__cache(id, Fernet(CryptoRepository.get_existing_or_new(id)))
+
+    @staticmethod
+    def get_fernet_or_none(id: str) -> Optional[Fernet]:
+        """Get the cached Fernet of an ID, or None if it has no encryption key."""
+        found, fernet = CryptoRepository.__cached(id)
+        if found:
+            return fernet
+        encryption_key = CryptoRepository.get_existing_or_none(id)
+        return CryptoRepository.__cache(id, Fernet(encryption_key) if encryption_key is not None else None)
+
+    @staticmethod
+    def prefetch(ids: Iterable[str]) -> None:
+        """Load the encryption keys of several IDs with a single store lookup."""
+        with CryptoRepository.__lock:
+            missing = {id for id in ids if id not in CryptoRepository.__fernets}
+        if not missing:
+            return
+        keys = CryptoRepository.crypto_store.get_encryption_keys(missing)
+        for id in missing:
+            CryptoRepository.__cache(id, Fernet(keys[id]) if id in keys else None)
+
     @staticmethod
     def delete_encryption_key(id: str) -> None:
         """Delete an encryption key by ID."""
         CryptoRepository.crypto_store.remove(id=id)
+        CryptoRepository.__cache(id, None)
+
+    @staticmethod
+    async def provision(ids: Iterable[str]) -> None:
+        """Create the missing encryption keys of several IDs with a single store write, off the event loop."""
+        with CryptoRepository.__lock:
+            missing = {id for id in ids if CryptoRepository.__fernets.get(id) is None}
+        if not missing:
+            return
+        new_encryption_keys = {id: Fernet.generate_key() for id in missing}
+        keys = await CryptoRepository.crypto_store.add_missing_async(new_encryption_keys)
+        for id, key in keys.items():
+            CryptoRepository.__cache(id, Fernet(key))
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forget every cached Fernet, e.g. after switching crypto store."""
+        with CryptoRepository.__lock:
+            CryptoRepository.__fernets.clear()
+
+def encryption_subject(cls: type) -> Optional[str]:
+    """Name of the member holding the encryption subject ID of an @encrypted class, None otherwise."""
+    return getattr(cls, "__encryption_subject__", None)
 
 def encrypted(subject_id: str, encrypted_members: List[str]) -> Callable:
     """
@@ -75,8 +173,7 @@ def encrypted(subject_id: str, encrypted_members: List[str]) -> Callable:
         def new_to_dict(self: Data) -> dict:
             """Overridden to_dict method to encrypt specified members."""
             res = old_to_dict(self)
-            encryption_key = CryptoRepository.get_existing_or_new(res[subject_id])
-            fernet = Fernet(encryption_key)
+            fernet = CryptoRepository.get_fernet_or_new(res[subject_id])
 
             for member_name in encrypted_members:
                 res[member_name] = "encrypted_" + fernet.encrypt(str(res[member_name]).encode('utf-8')).decode()
@@ -89,13 +186,13 @@ def encrypted(subject_id: str, encrypted_members: List[str]) -> Callable:
         @wraps(old_from_dict)
         def new_from_dict(dict_values: dict) -> Data:
             """Overridden from_dict method to decrypt specified members."""
-            encryption_key = CryptoRepository.get_existing_or_none(dict_values[subject_id])
+            fernet = CryptoRepository.get_fernet_or_none(dict_values[subject_id])
 
-            if encryption_key is None:
+            if fernet is None:
                 return old_from_dict(dict_values)
 
-            fernet = Fernet(encryption_key)
-            new_dict = deepcopy(dict_values)
+            # only the encrypted members change, a shallow copy keeps the caller's dict untouched
+            new_dict = dict(dict_values)
             for member in encrypted_members:
                 field_type = cls.__dict__["__dataclass_fields__"][member].type
                 decrypted_value = fernet.decrypt(str(dict_values[member]).removeprefix("encrypted_")).decode('utf-8')
@@ -104,6 +201,7 @@ def encrypted(subject_id: str, encrypted_members: List[str]) -> Callable:
             return old_from_dict(new_dict)
 
         cls.from_dict = new_from_dict
+        cls.__encryption_subject__ = subject_id
 
         return cls
 
@@ -116,8 +214,11 @@ class InMemCryptoStore(ICryptoStore):
     def get_encryption_key(self, id: str) -> bytes | None:
         return self.store.get(id)
 
+    def get_encryption_keys(self, ids: Iterable[str]) -> dict[str, bytes]:
+        return {id: self.store[id] for id in ids if id in self.store}
+
     def add(self, id: str, new_encryption_key: bytes) -> None:
         self.store[id] = new_encryption_key
 
     def remove(self, id: str) -> None:
-        self.store[id] = None
\ No newline at end of file
+        self.store.pop(id, None)
\ No newline at end of file
@@ -20,4 +20,13 @@ class IEvent(Data, metaclass=EventMeta):
     
     @property
     def type(self) -> str:
-        return self.__class__.__name__
\ No newline at end of file
+        return self.__class__.__name__
+
+@dataclass
+class Snapshot(IEvent):
+    """
+    Event standing in for the archived start of a stream. It carries the aggregate state as of
+    `archived_version` and the name of the archive segment holding the original events.
+    """
+    archived_version : int
+    archive : str
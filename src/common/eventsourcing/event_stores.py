@@ -1,10 +1,18 @@
 import abc
+import asyncio
+import mmap
 import os
 import sys
 import json
+import weakref
+from array import array
+from contextlib import AsyncExitStack
+from typing import AsyncIterator
 
 from src.read_facades.interface import IReadFacade
 from .event import IEvent
+from .encryption import CryptoRepository, encryption_subject
+from .group_commit import GroupCommitWriter
 from .exceptions import ConcurrencyError
 
 
@@ -12,13 +20,37 @@ class IEventStore(abc.ABC):
     @abc.abstractmethod
     async def save_events(self, aggregate_id : str, events : list[IEvent], expected_version : int) -> None:...
 
+    async def save_events_batch(self, appends : list[tuple[str, list[IEvent], int]]) -> None:
+        """
+        Append events to several streams, given as (aggregate_id, events, expected_version) with each stream once.
+        Stores overriding it commit the whole batch at once, a ConcurrencyError on any stream rejecting all of it.
+        """
+        for aggregate_id, events, expected_version in appends:
+            await self.save_events(aggregate_id, events, expected_version)
+
     @abc.abstractmethod
-    async def get_events_for_aggregate(self, aggregate_id : str) -> list[IEvent]:...
+    async def get_events_for_aggregate(self, aggregate_id : str, from_version : int = 0) -> list[IEvent]:...
+
+    async def iter_events_for_aggregate(self, aggregate_id : str, from_version : int = 0) -> AsyncIterator[IEvent]:
+        for event in await self.get_events_for_aggregate(aggregate_id, from_version):
+            yield event
     
+    async def get_stream_version(self, aggregate_id : str) -> int:
+        """
+        Version of the last event of a stream, -1 when it has none.
+        """
+        return len(await self.get_events_for_aggregate(aggregate_id)) - 1
+
     async def get_last_commit_position(self) -> int:...
 
     async def get_all_events_from_position(self, position : int) -> list[IEvent]:...
 
+    async def iter_all_events_from_position(self, position : int) -> AsyncIterator[IEvent]:
+        for event in await self.get_all_events_from_position(position):
+            yield event
+
+    async def close(self) -> None:...
+
 
 def get_event_class(class_name) -> type[IEvent]:
     for module in list(sys.modules.values()):
@@ -29,6 +61,40 @@ def get_event_class(class_name) -> type[IEvent]:
             return cls
     raise ValueError(f"Class '{class_name}' not found.")
 
+def decode_event(event_descriptor : dict) -> IEvent:
+    return get_event_class(event_descriptor["event_type"]).from_dict(json.loads(event_descriptor["event_data"]))
+
+def decode_events(event_descriptors : list[dict]) -> list[IEvent]:
+    """
+    Decode a batch of descriptors, loading the encryption keys of its @encrypted events with a single lookup.
+    """
+    decoded = [(get_event_class(descriptor["event_type"]), json.loads(descriptor["event_data"])) for descriptor in event_descriptors]
+    subject_ids = {data[subject] for cls, data in decoded if (subject := encryption_subject(cls)) is not None}
+    if subject_ids:
+        CryptoRepository.prefetch(subject_ids)
+    return [cls.from_dict(data) for cls, data in decoded]
+
+async def provision_encryption_keys(events : list[IEvent]) -> None:
+    """
+    Create the missing encryption keys of the @encrypted events about to be encoded with a single store write.
+    """
+    subject_ids = {getattr(event, subject) for event in events if (subject := encryption_subject(type(event))) is not None}
+    if subject_ids:
+        await CryptoRepository.provision(subject_ids)
+
+async def decode_events_offloaded(event_descriptors : list[dict], chunk_size : int = 256) -> list[IEvent]:
+    """
+    Decode a batch of descriptors in order. Batches of at least chunk_size descriptors carrying @encrypted
+    events are split in chunks decrypted concurrently by the default executor, so replaying them does not
+    block the event loop. Smaller batches cost less to decode inline than to hand over to a thread.
+    """
+    if len(event_descriptors) < chunk_size or not any(encryption_subject(get_event_class(descriptor["event_type"])) for descriptor in event_descriptors):
+        return decode_events(event_descriptors)
+    loop = asyncio.get_running_loop()
+    chunks = [event_descriptors[start:start + chunk_size] for start in range(0, len(event_descriptors), chunk_size)]
+    decoded_chunks = await asyncio.gather(*[loop.run_in_executor(None, decode_events, chunk) for chunk in chunks])
+    return [event for decoded_chunk in decoded_chunks for event in decoded_chunk]
+
 class EventDescriptor:
     def __init__(self, id : str, event_type: str, event_data : str, version : int) -> None:
         self.event_type = event_type
@@ -68,35 +134,48 @@ class InMemEventStore(IEventStore):
     def __init__(self) -> None:
         self.current : dict[str, list[EventDescriptor]] = {}
 
-    async def save_events(self, aggregate_id: str, events: list[IEvent], expected_version: int) -> None:
+    def __last_version(self, aggregate_id : str) -> int:
         event_descriptors = self.current.get(aggregate_id)
-        if not event_descriptors:
-            if expected_version != -1:
-                raise ConcurrencyError()
-            event_descriptors = []
-            self.current[aggregate_id] = event_descriptors
+        return event_descriptors[-1].version if event_descriptors else -1
 
-        elif event_descriptors[len(event_descriptors)-1].version != expected_version:
-            raise ConcurrencyError()
+    async def get_stream_version(self, aggregate_id : str) -> int:
+        return self.__last_version(aggregate_id)
 
-        i = expected_version
+    async def save_events(self, aggregate_id: str, events: list[IEvent], expected_version: int) -> None:
+        await self.save_events_batch([(aggregate_id, events, expected_version)])
 
-        for event in events:
-            i += 1
-            event_descriptors.append(EventDescriptor(aggregate_id, event.type,json.dumps(event.to_dict()), i))
+    async def save_events_batch(self, appends : list[tuple[str, list[IEvent], int]]) -> None:
+        await provision_encryption_keys([event for _, events, _ in appends for event in events])
+        for aggregate_id, _, expected_version in appends:
+            if self.__last_version(aggregate_id) != expected_version:
+                raise ConcurrencyError()
+        for aggregate_id, events, expected_version in appends:
+            event_descriptors = self.current.setdefault(aggregate_id, [])
+            for i, event in enumerate(events):
+                event_descriptors.append(EventDescriptor(aggregate_id, event.type, json.dumps(event.to_dict()), expected_version + 1 + i))
 
-    async def get_events_for_aggregate(self, aggregate_id: str) -> list[IEvent]:
+    async def get_events_for_aggregate(self, aggregate_id: str, from_version : int = 0) -> list[IEvent]:
         event_descriptors = self.current.get(aggregate_id)
         if event_descriptors is None:
             return []
-        return [get_event_class(desc.event_type).from_dict(json.loads(desc.event_data)) for desc in event_descriptors]
+        return decode_events([desc.to_dict() for desc in event_descriptors[from_version:]])
 
 class JsonFileEventStore(IEventStore):
-    def __init__(self, file_path : str, read_facade_list : list[IReadFacade]) -> None:
+    """
+    Event store persisted as a single JSON document.
+
+    Appends to a stream are serialised by a per-stream lock, while a group commit writer
+    batches the appends of all streams (waiting at most `max_batch_delay` seconds for
+    more to arrive) into one durable file write. Events only become visible to readers
+    once they are on disk.
+    """
+    def __init__(self, file_path : str, read_facade_list : list[IReadFacade], max_batch_delay : float = 0.0, max_batch_size : int = 1000) -> None:
         self.file_path = file_path
         self.db = {"event_list": [], "aggretates" :{}}
         self.current : dict[str, list[dict]] = self.db["aggretates"]
         self.read_facade_list = read_facade_list
+        self.__stream_locks : weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self.__writer : GroupCommitWriter[list[dict]] = GroupCommitWriter(self.__commit, max_batch_delay, max_batch_size)
         if not os.path.exists(self.file_path):
             with open(self.file_path, "w") as f:
                 json.dump(self.db, f)
@@ -108,39 +187,241 @@ class JsonFileEventStore(IEventStore):
                 self.current = self.db["aggretates"]
         for event_descriptor in self.db["event_list"]:
             for read_facade in self.read_facade_list:
-                event_data = json.loads(event_descriptor["event_data"])
-                read_facade.update_read_model(get_event_class(event_descriptor["event_type"]).from_dict(event_data))
+                read_facade.update_read_model(decode_event(event_descriptor))
 
-    async def save_events(self, aggregate_id: str, events: list[IEvent], expected_version: int) -> None:
+    def __stream_lock(self, aggregate_id : str) -> asyncio.Lock:
+        lock = self.__stream_locks.get(aggregate_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self.__stream_locks[aggregate_id] = lock
+        return lock
+
+    def __last_version(self, aggregate_id : str) -> int:
         event_descriptors = self.current.get(aggregate_id)
-        if not event_descriptors:
-            if expected_version != -1:
-                raise ConcurrencyError()
-            event_descriptors = []
-            self.current[aggregate_id] = event_descriptors
+        return EventDescriptor.from_dict(event_descriptors[-1]).version if event_descriptors else -1
 
+    async def get_stream_version(self, aggregate_id : str) -> int:
+        return self.__last_version(aggregate_id)
 
-        elif EventDescriptor.from_dict(event_descriptors[len(event_descriptors)-1]).version != expected_version:
-            raise ConcurrencyError()
+    async def save_events(self, aggregate_id: str, events: list[IEvent], expected_version: int) -> None:
+        await self.save_events_batch([(aggregate_id, events, expected_version)])
 
-        i = expected_version
+    async def save_events_batch(self, appends : list[tuple[str, list[IEvent], int]]) -> None:
+        await provision_encryption_keys([event for _, events, _ in appends for event in events])
+        async with AsyncExitStack() as stack:
+            # locks are taken in a fixed order so that overlapping batches cannot deadlock
+            for aggregate_id in sorted({aggregate_id for aggregate_id, _, _ in appends}):
+                await stack.enter_async_context(self.__stream_lock(aggregate_id))
+            for aggregate_id, _, expected_version in appends:
+                if self.__last_version(aggregate_id) != expected_version:
+                    raise ConcurrencyError()
 
-        for event in events:
-            i += 1
-            event_descriptor = EventDescriptor(aggregate_id, event.type,json.dumps(event.to_dict()), i).to_dict()
-            event_descriptors.append(event_descriptor)
-            self.db["event_list"].append(event_descriptor)
-            for read_facade in self.read_facade_list:
-                read_facade.update_read_model(event)
+            new_descriptors = [EventDescriptor(aggregate_id, event.type, json.dumps(event.to_dict()), expected_version + 1 + i).to_dict() for aggregate_id, events, expected_version in appends for i, event in enumerate(events)]
+            if not new_descriptors:
+                return
+            await self.__writer.submit(new_descriptors)
+
+        for _, events, _ in appends:
+            for event in events:
+                for read_facade in self.read_facade_list:
+                    read_facade.update_read_model(event)
+
+    async def close(self) -> None:
+        await self.__writer.close()
 
-        with open(self.file_path, "w") as f:
-            json.dump(self.db, f)
+    async def __commit(self, appends : list[list[dict]]) -> None:
+        """
+        Write a batch of appends with a single durable file write, then publish them in memory.
+        """
+        event_list = list(self.db["event_list"])
+        aggregates = dict(self.current)
+        appended : dict[str, list[dict]] = {}
+        for event_descriptors in appends:
+            for descriptor in event_descriptors:
+                appended.setdefault(descriptor["id"], []).append(descriptor)
+            event_list.extend(event_descriptors)
+        for aggregate_id, event_descriptors in appended.items():
+            aggregates[aggregate_id] = aggregates.get(aggregate_id, []) + event_descriptors
+        await asyncio.to_thread(self.__write_file, {"event_list": event_list, "aggretates": aggregates})
+        self.db = {"event_list": event_list, "aggretates": aggregates}
+        self.current = aggregates
 
-    async def get_events_for_aggregate(self, aggregate_id: str) -> list[IEvent]:
-        return [get_event_class(desc["event_type"]).from_dict(json.loads(desc["event_data"])) for desc in self.current.get(aggregate_id, [])]
+    def __write_file(self, db : dict) -> None:
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(db, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+
+    async def get_events_for_aggregate(self, aggregate_id: str, from_version : int = 0) -> list[IEvent]:
+        return await decode_events_offloaded(self.current.get(aggregate_id, [])[from_version:])
 
     async def get_last_commit_position(self) -> int:
         return len(self.db["event_list"])
     
     async def get_all_events_from_position(self, position : int) -> list[IEvent]:
-        return [get_event_class(desc["event_type"]).from_dict(json.loads(desc["event_data"])) for desc in self.db["event_list"][position:]]
\ No newline at end of file
+        return await decode_events_offloaded(self.db["event_list"][position:])
+
+class JsonLinesEventStore(IEventStore):
+    """
+    Event store persisted as an append-only log holding one JSON event descriptor per line.
+
+    Only offsets are kept in memory: the byte offset of every global position and, for each
+    stream, the positions of its events. Events are read back through a memory map of the log
+    and decoded lazily. Appends go through the same per-stream locks and group commit as the
+    JsonFileEventStore, but a commit only appends the new lines instead of rewriting the file.
+    """
+    decode_chunk_size = 256
+    decode_window_chunks = 4
+
+    def __init__(self, file_path : str, read_facade_list : list[IReadFacade], max_batch_delay : float = 0.0, max_batch_size : int = 1000) -> None:
+        self.file_path = file_path
+        self.read_facade_list = read_facade_list
+        self.__offsets : array = array("q")
+        self.__streams : dict[str, list[int]] = {}
+        self.__first_versions : dict[str, int] = {}
+        self.__end = 0
+        self.__map : mmap.mmap | None = None
+        self.__stream_locks : weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self.__writer : GroupCommitWriter[list[dict]] = GroupCommitWriter(self.__commit, max_batch_delay, max_batch_size)
+        if not os.path.exists(self.file_path):
+            open(self.file_path, "wb").close()
+        self.load()
+
+    def load(self) -> None:
+        with open(self.file_path, "rb") as f:
+            offset = 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # torn write of the last commit, it was never acknowledged
+                    break
+                descriptor = json.loads(line)
+                self.__index(descriptor["id"], descriptor["version"], offset)
+                offset += len(line)
+                event = decode_event(descriptor)
+                for read_facade in self.read_facade_list:
+                    read_facade.update_read_model(event)
+        self.__end = offset
+        self.__remap()
+
+    def __index(self, aggregate_id : str, version : int, offset : int) -> None:
+        # a compacted stream starts with a snapshot carrying the version of the events it replaces
+        self.__first_versions.setdefault(aggregate_id, version)
+        self.__streams.setdefault(aggregate_id, []).append(len(self.__offsets))
+        self.__offsets.append(offset)
+
+    def __last_version(self, aggregate_id : str) -> int:
+        positions = self.__streams.get(aggregate_id)
+        if not positions:
+            return -1
+        return self.__first_versions[aggregate_id] + len(positions) - 1
+
+    def __remap(self) -> None:
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        if self.__end > 0:
+            with open(self.file_path, "rb") as f:
+                self.__map = mmap.mmap(f.fileno(), self.__end, access=mmap.ACCESS_READ)
+
+    def __read(self, position : int) -> dict:
+        start = self.__offsets[position]
+        end = self.__offsets[position + 1] if position + 1 < len(self.__offsets) else self.__end
+        return json.loads(self.__map[start:end])
+
+    def __stream_lock(self, aggregate_id : str) -> asyncio.Lock:
+        lock = self.__stream_locks.get(aggregate_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self.__stream_locks[aggregate_id] = lock
+        return lock
+
+    async def get_stream_version(self, aggregate_id : str) -> int:
+        return self.__last_version(aggregate_id)
+
+    async def save_events(self, aggregate_id: str, events: list[IEvent], expected_version: int) -> None:
+        await self.save_events_batch([(aggregate_id, events, expected_version)])
+
+    async def save_events_batch(self, appends : list[tuple[str, list[IEvent], int]]) -> None:
+        await provision_encryption_keys([event for _, events, _ in appends for event in events])
+        async with AsyncExitStack() as stack:
+            # locks are taken in a fixed order so that overlapping batches cannot deadlock
+            for aggregate_id in sorted({aggregate_id for aggregate_id, _, _ in appends}):
+                await stack.enter_async_context(self.__stream_lock(aggregate_id))
+            for aggregate_id, _, expected_version in appends:
+                if self.__last_version(aggregate_id) != expected_version:
+                    raise ConcurrencyError()
+
+            new_descriptors = [EventDescriptor(aggregate_id, event.type, json.dumps(event.to_dict()), expected_version + 1 + i).to_dict() for aggregate_id, events, expected_version in appends for i, event in enumerate(events)]
+            if not new_descriptors:
+                return
+            await self.__writer.submit(new_descriptors)
+
+        for _, events, _ in appends:
+            for event in events:
+                for read_facade in self.read_facade_list:
+                    read_facade.update_read_model(event)
+
+    async def close(self) -> None:
+        await self.__writer.close()
+
+    async def __commit(self, appends : list[list[dict]]) -> None:
+        """
+        Append a batch of descriptors to the log with a single durable write, then index them.
+        """
+        lines = [(descriptor, (json.dumps(descriptor) + "\n").encode("utf-8")) for event_descriptors in appends for descriptor in event_descriptors]
+        await asyncio.to_thread(self.__write_file, b"".join(line for _, line in lines))
+        offset = self.__end
+        for descriptor, line in lines:
+            self.__index(descriptor["id"], descriptor["version"], offset)
+            offset += len(line)
+        self.__end = offset
+        self.__remap()
+
+    def __write_file(self, data : bytes) -> None:
+        with open(self.file_path, "r+b") as f:
+            # anything past the committed end is left over from a failed write
+            f.seek(self.__end)
+            f.write(data)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def get_events_for_aggregate(self, aggregate_id: str, from_version : int = 0) -> list[IEvent]:
+        return [event async for event in self.iter_events_for_aggregate(aggregate_id, from_version)]
+
+    async def iter_events_for_aggregate(self, aggregate_id : str, from_version : int = 0) -> AsyncIterator[IEvent]:
+        positions = self.__streams.get(aggregate_id, [])
+        first_version = self.__first_versions.get(aggregate_id, 0)
+        last_index = len(positions)
+        window = self.decode_chunk_size * self.decode_window_chunks
+        for start in range(max(from_version - first_version, 0), last_index, window):
+            descriptors = [self.__read(position) for position in positions[start:min(start + window, last_index)]]
+            for event in await decode_events_offloaded(descriptors, self.decode_chunk_size):
+                yield event
+
+    async def get_last_commit_position(self) -> int:
+        return len(self.__offsets)
+
+    async def get_all_events_from_position(self, position : int) -> list[IEvent]:
+        return [event async for event in self.iter_all_events_from_position(position)]
+
+    async def iter_all_events_from_position(self, position : int) -> AsyncIterator[IEvent]:
+        last_position = len(self.__offsets)
+        window = self.decode_chunk_size * self.decode_window_chunks
+        for start in range(position, last_position, window):
+            descriptors = [self.__read(current) for current in range(start, min(start + window, last_position))]
+            for event in await decode_events_offloaded(descriptors, self.decode_chunk_size):
+                yield event
+
+
+def convert_json_file_event_store(json_file_path : str, log_file_path : str) -> None:
+    """
+    Write the events of a JsonFileEventStore document to a JsonLinesEventStore log, in commit order.
+    """
+    with open(json_file_path, "r") as f:
+        db = json.load(f)
+    with open(log_file_path, "w") as f:
+        for descriptor in db["event_list"]:
+            f.write(json.dumps(descriptor) + "\n")
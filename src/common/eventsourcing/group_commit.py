@@ -0,0 +1,74 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from src.common.loggers import app_logger
+
+T = TypeVar("T")
+
+class GroupCommitWriter(Generic[T]):
+    """
+    Single writer task turning the appends of concurrent callers into batched physical writes.
+
+    Callers submit an item and wait for it to be committed. The writer takes the first queued
+    item, keeps collecting items for at most `max_batch_delay` seconds (or until `max_batch_size`
+    is reached), then hands the whole batch to `commit`. Every caller of the batch is acknowledged
+    once `commit` returns, or receives the exception it raised.
+    """
+    def __init__(self, commit : Callable[[list[T]], Awaitable[None]], max_batch_delay : float = 0.0, max_batch_size : int = 1000) -> None:
+        self.__commit = commit
+        self.max_batch_delay = max_batch_delay
+        self.max_batch_size = max_batch_size
+        self.__queue : asyncio.Queue[tuple[T, asyncio.Future]] | None = None
+        self.__submitted : asyncio.Event | None = None
+        self.__task : asyncio.Task | None = None
+
+    async def submit(self, item : T) -> None:
+        if self.__task is None or self.__task.done():
+            self.__queue = asyncio.Queue()
+            self.__submitted = asyncio.Event()
+            self.__task = asyncio.create_task(self.__run())
+        committed = asyncio.get_running_loop().create_future()
+        self.__queue.put_nowait((item, committed))
+        self.__submitted.set()
+        await committed
+
+    async def close(self) -> None:
+        if self.__task is not None and not self.__task.done():
+            await self.__queue.join()
+            self.__task.cancel()
+
+    async def __collect_batch(self) -> list[tuple[T, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self.__queue.get()]
+        deadline = loop.time() + self.max_batch_delay
+        while True:
+            while not self.__queue.empty() and len(batch) < self.max_batch_size:
+                batch.append(self.__queue.get_nowait())
+            remaining = deadline - loop.time()
+            if len(batch) >= self.max_batch_size or remaining <= 0:
+                return batch
+            self.__submitted.clear()
+            try:
+                await asyncio.wait_for(self.__submitted.wait(), remaining)
+            except asyncio.TimeoutError:
+                while not self.__queue.empty() and len(batch) < self.max_batch_size:
+                    batch.append(self.__queue.get_nowait())
+                return batch
+
+    async def __run(self) -> None:
+        while True:
+            batch = await self.__collect_batch()
+            try:
+                await self.__commit([item for item, _ in batch])
+            except Exception as e:
+                app_logger.error(f"Failed to commit a batch of {len(batch)} append(s): {e}")
+                for _, committed in batch:
+                    if not committed.done():
+                        committed.set_exception(e)
+            else:
+                for _, committed in batch:
+                    if not committed.done():
+                        committed.set_result(None)
+            finally:
+                for _ in batch:
+                    self.__queue.task_done()
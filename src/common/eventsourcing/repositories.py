@@ -1,10 +1,12 @@
 from __future__ import annotations
 import abc
+from collections import OrderedDict
+from copy import deepcopy
 
 from .aggregates import AggregateRoot
 from typing import Generic, TypeVar
 from .event_stores import IEventStore
-from .exceptions import AggregateNotFoundError
+from .exceptions import AggregateNotFoundError, ConcurrencyError
 
 T = TypeVar('T', bound=AggregateRoot)
 
@@ -12,33 +14,127 @@ class IEventStoreRepository(Generic[T], abc.ABC):
     @abc.abstractmethod
     async def save(self, aggregate : AggregateRoot, expected_version : int) -> None:...
 
+    @abc.abstractmethod
+    async def save_all(self, aggregates : list[AggregateRoot]) -> None:
+        """
+        Save the uncommitted changes of several aggregates, of any type, in a single append to the store.
+        """
+
     @abc.abstractmethod
     async def get_by_id(self, id : str) -> T: ...
 
     @abc.abstractmethod
     async def get_singleton_aggregate(self) -> T: ...
 
+    @abc.abstractmethod
+    async def get_version(self, id : str) -> int:
+        """
+        Version of an aggregate in the store, without rehydrating it. -1 when it does not exist.
+        """
+
+class AggregateCache(Generic[T]):
+    """
+    LRU cache of rehydrated aggregates keyed by stream id.
+
+    The cache is bounded by the number of events the cached aggregates were built from,
+    which stands in for their memory footprint. Aggregates are copied in and out so that
+    concurrent commands never share (and never dirty) the cached instance.
+    """
+    def __init__(self, max_events : int) -> None:
+        self.max_events = max_events
+        self.__entries : OrderedDict[str, T] = OrderedDict()
+        self.__size = 0
+
+    @staticmethod
+    def __weight(aggregate : T) -> int:
+        return max(aggregate.version + 1, 1)
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def get(self, stream_id : str) -> T | None:
+        aggregate = self.__entries.get(stream_id)
+        if aggregate is None:
+            return None
+        self.__entries.move_to_end(stream_id)
+        return deepcopy(aggregate)
+
+    def put(self, stream_id : str, aggregate : T) -> None:
+        self.evict(stream_id)
+        weight = self.__weight(aggregate)
+        if weight > self.max_events:
+            return
+        self.__entries[stream_id] = deepcopy(aggregate)
+        self.__size += weight
+        while self.__size > self.max_events:
+            _, oldest = self.__entries.popitem(last=False)
+            self.__size -= self.__weight(oldest)
+
+    def evict(self, stream_id : str) -> None:
+        aggregate = self.__entries.pop(stream_id, None)
+        if aggregate is not None:
+            self.__size -= self.__weight(aggregate)
+
 class EventStoreRepository(IEventStoreRepository[T], Generic[T]):
     __storage : IEventStore
 
-    def __init__(self, storage : IEventStore, class_type : type[T]) -> None:
+    def __init__(self, storage : IEventStore, class_type : type[T], cache_max_events : int = 0) -> None:
         self.__storage = storage
         self.class_type = class_type
+        self.__cache : AggregateCache[T] | None = AggregateCache(cache_max_events) if cache_max_events > 0 else None
 
     async def save(self, aggregate : AggregateRoot, expected_version : int) -> None:
-        await self.__storage.save_events(aggregate.to_stream_id(aggregate.id), aggregate.get_uncommitted_changes(), aggregate.version)
+        stream_id = aggregate.to_stream_id(aggregate.id)
+        try:
+            await self.__storage.save_events(stream_id, aggregate.get_uncommitted_changes(), aggregate.version)
+        except ConcurrencyError:
+            # the aggregate (and possibly our cached copy) is stale, the next load starts from the store
+            if self.__cache:
+                self.__cache.evict(stream_id)
+            raise
         aggregate.mark_changes_as_committed()
+        if self.__cache:
+            self.__cache.put(stream_id, aggregate)
+
+    async def save_all(self, aggregates : list[AggregateRoot]) -> None:
+        stream_ids = [aggregate.to_stream_id(aggregate.id) for aggregate in aggregates]
+        try:
+            await self.__storage.save_events_batch([(stream_id, aggregate.get_uncommitted_changes(), aggregate.version) for stream_id, aggregate in zip(stream_ids, aggregates)])
+        except ConcurrencyError:
+            if self.__cache:
+                for stream_id in stream_ids:
+                    self.__cache.evict(stream_id)
+            raise
+        for stream_id, aggregate in zip(stream_ids, aggregates):
+            aggregate.mark_changes_as_committed()
+            # aggregates of other types are cached by their own repository, which catches up on its next load
+            if self.__cache and isinstance(aggregate, self.class_type):
+                self.__cache.put(stream_id, aggregate)
 
     async def get_by_id(self, id: str) -> T:
-        obj = self.class_type()
-        e = await self.__storage.get_events_for_aggregate(obj.to_stream_id(id))
-        if not e:
+        obj = await self.__load(self.class_type.to_stream_id(id))
+        if obj.version == -1:
             raise AggregateNotFoundError(id)
-        obj.loads_from_history(e)
         return obj
 
+    async def get_version(self, id : str) -> int:
+        return await self.__storage.get_stream_version(self.class_type.to_stream_id(id))
+
     async def get_singleton_aggregate(self) -> T:
         obj = self.class_type()
-        e = await self.__storage.get_events_for_aggregate(obj.to_stream_id(obj.id))
-        obj.loads_from_history(e)
+        return await self.__load(obj.to_stream_id(obj.id))
+
+    async def __load(self, stream_id : str) -> T:
+        """
+        Load an aggregate from the cache when possible, only applying the events committed since it was cached.
+        Events are streamed from the store straight into the aggregate.
+        """
+        obj = self.__cache.get(stream_id) if self.__cache else None
+        if obj is None:
+            obj = self.class_type()
+        cached_version = obj.version
+        await obj.loads_from_stream(self.__storage.iter_events_for_aggregate(stream_id, obj.version + 1))
+        if self.__cache and obj.version != cached_version:
+            self.__cache.put(stream_id, obj)
         return obj
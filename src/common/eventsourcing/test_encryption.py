@@ -0,0 +1,112 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from dataclasses import dataclass
+from typing import Iterable
+
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.common.eventsourcing.encryption import CryptoRepository, InMemCryptoStore, encrypted
+from src.common.eventsourcing.event import IEvent
+from src.common.eventsourcing.event_stores import InMemEventStore, JsonLinesEventStore, decode_events_offloaded
+
+
+@encrypted("player_id", ["first_name"])
+@dataclass
+class EncryptedPlayerRenamed(IEvent):
+    player_id: str
+    first_name: str
+
+
+class CountingCryptoStore(InMemCryptoStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+        self.added : list[str] = []
+        self.batches : list[list[str]] = []
+        self.lookup_threads : set[int] = set()
+
+    def get_encryption_key(self, id: str) -> bytes | None:
+        self.lookups += 1
+        return super().get_encryption_key(id)
+
+    def get_encryption_keys(self, ids: Iterable[str]) -> dict[str, bytes]:
+        self.lookups += 1
+        self.lookup_threads.add(threading.get_ident())
+        return super().get_encryption_keys(ids)
+
+    def add(self, id: str, new_encryption_key: bytes) -> None:
+        self.added.append(id)
+        super().add(id, new_encryption_key)
+
+    async def add_missing_async(self, new_encryption_keys: dict[str, bytes]) -> dict[str, bytes]:
+        self.batches.append(sorted(new_encryption_keys))
+        return await super().add_missing_async(new_encryption_keys)
+
+
+class TestCryptoRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.crypto_store = CountingCryptoStore()
+        CryptoRepository.crypto_store = self.crypto_store
+        CryptoRepository.clear_cache()
+
+    def tearDown(self) -> None:
+        CryptoRepository.clear_cache()
+        super().tearDown()
+
+    def test_a_stream_is_decrypted_with_a_single_key_lookup(self) -> None:
+        store = InMemEventStore()
+        events = [EncryptedPlayerRenamed(actor_id=SYSTEM_ACTOR_ID, player_id=f"player-{i % 2}", first_name=f"Name {i}") for i in range(10)]
+        asyncio.run(store.save_events("players", events, -1))
+        CryptoRepository.clear_cache()
+        self.crypto_store.lookups = 0
+
+        decoded = asyncio.run(store.get_events_for_aggregate("players"))
+
+        assert [event.first_name for event in decoded] == [f"Name {i}" for i in range(10)]
+        assert self.crypto_store.lookups == 1
+
+    def test_the_keys_of_a_batch_are_created_with_a_single_store_write(self) -> None:
+        store = InMemEventStore()
+        events = [EncryptedPlayerRenamed(actor_id=SYSTEM_ACTOR_ID, player_id=f"player-{i % 2}", first_name=f"Name {i}") for i in range(10)]
+        asyncio.run(store.save_events("players", events, -1))
+        asyncio.run(store.save_events("players", events[:2], 9))
+
+        assert self.crypto_store.batches == [["player-0", "player-1"]]
+        assert sorted(self.crypto_store.added) == ["player-0", "player-1"]
+
+    def test_large_batches_are_decrypted_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store = JsonLinesEventStore(os.path.join(directory, "event_store.jsonl"), [])
+            store.decode_chunk_size = 8
+            events = [EncryptedPlayerRenamed(actor_id=SYSTEM_ACTOR_ID, player_id=f"player-{i % 3}", first_name=f"Name {i}") for i in range(100)]
+            asyncio.run(store.save_events("players", events, -1))
+            CryptoRepository.clear_cache()
+
+            async def first_names() -> list[str]:
+                return [event.first_name async for event in store.iter_all_events_from_position(0)]
+
+            assert asyncio.run(first_names()) == [f"Name {i}" for i in range(100)]
+
+    def test_small_batches_are_decrypted_inline(self) -> None:
+        store = InMemEventStore()
+        events = [EncryptedPlayerRenamed(actor_id=SYSTEM_ACTOR_ID, player_id="player-1", first_name=f"Name {i}") for i in range(5)]
+        asyncio.run(store.save_events("players", events, -1))
+        CryptoRepository.clear_cache()
+
+        decoded = asyncio.run(decode_events_offloaded([descriptor.to_dict() for descriptor in store.current["players"]], chunk_size=8))
+
+        assert [event.first_name for event in decoded] == [f"Name {i}" for i in range(5)]
+        assert self.crypto_store.lookup_threads == {threading.get_ident()}
+
+    def test_shredded_subjects_stay_encrypted(self) -> None:
+        data = EncryptedPlayerRenamed(actor_id=SYSTEM_ACTOR_ID, player_id="player-1", first_name="Jane").to_dict()
+        assert data["first_name"].startswith("encrypted_")
+        assert EncryptedPlayerRenamed.from_dict(data).first_name == "Jane"
+
+        CryptoRepository.delete_encryption_key("player-1")
+
+        assert EncryptedPlayerRenamed.from_dict(data).first_name == data["first_name"]
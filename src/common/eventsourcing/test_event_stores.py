@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+import pytest
+
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.common.eventsourcing.event_stores import JsonFileEventStore, JsonLinesEventStore, convert_json_file_event_store
+from src.common.eventsourcing.exceptions import ConcurrencyError
+from src.domains.club.events import ClubCreated, ClubOwnerChanged
+
+
+class TestJsonFileEventStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "event_store.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_concurrent_appends_to_different_streams_are_all_persisted(self) -> None:
+        store = JsonFileEventStore(self.file_path, [])
+
+        async def run() -> None:
+            await asyncio.gather(*[store.save_events(f"club-{i}", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id=str(i), name=f"Club {i}")], -1) for i in range(20)])
+            await store.close()
+
+        asyncio.run(run())
+        with open(self.file_path) as f:
+            db = json.load(f)
+        assert len(db["event_list"]) == 20
+        assert len(db["aggretates"]) == 20
+        assert asyncio.run(store.get_last_commit_position()) == 20
+
+    def test_concurrent_appends_to_the_same_stream_conflict(self) -> None:
+        store = JsonFileEventStore(self.file_path, [])
+        asyncio.run(store.save_events("club-1", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id="1", name="Club")], -1))
+
+        async def run() -> list:
+            results = await asyncio.gather(
+                store.save_events("club-1", [ClubOwnerChanged(actor_id=SYSTEM_ACTOR_ID, club_id="1", new_owner_id="2")], 0),
+                store.save_events("club-1", [ClubOwnerChanged(actor_id=SYSTEM_ACTOR_ID, club_id="1", new_owner_id="3")], 0),
+                return_exceptions=True)
+            await store.close()
+            return results
+
+        results = asyncio.run(run())
+        assert results[0] is None
+        assert isinstance(results[1], ConcurrencyError)
+        events = asyncio.run(store.get_events_for_aggregate("club-1"))
+        assert [event.type for event in events] == ["ClubCreated", "ClubOwnerChanged"]
+
+    def test_store_reloads_committed_events(self) -> None:
+        store = JsonFileEventStore(self.file_path, [])
+        asyncio.run(store.save_events("club-1", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id="1", name="Club")], -1))
+
+        reloaded = JsonFileEventStore(self.file_path, [])
+        events = asyncio.run(reloaded.get_events_for_aggregate("club-1"))
+        assert len(events) == 1
+        assert events[0].name == "Club"
+        with pytest.raises(ConcurrencyError):
+            asyncio.run(reloaded.save_events("club-1", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id="1", name="Club")], -1))
+
+
+class TestJsonLinesEventStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "event_store.jsonl")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def save_clubs(self, store: JsonLinesEventStore, count: int) -> None:
+        async def run() -> None:
+            await asyncio.gather(*[store.save_events(f"club-{i}", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id=str(i), name=f"Club {i}")], -1) for i in range(count)])
+            await store.close()
+        asyncio.run(run())
+
+    def test_events_are_read_back_by_stream_and_position(self) -> None:
+        store = JsonLinesEventStore(self.file_path, [])
+        self.save_clubs(store, 5)
+        asyncio.run(store.save_events("club-2", [ClubOwnerChanged(actor_id=SYSTEM_ACTOR_ID, club_id="2", new_owner_id="owner")], 0))
+
+        assert asyncio.run(store.get_last_commit_position()) == 6
+        events = asyncio.run(store.get_events_for_aggregate("club-2"))
+        assert [event.type for event in events] == ["ClubCreated", "ClubOwnerChanged"]
+        assert asyncio.run(store.get_events_for_aggregate("club-2", 1))[0].new_owner_id == "owner"
+        assert [event.type for event in asyncio.run(store.get_all_events_from_position(4))] == ["ClubCreated", "ClubOwnerChanged"]
+
+    def test_stream_events_are_iterated_from_a_version(self) -> None:
+        store = JsonLinesEventStore(self.file_path, [])
+        self.save_clubs(store, 2)
+        asyncio.run(store.save_events("club-1", [ClubOwnerChanged(actor_id=SYSTEM_ACTOR_ID, club_id="1", new_owner_id="owner")], 0))
+
+        async def stream_types(from_version: int) -> list[str]:
+            return [event.type async for event in store.iter_events_for_aggregate("club-1", from_version)]
+
+        assert asyncio.run(stream_types(0)) == ["ClubCreated", "ClubOwnerChanged"]
+        assert asyncio.run(stream_types(1)) == ["ClubOwnerChanged"]
+        assert asyncio.run(stream_types(2)) == []
+
+    def test_iterating_from_a_position_is_lazy(self) -> None:
+        store = JsonLinesEventStore(self.file_path, [])
+        self.save_clubs(store, 3)
+
+        async def first_event():
+            async for event in store.iter_all_events_from_position(1):
+                return event
+
+        assert asyncio.run(first_event()).type == "ClubCreated"
+
+    def test_store_is_rebuilt_from_the_log_and_ignores_a_torn_write(self) -> None:
+        store = JsonLinesEventStore(self.file_path, [])
+        self.save_clubs(store, 3)
+        with open(self.file_path, "ab") as f:
+            f.write(b'{"id": "club-9", "event_ty')
+
+        reloaded = JsonLinesEventStore(self.file_path, [])
+        assert asyncio.run(reloaded.get_last_commit_position()) == 3
+        with pytest.raises(ConcurrencyError):
+            asyncio.run(reloaded.save_events("club-1", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id="1", name="Club")], -1))
+        asyncio.run(reloaded.save_events("club-9", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id="9", name="Club 9")], -1))
+
+        reloaded = JsonLinesEventStore(self.file_path, [])
+        assert asyncio.run(reloaded.get_last_commit_position()) == 4
+        assert asyncio.run(reloaded.get_events_for_aggregate("club-9"))[0].name == "Club 9"
+
+    def test_json_file_event_store_can_be_converted(self) -> None:
+        json_file_path = os.path.join(self.directory.name, "event_store.json")
+        json_store = JsonFileEventStore(json_file_path, [])
+        asyncio.run(json_store.save_events("club-1", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id="1", name="Club")], -1))
+
+        convert_json_file_event_store(json_file_path, self.file_path)
+        store = JsonLinesEventStore(self.file_path, [])
+        assert asyncio.run(store.get_events_for_aggregate("club-1"))[0].name == "Club"
+
+    def test_a_batch_is_appended_to_several_streams_at_once_or_not_at_all(self) -> None:
+        store = JsonLinesEventStore(self.file_path, [])
+        self.save_clubs(store, 1)
+        with pytest.raises(ConcurrencyError):
+            asyncio.run(store.save_events_batch([
+                ("club-1", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id="1", name="Club 1")], -1),
+                ("club-0", [ClubOwnerChanged(actor_id=SYSTEM_ACTOR_ID, club_id="0", new_owner_id="owner")], -1)]))
+        assert asyncio.run(store.get_last_commit_position()) == 1
+
+        asyncio.run(store.save_events_batch([
+            ("club-1", [ClubCreated(actor_id=SYSTEM_ACTOR_ID, club_id="1", name="Club 1")], -1),
+            ("club-0", [ClubOwnerChanged(actor_id=SYSTEM_ACTOR_ID, club_id="0", new_owner_id="owner")], 0)]))
+
+        reloaded = JsonLinesEventStore(self.file_path, [])
+        assert asyncio.run(reloaded.get_last_commit_position()) == 3
+        assert [event.type for event in asyncio.run(reloaded.get_events_for_aggregate("club-0"))] == ["ClubCreated", "ClubOwnerChanged"]
+        assert asyncio.run(reloaded.get_events_for_aggregate("club-1"))[0].name == "Club 1"
@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+
+from src.common.eventsourcing.group_commit import GroupCommitWriter
+
+
+class TestGroupCommitWriter(unittest.TestCase):
+
+    def test_concurrent_submits_are_committed_in_one_batch(self) -> None:
+        batches = []
+
+        async def commit(items: list[int]) -> None:
+            batches.append(items)
+
+        async def run() -> None:
+            writer = GroupCommitWriter(commit, max_batch_delay=0.05)
+            await asyncio.gather(*[writer.submit(i) for i in range(10)])
+            await writer.close()
+
+        asyncio.run(run())
+        assert batches == [list(range(10))]
+
+    def test_batches_are_bounded_by_max_batch_size(self) -> None:
+        batches = []
+
+        async def commit(items: list[int]) -> None:
+            batches.append(items)
+
+        async def run() -> None:
+            writer = GroupCommitWriter(commit, max_batch_delay=0.05, max_batch_size=4)
+            await asyncio.gather(*[writer.submit(i) for i in range(10)])
+            await writer.close()
+
+        asyncio.run(run())
+        assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+    def test_every_caller_of_a_failed_batch_gets_the_error(self) -> None:
+        async def commit(items: list[int]) -> None:
+            raise OSError("disk full")
+
+        async def run() -> list:
+            writer = GroupCommitWriter(commit)
+            results = await asyncio.gather(writer.submit(1), writer.submit(2), return_exceptions=True)
+            await writer.close()
+            return results
+
+        results = asyncio.run(run())
+        assert all(isinstance(result, OSError) for result in results)
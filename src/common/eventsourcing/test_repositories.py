@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+
+import pytest
+
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.common.eventsourcing.event_stores import InMemEventStore
+from src.common.eventsourcing.exceptions import ConcurrencyError
+from src.common.eventsourcing.repositories import EventStoreRepository
+from src.domains.club.model import Club, ClubCreateData
+
+
+class TestEventStoreRepositoryCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.store = InMemEventStore()
+        self.repo = EventStoreRepository(self.store, Club, cache_max_events=100)
+        self.club = Club(club_create_data=ClubCreateData(actor_id=SYSTEM_ACTOR_ID, name="Test Club", owner_id="1"))
+        asyncio.run(self.repo.save(self.club, -1))
+
+    def test_save_moves_the_version_forward(self) -> None:
+        assert self.club.version == 0
+        assert self.club.get_uncommitted_changes() == []
+
+    def test_cached_aggregate_is_a_copy(self) -> None:
+        first = asyncio.run(self.repo.get_by_id(self.club.id))
+        first.change_owner("2", SYSTEM_ACTOR_ID)
+        second = asyncio.run(self.repo.get_by_id(self.club.id))
+        assert second.owner_id == "1"
+        assert second.get_uncommitted_changes() == []
+
+    def test_cached_aggregate_catches_up_with_events_committed_elsewhere(self) -> None:
+        asyncio.run(self.repo.get_by_id(self.club.id))
+        other_repo = EventStoreRepository(self.store, Club)
+        club = asyncio.run(other_repo.get_by_id(self.club.id))
+        club.change_owner("2", SYSTEM_ACTOR_ID)
+        asyncio.run(other_repo.save(club, club.version))
+
+        cached = asyncio.run(self.repo.get_by_id(self.club.id))
+        assert cached.owner_id == "2"
+        assert cached.version == 1
+
+    def test_stale_aggregate_is_rejected_then_reloaded(self) -> None:
+        first = asyncio.run(self.repo.get_by_id(self.club.id))
+        second = asyncio.run(self.repo.get_by_id(self.club.id))
+        first.change_owner("2", SYSTEM_ACTOR_ID)
+        asyncio.run(self.repo.save(first, first.version))
+        second.change_owner("3", SYSTEM_ACTOR_ID)
+        with pytest.raises(ConcurrencyError):
+            asyncio.run(self.repo.save(second, second.version))
+
+        reloaded = asyncio.run(self.repo.get_by_id(self.club.id))
+        assert reloaded.owner_id == "2"
+        assert reloaded.version == 1
@@ -19,3 +19,12 @@ class AccessDeniedError(GenericError):
 class NotFoundError(GenericError):
     def __init__(self, message : str = "", status_code : int = status.HTTP_404_NOT_FOUND) -> None:
         super().__init__(message, status_code)
+
+class InvalidCursorError(GenericError):
+    def __init__(self, message : str = "", status_code : int = status.HTTP_400_BAD_REQUEST) -> None:
+        super().__init__(message, status_code)
+
+class NotModifiedError(GenericError):
+    def __init__(self, etag : str, status_code : int = status.HTTP_304_NOT_MODIFIED) -> None:
+        super().__init__("", status_code)
+        self.etag = etag
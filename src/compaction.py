@@ -0,0 +1,80 @@
+import argparse
+import json
+from datetime import datetime
+
+from src.common.enums import Season
+from src.common.eventsourcing.compaction import CompactionPolicy, CompactionReport, compact_event_log, is_snapshot
+from src.common.loggers import app_logger
+from src.domains.federation.model import Federation
+from src.domains.training_session.model import TrainingSession
+
+
+def event_season(event_descriptor : dict) -> Season:
+    return Season.from_date(datetime.fromisoformat(json.loads(event_descriptor["event_data"])["triggered_at"]))
+
+class TrainingSessionCompactionPolicy(CompactionPolicy):
+    """
+    Archives the whole stream of the training sessions held before the active season.
+    """
+    aggregate_type = TrainingSession
+
+    def __init__(self, active_season : Season) -> None:
+        self.active_season = active_season
+
+    @staticmethod
+    def session_season(event_descriptors : list[dict]) -> Season:
+        return Season.from_date(datetime.fromisoformat(json.loads(event_descriptors[0]["event_data"])["start_time"]))
+
+    def matches(self, stream_id : str) -> bool:
+        return stream_id.startswith(TrainingSession.to_stream_id(""))
+
+    def archived_count(self, stream_id : str, event_descriptors : list[dict]) -> int:
+        if self.session_season(event_descriptors) < self.active_season:
+            return len(event_descriptors)
+        return 0
+
+    def segment(self, stream_id : str, event_descriptors : list[dict]) -> str:
+        season = self.session_season(event_descriptors)
+        return f"training_session-{season.start_year}-{season.end_year}"
+
+class FederationCompactionPolicy(CompactionPolicy):
+    """
+    Archives the federation events recorded before the active season.
+    """
+    aggregate_type = Federation
+
+    def __init__(self, active_season : Season) -> None:
+        self.active_season = active_season
+
+    def matches(self, stream_id : str) -> bool:
+        return stream_id == Federation.to_stream_id(Federation().id)
+
+    def archived_count(self, stream_id : str, event_descriptors : list[dict]) -> int:
+        count = 0
+        for event_descriptor in event_descriptors:
+            if not is_snapshot(event_descriptor) and event_season(event_descriptor) >= self.active_season:
+                break
+            count += 1
+        return count
+
+    def segment(self, stream_id : str, event_descriptors : list[dict]) -> str:
+        season = Season.previous_season(self.active_season)
+        return f"{stream_id}-{season.start_year}-{season.end_year}"
+
+def compact(file_path : str, archive_dir : str, active_season : Season) -> CompactionReport:
+    return compact_event_log(file_path, archive_dir, [TrainingSessionCompactionPolicy(active_season), FederationCompactionPolicy(active_season)])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive the streams of closed seasons out of the event store. Run it while the application is stopped.")
+    parser.add_argument("--event-store", default="./event_store.jsonl")
+    parser.add_argument("--archive-dir", default="./event_store_archive")
+    parser.add_argument("--active-season", type=int, help="start year of the first season kept in the event store, defaults to the current season")
+    args = parser.parse_args()
+
+    active_season = Season.from_year(args.active_season) if args.active_season else Season.current()
+    report = compact(args.event_store, args.archive_dir, active_season)
+    app_logger.info(f"Compacted {report.compacted_streams} stream(s), archived {report.archived_events} event(s) before {active_season.display_name} into {sorted(report.segments)}")
+
+
+if __name__ == "__main__":
+    main()
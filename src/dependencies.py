@@ -1,14 +1,17 @@
 
 import asyncio
+import os
 from contextlib import asynccontextmanager
 from typing import Annotated, Any, AsyncGenerator
-from fastapi import Cookie, FastAPI, HTTPException, Request, status, Depends, WebSocket
+from fastapi import Cookie, FastAPI, HTTPException, Request, Response, status, Depends, WebSocket
 from pydantic import BaseModel
 from src.application.auth.service import AuthService
 from src.application.collective.service import CollectiveService
 from src.application.player.service import PlayerService
 from src.application.training_session.service import TrainingSessionService
-from src.common.eventsourcing.event_stores import IEventStore, JsonFileEventStore
+from src.common.eventsourcing.encryption import CryptoRepository
+from src.common.exceptions import NotModifiedError
+from src.common.eventsourcing.event_stores import IEventStore, JsonLinesEventStore, convert_json_file_event_store
 from src.common.cqrs.messages import IEventPublisher
 from src.common.eventsourcing.repositories import EventStoreRepository
 from src.domains.club.model import Club
@@ -19,9 +22,15 @@ from src.domains.training_session.model import TrainingSession
 from src.domains.user.model import User
 from src.infrastructure.session_manager import Session, SessionManager
 from src.infrastructure.storages.auth_repository import AuthRepository
+from src.infrastructure.storages.crypto_store import SqliteCryptoStore
+from src.infrastructure.storages.engines import dispose_read_model_engines
+from src.infrastructure.storages.replicas import ReadRouter, read_from_primary
 from src.infrastructure.websocket_manager import WebSocketManager
 from src.read_facades.club_read_facade import ClubReadFacade
+from src.read_facades.player_membership_index import PlayerMembershipIndex
 from src.read_facades.public_read_facade import PublicReadFacade
+from src.read_facades.projection_versions import ProjectionVersions
+from src.read_facades.query_cache import QueryCache
 from src.service_locator import service_locator
 from src.settings import settings
 from src.common.loggers import app_logger
@@ -89,6 +98,26 @@ async def get_current_user_from_websocket(websocket: WebSocket) -> Session:
     return session
 
 
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: Session = Depends(get_current_user_from_session)
+) -> None:
+    """
+    Dependency answering the GET requests of club resources with an ETag derived from the club projection version,
+    or with a 304 when the client already holds the current one, before any database access.
+    """
+    if request.method != "GET" or not current_user.club_id:
+        return
+    etag = service_locator.projection_versions.etag(current_user.club_id, str(request.url.include_query_params()))
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        raise NotModifiedError(etag)
+    # replicas may lag behind the version the ETag stands for
+    read_from_primary.set(True)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
 async def check_club_access(
     club_id: str,
     current_user: Session = Depends(get_current_user_from_session)
@@ -128,38 +157,69 @@ async def check_club_access_optional(
     return await check_club_access(club_id, current_user)
 
 
+async def check_admin_access(
+    current_user: Session = Depends(get_current_user_from_session)
+) -> Session:
+    """
+    Dependency restricting operational endpoints to the users listed in the ADMIN_USER_IDS setting.
+    """
+    if current_user.user_id not in settings.ADMIN_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You are not authorized to access this resource"
+        )
+
+    return current_user
+
+
 async def init_message_broker(message_broker : InMemBus, event_store : IEventStore) -> IEventPublisher:
     return message_broker
 
 @asynccontextmanager
 async def lifespan(app : FastAPI)-> AsyncGenerator[Any, None]:
     db_url = "sqlite+aiosqlite:///read_model.db"
-    public_read_facade = PublicReadFacade(db_url)
-    club_read_facade = ClubReadFacade(db_url)
+    read_router = ReadRouter(db_url, settings.READ_REPLICA_PATHS, settings.READ_REPLICA_MAX_LAG)
+    query_cache = QueryCache(settings.QUERY_CACHE_MAX_ENTRIES, settings.QUERY_CACHE_TTL)
+    service_locator.query_cache = query_cache
+    projection_versions = ProjectionVersions()
+    service_locator.projection_versions = projection_versions
+    public_read_facade = PublicReadFacade(db_url, read_router, query_cache)
+    club_read_facade = ClubReadFacade(db_url, read_router, query_cache)
     websocket_manager = WebSocketManager()
     service_locator.websocket_manager = websocket_manager
-    event_store = JsonFileEventStore("./event_store.json", [public_read_facade, club_read_facade])
+    # the event store decodes its events on load, the encryption keys must be available first
+    crypto_store = SqliteCryptoStore("./crypto_store.db")
+    CryptoRepository.crypto_store = crypto_store
+    if not os.path.exists("./event_store.jsonl") and os.path.exists("./event_store.json"):
+        convert_json_file_event_store("./event_store.json", "./event_store.jsonl")
+    player_membership_index = PlayerMembershipIndex()
+    event_store = JsonLinesEventStore("./event_store.jsonl", [public_read_facade, club_read_facade, player_membership_index], settings.EVENT_STORE_MAX_BATCH_DELAY, settings.EVENT_STORE_MAX_BATCH_SIZE)
     service_locator.public_read_facade = public_read_facade
     service_locator.club_read_facade = club_read_facade
     service_locator.event_publisher = await init_message_broker(InMemBus(), event_store)
-    club_repo = EventStoreRepository(event_store, Club)
+    club_repo = EventStoreRepository(event_store, Club, settings.AGGREGATE_CACHE_MAX_EVENTS)
     auth_repo = AuthRepository("./auth_repository.json")
-    user_repo = EventStoreRepository(event_store, User)
-    federation_repo = EventStoreRepository(event_store, Federation)
-    training_session_repo = EventStoreRepository(event_store, TrainingSession)
-    player_repo = EventStoreRepository(event_store, Player)
+    user_repo = EventStoreRepository(event_store, User, settings.AGGREGATE_CACHE_MAX_EVENTS)
+    federation_repo = EventStoreRepository(event_store, Federation, settings.AGGREGATE_CACHE_MAX_EVENTS)
+    training_session_repo = EventStoreRepository(event_store, TrainingSession, settings.AGGREGATE_CACHE_MAX_EVENTS)
+    player_repo = EventStoreRepository(event_store, Player, settings.AGGREGATE_CACHE_MAX_EVENTS)
     auth_service = AuthService(auth_repo, user_repo, club_repo)
-    worker = Worker(event_store, db_url)
+    worker = Worker(event_store, db_url, read_router.observe_primary_position, query_cache, projection_versions)
     service_locator.club_service = ClubService(auth_service, service_locator.event_publisher, club_repo)
     service_locator.player_service = PlayerService(auth_service, service_locator.event_publisher, player_repo, club_repo, federation_repo)
-    collective_repo = EventStoreRepository(event_store, Collective)
+    collective_repo = EventStoreRepository(event_store, Collective, settings.AGGREGATE_CACHE_MAX_EVENTS)
     service_locator.collective_service = CollectiveService(auth_service, service_locator.event_publisher, collective_repo, club_repo)
-    service_locator.training_session_service = TrainingSessionService(auth_service, service_locator.event_publisher, training_session_repo, player_repo)
+    service_locator.training_session_service = TrainingSessionService(auth_service, service_locator.event_publisher, training_session_repo, player_repo, collective_repo, player_membership_index)
     service_locator.auth_service = auth_service
 
     service_locator.session_manager = SessionManager()
     asyncio.create_task(worker.start())
+    asyncio.create_task(read_router.start(settings.READ_REPLICA_REFRESH_INTERVAL))
     yield
     worker.stop()
+    read_router.stop()
+    await event_store.close()
+    crypto_store.close()
+    await dispose_read_model_engines()
     
     
\ No newline at end of file
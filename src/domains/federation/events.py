@@ -2,10 +2,21 @@
 
 from dataclasses import dataclass
 from src.common.enums import LicenseType
-from src.common.eventsourcing.event import IEvent
+from src.common.eventsourcing.data import Data
+from src.common.eventsourcing.event import IEvent, Snapshot
 
 @dataclass
 class PlayerLicenseRegistered(IEvent):
     player_id: str
     license_number: str
-    license_type: LicenseType
\ No newline at end of file
+    license_type: LicenseType
+
+@dataclass
+class RegisteredPlayerLicense(Data):
+    player_id: str
+    license_number: str
+    license_type: LicenseType
+
+@dataclass
+class FederationSnapshotTaken(Snapshot):
+    player_licenses: list[RegisteredPlayerLicense]
@@ -5,8 +5,10 @@ from src.common.eventsourcing.event import IEvent
 from src.common.eventsourcing.exceptions import InvalidOperationError
 from src.common.guid import guid
 from src.common.enums import Gender, LicenseType
-from src.common.eventsourcing.aggregates import AggregateRoot
-from src.domains.federation.events import PlayerLicenseRegistered
+from src.common.eventsourcing.aggregates import SnapshotAggregateRoot
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.common.eventsourcing.event import Snapshot
+from src.domains.federation.events import FederationSnapshotTaken, PlayerLicenseRegistered, RegisteredPlayerLicense
 
 
 class PlayerLicense(BaseModel):
@@ -15,7 +17,7 @@ class PlayerLicense(BaseModel):
     license_type: LicenseType
 
 
-class Federation(AggregateRoot):
+class Federation(SnapshotAggregateRoot):
 
     @property
     def id(self) -> str:
@@ -41,6 +43,17 @@ class Federation(AggregateRoot):
         self._apply_change(PlayerLicenseRegistered(player_id=player_id, license_number=license_number, license_type=license_type, actor_id=actor_id))
 
 
+    def take_snapshot(self, archive: str) -> Snapshot:
+        return FederationSnapshotTaken(
+            actor_id=SYSTEM_ACTOR_ID,
+            archived_version=self.version,
+            archive=archive,
+            player_licenses=[RegisteredPlayerLicense(player_id=license.player_id, license_number=license.license_number, license_type=license.license_type) for license in self.player_licenses.values()])
+
     @dispatch(PlayerLicenseRegistered)
     def _apply(self, event: PlayerLicenseRegistered):
-        self.player_licenses[event.license_number] = PlayerLicense(player_id=event.player_id, license_number=event.license_number, license_type=event.license_type)
\ No newline at end of file
+        self.player_licenses[event.license_number] = PlayerLicense(player_id=event.player_id, license_number=event.license_number, license_type=event.license_type)
+
+    @dispatch(FederationSnapshotTaken)
+    def _apply(self, event: FederationSnapshotTaken):
+        self.player_licenses = {license.license_number: PlayerLicense(player_id=license.player_id, license_number=license.license_number, license_type=license.license_type) for license in event.player_licenses}
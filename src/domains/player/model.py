@@ -1,6 +1,6 @@
 from datetime import date
 from multipledispatch import dispatch
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from src.common.eventsourcing.event import IEvent
 from src.common.eventsourcing.exceptions import InvalidOperationError
 from src.common.guid import guid
@@ -16,7 +16,7 @@ class PlayerRegisterData(BaseModel):
     gender: Gender
     date_of_birth: date
     license_number: str | None = None
-    player_id: str = guid()
+    player_id: str = Field(default_factory=guid)
 
 class Player(AggregateRoot):
 
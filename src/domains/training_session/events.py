@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from src.common.enums import TrainingSessionPlayerStatus
-from src.common.eventsourcing.event import IEvent
+from src.common.eventsourcing.data import Data
+from src.common.eventsourcing.event import IEvent, Snapshot
 
 @dataclass
 class TrainingSessionCreated(IEvent):
@@ -44,4 +45,21 @@ class TrainingSessionCanceled(IEvent):
 class PlayerRemovedFromTrainingSession(IEvent):
     training_session_id: str
     player_id: str
-    club_id: str
\ No newline at end of file
+    club_id: str
+
+@dataclass
+class TrainingSessionPlayerAttendance(Data):
+    player_id: str
+    status: TrainingSessionPlayerStatus
+    with_reason: bool = False
+    reason: str | None = None
+    arrival_time: str | None = None
+
+@dataclass
+class TrainingSessionSnapshotTaken(Snapshot):
+    training_session_id: str
+    club_id: str
+    start_time: str
+    end_time: str
+    attendance: list[TrainingSessionPlayerAttendance]
+    cancelled: bool = False
@@ -2,11 +2,13 @@
 from multipledispatch import dispatch
 from pydantic import BaseModel
 from src.common.enums import TrainingSessionPlayerStatus
-from src.common.eventsourcing.aggregates import AggregateRoot
+from src.common.eventsourcing.aggregates import SnapshotAggregateRoot
 from datetime import datetime
 from src.common.eventsourcing.exceptions import InvalidOperationError
 from src.common.guid import guid
-from src.domains.training_session.events import PlayerRemovedFromTrainingSession, PlayerTrainingSessionStatusChangedToAbsent, PlayerTrainingSessionStatusChangedToLate, PlayerTrainingSessionStatusChangedToPresent, TrainingSessionCanceled, TrainingSessionCreated
+from src.common.eventsourcing.event import Snapshot
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.domains.training_session.events import PlayerRemovedFromTrainingSession, PlayerTrainingSessionStatusChangedToAbsent, PlayerTrainingSessionStatusChangedToLate, PlayerTrainingSessionStatusChangedToPresent, TrainingSessionCanceled, TrainingSessionCreated, TrainingSessionPlayerAttendance, TrainingSessionSnapshotTaken
 
 class TrainingSessionCreate(BaseModel):
     actor_id: str
@@ -15,7 +17,7 @@ class TrainingSessionCreate(BaseModel):
     end_time: datetime
 
 
-class TrainingSession(AggregateRoot):
+class TrainingSession(SnapshotAggregateRoot):
 
     @property
     def id(self) -> str:
@@ -28,6 +30,7 @@ class TrainingSession(AggregateRoot):
     def __init__(self, create: TrainingSessionCreate | None = None):
         super().__init__()
         self.players = {}
+        self.attendance : dict[str, TrainingSessionPlayerAttendance] = {}
         self.cancelled = False
         if create:
             self._apply_change(TrainingSessionCreated(
@@ -81,6 +84,23 @@ class TrainingSession(AggregateRoot):
                     reason=reason,
                 ))
     
+    def change_players_status(self, actor_id: str, player_ids: list[str], status: TrainingSessionPlayerStatus, reason: str | None = None, arrival_time: datetime | None = None, with_reason: bool = False):
+        for player_id in player_ids:
+            self.change_player_status(actor_id, player_id, status, reason=reason, arrival_time=arrival_time, with_reason=with_reason)
+
+    def take_snapshot(self, archive: str) -> Snapshot:
+        return TrainingSessionSnapshotTaken(
+            actor_id=SYSTEM_ACTOR_ID,
+            archived_version=self.version,
+            archive=archive,
+            training_session_id=self.id,
+            club_id=self.club_id,
+            start_time=self.start_time.isoformat(),
+            end_time=self.end_time.isoformat(),
+            attendance=list(self.attendance.values()),
+            cancelled=self.cancelled,
+        )
+
     @dispatch(TrainingSessionCreated)
     def _apply(self, event: TrainingSessionCreated):
         self.__id = event.training_session_id
@@ -91,20 +111,38 @@ class TrainingSession(AggregateRoot):
     @dispatch(PlayerTrainingSessionStatusChangedToPresent)
     def _apply(self, event: PlayerTrainingSessionStatusChangedToPresent):
         self.players[event.player_id] = TrainingSessionPlayerStatus.PRESENT
+        self.attendance[event.player_id] = TrainingSessionPlayerAttendance(player_id=event.player_id, status=TrainingSessionPlayerStatus.PRESENT)
 
     @dispatch(PlayerTrainingSessionStatusChangedToAbsent)
     def _apply(self, event: PlayerTrainingSessionStatusChangedToAbsent):
         self.players[event.player_id] = TrainingSessionPlayerStatus.ABSENT
+        self.attendance[event.player_id] = TrainingSessionPlayerAttendance(player_id=event.player_id, status=TrainingSessionPlayerStatus.ABSENT, with_reason=event.with_reason, reason=event.reason)
 
     @dispatch(PlayerTrainingSessionStatusChangedToLate)
     def _apply(self, event: PlayerTrainingSessionStatusChangedToLate):
         self.players[event.player_id] = TrainingSessionPlayerStatus.LATE
+        self.attendance[event.player_id] = TrainingSessionPlayerAttendance(player_id=event.player_id, status=TrainingSessionPlayerStatus.LATE, with_reason=event.with_reason, reason=event.reason, arrival_time=event.arrival_time)
 
     @dispatch(TrainingSessionCanceled)
     def _apply(self, event: TrainingSessionCanceled):
         self.players = {}
+        self.attendance = {}
         self.cancelled = True
 
     @dispatch(PlayerRemovedFromTrainingSession)
     def _apply(self, event: PlayerRemovedFromTrainingSession):
-        self.players.pop(event.player_id)
\ No newline at end of file
+        self.players.pop(event.player_id)
+        self.attendance.pop(event.player_id)
+
+    @dispatch(TrainingSessionSnapshotTaken)
+    def _apply(self, event: TrainingSessionSnapshotTaken):
+        self.__id = event.training_session_id
+        self.club_id = event.club_id
+        self.start_time = datetime.fromisoformat(event.start_time)
+        self.end_time = datetime.fromisoformat(event.end_time)
+        self.cancelled = event.cancelled
+        self.attendance = {}
+        for attendance in event.attendance:
+            attendance.status = TrainingSessionPlayerStatus(attendance.status)
+            self.attendance[attendance.player_id] = attendance
+        self.players = {player_id: attendance.status for player_id, attendance in self.attendance.items()}
\ No newline at end of file
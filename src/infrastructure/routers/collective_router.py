@@ -4,15 +4,16 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from httpx import get
 from pydantic import BaseModel
-from src.dependencies import check_club_access, get_current_user_from_session
-from src.read_facades.dtos import CollectiveDTO, CollectiveListDTO, CollectivePlayerDTO
+from src.dependencies import check_club_access, conditional_get, get_current_user_from_session
+from src.common.enums import Season
+from src.read_facades.dtos import CollectiveAttendanceStatsDTO, CollectiveDTO, CollectiveListDTO, CollectivePlayerDTO
 from src.read_facades.pagination import PaginatedDTO
 from src.service_locator import service_locator
 from src.application.collective.commands import CreateCollectiveCommand, AddPlayerToCollectiveCommand, RemovePlayerFromCollectiveCommand
 from src.infrastructure.session_manager import Session
 from src.common.loggers import app_logger
 
-router = APIRouter(prefix="/collectives", tags=["collectives"])
+router = APIRouter(prefix="/collectives", tags=["collectives"], dependencies=[Depends(conditional_get)])
 
 class CollectiveCreateRequest(BaseModel):
     name: str
@@ -88,14 +89,25 @@ async def get_collective_players(
     collective_id: str,
     current_user: Session = Depends(get_current_user_from_session),
     page: int = 0,
-    per_page: int = 10
+    per_page: int = 10,
+    cursor: str | None = None,
+    with_total: bool = True
 ) -> PaginatedDTO[CollectivePlayerDTO]:
-    return await service_locator.club_read_facade.get_collective_players(current_user.club_id, collective_id, page, per_page)
+    return await service_locator.club_read_facade.get_collective_players(current_user.club_id, collective_id, page, per_page, cursor, with_total)
+
+@router.get("/{collective_id}/attendance")
+async def get_collective_attendance_stats(
+    collective_id: str,
+    season: int | None = None,
+    current_user: Session = Depends(get_current_user_from_session)
+) -> CollectiveAttendanceStatsDTO:
+    return await service_locator.club_read_facade.get_collective_attendance_stats(current_user.club_id, collective_id, Season.from_year(season) if season else Season.current())
 
 @router.get("/{collective_id}/unassigned-players/search")
 async def get_unassigned_players(
     collective_id: str,
     q : str = Query(default=""),
+    limit: int = Query(default=20, ge=1, le=100),
     current_user: Session = Depends(get_current_user_from_session),
 ) -> list[CollectivePlayerDTO]:
-    return await service_locator.club_read_facade.search_unassigned_players_in_collective(current_user.club_id, collective_id, q)
\ No newline at end of file
+    return await service_locator.club_read_facade.search_unassigned_players_in_collective(current_user.club_id, collective_id, q, limit)
\ No newline at end of file
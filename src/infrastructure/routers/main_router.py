@@ -7,7 +7,7 @@ from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse, HTMLResponse
 from starlette.responses import RedirectResponse
-from src.dependencies import get_current_user_from_session, get_current_user_from_websocket
+from src.dependencies import check_admin_access, get_current_user_from_session, get_current_user_from_websocket
 from src.service_locator import service_locator
 from src.infrastructure.session_manager import Session
 from src.settings import settings
@@ -31,6 +31,11 @@ async def get_openapi_json(session: Session = Depends(get_current_user_from_sess
     )
     return JSONResponse(openapi_schema)
 
+@router.get("/cache/stats")
+async def get_query_cache_stats(session: Session = Depends(check_admin_access)) -> dict:
+    stats = service_locator.query_cache.stats
+    return {"hits": stats.hits, "misses": stats.misses, "hit_ratio": stats.hit_ratio, "invalidations": stats.invalidations, "evictions": stats.evictions, "size": stats.size}
+
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket, current_user : Annotated[Session, Depends(get_current_user_from_websocket)]):
     await websocket.accept()
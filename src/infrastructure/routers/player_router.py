@@ -1,18 +1,18 @@
 from datetime import date
 from typing import Annotated
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from src.application.player.commands import RegisterPlayerCommand
+from pydantic import BaseModel, Field
+from src.application.player.commands import PlayerRegistration, RegisterPlayerCommand, RegisterPlayersCommand
 from src.common.enums import Gender, LicenseType, Season
-from src.dependencies import get_current_user_from_session
-from src.read_facades.dtos import ClubPlayerDTO, CollectivePlayerDTO
+from src.dependencies import conditional_get, get_current_user_from_session
+from src.read_facades.dtos import ClubPlayerDTO, CollectivePlayerDTO, PlayerAttendanceStatsDTO
 from src.read_facades.pagination import PaginatedDTO
 from src.service_locator import service_locator
 from src.infrastructure.session_manager import Session
 
-router = APIRouter(prefix="/players", tags=["players"])
+router = APIRouter(prefix="/players", tags=["players"], dependencies=[Depends(conditional_get)])
 
 class RegisterPlayerRequest(BaseModel):
     first_name: str
@@ -39,20 +39,55 @@ async def register_player(
         season=Season.current()))
     return JSONResponse(status_code=201, content={"message": "Player registered successfully"})
 
+class RegisterPlayersRequest(BaseModel):
+    players: list[RegisterPlayerRequest] = Field(max_length=1000)
+
+@router.post("/register-bulk")
+async def register_players(
+    register_players_request: RegisterPlayersRequest,
+    current_user: Session = Depends(get_current_user_from_session)
+):
+    result = await service_locator.player_service.handle(RegisterPlayersCommand(
+        actor_id=current_user.user_id,
+        club_id=current_user.club_id,
+        season=Season.current(),
+        players=[PlayerRegistration(**player.model_dump()) for player in register_players_request.players]))
+    return JSONResponse(status_code=201 if not result.errors else 207, content={
+        "player_ids": result.player_ids,
+        "errors": [{"row": error.row, "message": error.message} for error in result.errors]})
+
 @router.get("")
 async def get_player_list(
     current_user: Session = Depends(get_current_user_from_session),
     page: int = 0,
-    per_page: int = 10
+    per_page: int = 10,
+    cursor: str | None = None,
+    with_total: bool = True
 ) -> PaginatedDTO[ClubPlayerDTO]:
-    return await service_locator.club_read_facade.club_players(current_user.club_id, page, per_page)
+    return await service_locator.club_read_facade.club_players(current_user.club_id, page, per_page, cursor, with_total)
 
 
 @router.get("/search")
 async def search_players(
     q: str,
+    limit: int = Query(default=20, ge=1, le=100),
     current_user: Session = Depends(get_current_user_from_session)
 ) -> list[CollectivePlayerDTO]:
-    return await service_locator.club_read_facade.search_players(current_user.club_id, q)
+    return await service_locator.club_read_facade.search_players(current_user.club_id, q, limit)
+
+@router.get("/attendance")
+async def get_players_attendance_stats(
+    season: int | None = None,
+    current_user: Session = Depends(get_current_user_from_session)
+) -> list[PlayerAttendanceStatsDTO]:
+    return await service_locator.club_read_facade.get_players_attendance_stats(current_user.club_id, Season.from_year(season) if season else Season.current())
+
+@router.get("/{player_id}/attendance")
+async def get_player_attendance_stats(
+    player_id: str,
+    season: int | None = None,
+    current_user: Session = Depends(get_current_user_from_session)
+) -> PlayerAttendanceStatsDTO:
+    return await service_locator.club_read_facade.get_player_attendance_stats(current_user.club_id, player_id, Season.from_year(season) if season else Season.current())
 
 
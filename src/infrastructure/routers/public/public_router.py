@@ -1,5 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Request
 from src.common.enums import LicenseType, Season
+from src.infrastructure.routers.streaming import NDJSON_MEDIA_TYPE, stream_models
 from src.read_facades.dtos import PublicPlayerDTO
 from src.service_locator import service_locator
 
@@ -9,6 +10,13 @@ router = APIRouter(prefix="/public", tags=["Public"])
 async def get_club_list():
     return await service_locator.public_read_facade.get_club_list()
 
-@router.get("/players")
-async def get_player_list() -> list[PublicPlayerDTO]:
-    return await service_locator.public_read_facade.get_player_list()
\ No newline at end of file
+@router.get("/players", response_model=list[PublicPlayerDTO])
+async def get_player_list(
+    request: Request,
+    club_id: str | None = None,
+    after: str | None = Query(default=None, description="id of the last player received, the list resumes after it"),
+    limit: int | None = Query(default=None, ge=1),
+    format: str | None = Query(default=None, pattern="^(json|ndjson)$")
+):
+    ndjson = format == "ndjson" or (format is None and NDJSON_MEDIA_TYPE in request.headers.get("accept", ""))
+    return stream_models(service_locator.public_read_facade.iter_players(club_id, after, limit), ndjson)
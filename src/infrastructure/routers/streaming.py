@@ -0,0 +1,60 @@
+import csv
+import io
+from typing import AsyncIterator, Iterable
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+async def json_array_chunks(items : AsyncIterator[BaseModel], batch_size : int) -> AsyncIterator[str]:
+    yield "["
+    batch = []
+    first = True
+    async for item in items:
+        batch.append(item.model_dump_json() if first else "," + item.model_dump_json())
+        first = False
+        if len(batch) >= batch_size:
+            yield "".join(batch)
+            batch = []
+    batch.append("]")
+    yield "".join(batch)
+
+async def ndjson_chunks(items : AsyncIterator[BaseModel], batch_size : int) -> AsyncIterator[str]:
+    batch = []
+    async for item in items:
+        batch.append(item.model_dump_json() + "\n")
+        if len(batch) >= batch_size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+def stream_models(items : AsyncIterator[BaseModel], ndjson : bool = False, batch_size : int = 100) -> StreamingResponse:
+    """
+    Stream models as they are produced, as a JSON array or as newline-delimited JSON, a batch of models per chunk.
+    """
+    if ndjson:
+        return StreamingResponse(ndjson_chunks(items, batch_size), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(json_array_chunks(items, batch_size), media_type="application/json")
+
+def csv_chunks(header : list[str], rows : Iterable[list[str]], batch_size : int) -> Iterable[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def stream_csv(header : list[str], rows : Iterable[list[str]], filename : str, batch_size : int = 100) -> StreamingResponse:
+    """
+    Stream rows as a CSV attachment, a batch of rows per chunk.
+    """
+    return StreamingResponse(csv_chunks(header, rows, batch_size), media_type=CSV_MEDIA_TYPE, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
@@ -1,20 +1,30 @@
 from datetime import date, datetime
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
-from src.application.training_session.commands import ChangePlayerTrainingSessionStatusCommand, CreateTrainingSessionCommand, RemovePlayerFromTrainingSessionCommand
-from src.common.enums import TrainingSessionPlayerStatus
-from src.dependencies import get_current_user_from_session
+from src.application.training_session.commands import ChangePlayerTrainingSessionStatusCommand, ChangePlayersTrainingSessionStatusCommand, CreateTrainingSessionCommand, RemovePlayerFromTrainingSessionCommand
+from src.common.enums import Season, TrainingSessionPlayerStatus
+from src.dependencies import conditional_get, get_current_user_from_session
 from src.read_facades.dtos import ClubPlayerDTO, TrainingSessionDTO, TrainingSessionPlayerDTO
 from src.read_facades.pagination import PaginatedDTO
+from src.infrastructure.routers.streaming import stream_csv
 from src.service_locator import service_locator
 from src.infrastructure.session_manager import Session
 
-router = APIRouter(prefix="/training-sessions", tags=["training-sessions"])
+router = APIRouter(prefix="/training-sessions", tags=["training-sessions"], dependencies=[Depends(conditional_get)])
 
 class CreateTrainingSessionRequest(BaseModel):
     start_time: datetime
     end_time: datetime
 
+@router.get("/attendance-report")
+async def get_season_attendance_report(
+    season: int | None = None,
+    current_user: Session = Depends(get_current_user_from_session)
+):
+    season = Season.from_year(season) if season else Season.current()
+    matrix = await service_locator.club_read_facade.get_season_attendance_matrix(current_user.club_id, season)
+    return stream_csv(matrix.header(), matrix.rows(), f"attendance-{season.start_year}-{season.end_year}.csv")
+
 @router.get("/{training_session_id}")
 async def get_training_session(
     training_session_id: str,
@@ -26,27 +36,32 @@ async def get_training_session(
 async def get_training_session_list(
     current_user: Session = Depends(get_current_user_from_session),
     page: int = 0,
-    per_page: int = 10
+    per_page: int = 10,
+    cursor: str | None = None,
+    with_total: bool = True
 ) -> PaginatedDTO[TrainingSessionDTO]:
-    return await service_locator.club_read_facade.get_training_session_list(current_user.club_id, page, per_page)
+    return await service_locator.club_read_facade.get_training_session_list(current_user.club_id, page, per_page, cursor, with_total)
 
 @router.get("/{training_session_id}/players")
 async def get_training_session_players(
     training_session_id: str,
     current_user: Session = Depends(get_current_user_from_session),
     page: int = 0,
-    per_page: int = 10
+    per_page: int = 10,
+    cursor: str | None = None,
+    with_total: bool = True
 ) -> PaginatedDTO[TrainingSessionPlayerDTO]:
-    return await service_locator.club_read_facade.get_training_session_players(current_user.club_id, training_session_id, page, per_page)
+    return await service_locator.club_read_facade.get_training_session_players(current_user.club_id, training_session_id, page, per_page, cursor, with_total)
 
 @router.get("/{training_session_id}/unassigned-players/search")
 async def get_unassigned_players(
     training_session_id: str,
     q: str = Query(default=""),
     collective_id: str | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
     current_user: Session = Depends(get_current_user_from_session)
 ) -> list[ClubPlayerDTO]:
-    return await service_locator.club_read_facade.search_players_not_in_training_session(current_user.club_id, training_session_id, collective_id, q)
+    return await service_locator.club_read_facade.search_players_not_in_training_session(current_user.club_id, training_session_id, collective_id, q, limit)
 
 @router.post("/create")
 async def create_training_session(
@@ -116,6 +131,31 @@ async def change_player_status(
         with_reason=change_player_status_late_request.with_reason,
         reason=change_player_status_late_request.reason))
 
+class ChangePlayersStatusRequest(BaseModel):
+    status: TrainingSessionPlayerStatus
+    player_ids: list[str] = []
+    collective_id: str | None = None
+    arrival_time: datetime | None = None
+    with_reason: bool = False
+    reason: str | None = None
+
+@router.post("/{training_session_id}/change-players-status")
+async def change_players_status(
+    training_session_id: str,
+    change_players_status_request: ChangePlayersStatusRequest,
+    current_user: Session = Depends(get_current_user_from_session)
+):
+    await service_locator.training_session_service.handle(ChangePlayersTrainingSessionStatusCommand(
+        actor_id=current_user.user_id,
+        club_id=current_user.club_id,
+        training_session_id=training_session_id,
+        status=change_players_status_request.status,
+        player_ids=change_players_status_request.player_ids,
+        collective_id=change_players_status_request.collective_id,
+        arrival_time=change_players_status_request.arrival_time,
+        with_reason=change_players_status_request.with_reason,
+        reason=change_players_status_request.reason))
+
 @router.post("/{training_session_id}/remove-player/{player_id}")
 async def remove_player_from_training_session(
     training_session_id: str,
@@ -0,0 +1,55 @@
+from sqlalchemy import Connection, Select, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.storages.sql_model import Player, TrainingSession, TrainingSessionAttendance, TrainingSessionPlayer
+
+
+def attendance_rows() -> Select:
+    """
+    TrainingSessionPlayer rows joined with their training session and player, in the column order of the attendance sheet.
+    """
+    return (select(TrainingSessionPlayer.training_session_id, TrainingSessionPlayer.player_id, TrainingSession.club_id,
+                   Player.first_name, Player.last_name, Player.gender, Player.date_of_birth, Player.license_number, Player.license_type,
+                   TrainingSessionPlayer.status, TrainingSessionPlayer.reason, TrainingSessionPlayer.with_reason, TrainingSessionPlayer.arrival_time)
+            .join(TrainingSession, TrainingSessionPlayer.training_session_id == TrainingSession.id)
+            .join(Player, TrainingSessionPlayer.player_id == Player.id))
+
+attendance_columns = ["training_session_id", "player_id", "club_id", "first_name", "last_name", "gender", "date_of_birth", "license_number", "license_type", "status", "reason", "with_reason", "arrival_time"]
+
+async def record_attendance(session : AsyncSession, training_session_id : str, player_id : str) -> None:
+    """
+    Copy the attendance of a player to the attendance sheet, it must have been added to the session.
+    """
+    await session.flush()
+    await session.execute(delete(TrainingSessionAttendance).where(TrainingSessionAttendance.training_session_id == training_session_id, TrainingSessionAttendance.player_id == player_id))
+    await session.execute(insert(TrainingSessionAttendance).from_select(attendance_columns, attendance_rows().where(TrainingSessionPlayer.training_session_id == training_session_id, TrainingSessionPlayer.player_id == player_id)))
+
+async def record_training_session_attendance(session : AsyncSession, training_session_id : str) -> None:
+    """
+    Copy the attendance of every player of a training session to the attendance sheet.
+    """
+    await session.flush()
+    await session.execute(delete(TrainingSessionAttendance).where(TrainingSessionAttendance.training_session_id == training_session_id))
+    await session.execute(insert(TrainingSessionAttendance).from_select(attendance_columns, attendance_rows().where(TrainingSessionPlayer.training_session_id == training_session_id)))
+
+async def remove_attendance(session : AsyncSession, training_session_id : str, player_id : str) -> None:
+    await session.execute(delete(TrainingSessionAttendance).where(TrainingSessionAttendance.training_session_id == training_session_id, TrainingSessionAttendance.player_id == player_id))
+
+async def update_attendance_player(session : AsyncSession, player_id : str) -> None:
+    """
+    Refresh the player display fields of the attendance sheets the player is on.
+    """
+    await session.flush()
+    player = await session.get(Player, player_id)
+    if player:
+        await session.execute(update(TrainingSessionAttendance).where(TrainingSessionAttendance.player_id == player_id).values(
+            first_name=player.first_name, last_name=player.last_name, gender=player.gender, date_of_birth=player.date_of_birth,
+            license_number=player.license_number, license_type=player.license_type))
+
+def ensure_attendance_sheet(conn : Connection) -> None:
+    """
+    Fill the attendance sheet of a database created before it existed.
+    """
+    copied = conn.execute(select(func.count()).select_from(TrainingSessionAttendance)).scalar()
+    if copied == 0:
+        conn.execute(insert(TrainingSessionAttendance).from_select(attendance_columns, attendance_rows()))
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.common.enums import Season, TrainingSessionPlayerStatus
+from src.infrastructure.storages.sql_model import PlayerSeasonAttendance, TrainingSession, TrainingSessionPlayer
+
+
+def session_season(training_session : TrainingSession) -> Season:
+    return Season.from_date(datetime.fromisoformat(training_session.start_time))
+
+async def count_attendance(session : AsyncSession, training_session : TrainingSession, player_id : str, status : TrainingSessionPlayerStatus, with_reason : bool, delta : int) -> None:
+    """
+    Add (delta=1) or take back (delta=-1) an attendance of a player to their counters for the season of the training session.
+    """
+    key = {"club_id": training_session.club_id, "season": session_season(training_session).value, "player_id": player_id}
+    stats = await session.get(PlayerSeasonAttendance, key)
+    if stats is None:
+        stats = PlayerSeasonAttendance(**key, present=0, absent=0, late=0, excused_absences=0)
+        session.add(stats)
+    match TrainingSessionPlayerStatus(status):
+        case TrainingSessionPlayerStatus.PRESENT:
+            stats.present += delta
+        case TrainingSessionPlayerStatus.ABSENT:
+            stats.absent += delta
+            if with_reason:
+                stats.excused_absences += delta
+        case TrainingSessionPlayerStatus.LATE:
+            stats.late += delta
+
+async def uncount_training_session(session : AsyncSession, training_session : TrainingSession) -> None:
+    """
+    Take back every attendance recorded for a training session, before it is replaced.
+    """
+    result = await session.execute(select(TrainingSessionPlayer).where(TrainingSessionPlayer.training_session_id == training_session.id))
+    for training_session_player in result.scalars().all():
+        await count_attendance(session, training_session, training_session_player.player_id, training_session_player.status, training_session_player.with_reason, -1)
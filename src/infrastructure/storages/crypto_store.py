@@ -0,0 +1,67 @@
+import asyncio
+import sqlite3
+import threading
+from typing import Iterable
+
+from src.common.eventsourcing.encryption import ICryptoStore
+
+
+class SqliteCryptoStore(ICryptoStore):
+    """
+    Encryption keys persisted in a SQLite database.
+
+    All the keys are loaded with a single query when the store is opened and reads are served
+    from memory, so replaying encrypted events never touches the disk. Writes reach the database
+    before the cache, a key is durable before any event is encrypted with it. Shredding a key
+    deletes its row.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.__keys: dict[str, bytes] = {}
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(file_path, check_same_thread=False, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS encryption_keys (id TEXT PRIMARY KEY, key BLOB NOT NULL)")
+        self.load()
+
+    def load(self) -> None:
+        with self.__lock:
+            self.__keys = {id: bytes(key) for id, key in self.__connection.execute("SELECT id, key FROM encryption_keys")}
+
+    def get_encryption_key(self, id: str) -> bytes | None:
+        return self.__keys.get(id)
+
+    def get_encryption_keys(self, ids: Iterable[str]) -> dict[str, bytes]:
+        return {id: self.__keys[id] for id in ids if id in self.__keys}
+
+    def add(self, id: str, new_encryption_key: bytes) -> None:
+        with self.__lock:
+            self.__connection.execute("INSERT OR REPLACE INTO encryption_keys (id, key) VALUES (?, ?)", (id, new_encryption_key))
+            self.__keys[id] = new_encryption_key
+
+    def remove(self, id: str) -> None:
+        with self.__lock:
+            self.__connection.execute("DELETE FROM encryption_keys WHERE id = ?", (id,))
+            self.__keys.pop(id, None)
+
+    def add_missing(self, new_encryption_keys: dict[str, bytes]) -> dict[str, bytes]:
+        with self.__lock:
+            missing = [(id, key) for id, key in new_encryption_keys.items() if id not in self.__keys]
+            if missing:
+                self.__connection.execute("BEGIN")
+                try:
+                    self.__connection.executemany("INSERT INTO encryption_keys (id, key) VALUES (?, ?)", missing)
+                except BaseException:
+                    self.__connection.execute("ROLLBACK")
+                    raise
+                self.__connection.execute("COMMIT")
+                self.__keys.update(missing)
+            return {id: self.__keys[id] for id in new_encryption_keys}
+
+    async def add_missing_async(self, new_encryption_keys: dict[str, bytes]) -> dict[str, bytes]:
+        return await asyncio.to_thread(self.add_missing, new_encryption_keys)
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__connection.close()
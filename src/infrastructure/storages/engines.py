@@ -0,0 +1,55 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record, read_only : bool) -> None:
+    cursor = dbapi_connection.cursor()
+    # WAL lets the readers go on while the projector writes, they read the last committed state
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+class ReadModelEngines:
+    """
+    Engines of a read-model database: a pool of read-only connections for the read facades and a
+    single write connection for the projector, SQLite serialising writers anyway.
+    """
+    def __init__(self, url : str, read_pool_size : int = 10) -> None:
+        self.url = url
+        self.read_engine = self.__create_engine(read_pool_size, read_only=True)
+        self.write_engine = self.__create_engine(1, read_only=False)
+
+    def __create_engine(self, pool_size : int, read_only : bool) -> AsyncEngine:
+        engine = create_async_engine(self.url,
+                                     echo=False,
+                                     pool_size=pool_size,
+                                     max_overflow=0,
+                                     pool_pre_ping=True,
+                                     pool_recycle=3600)
+        if engine.dialect.name == "sqlite":
+            event.listen(engine.sync_engine, "connect", lambda dbapi_connection, connection_record: set_sqlite_pragmas(dbapi_connection, connection_record, read_only))
+        return engine
+
+    async def dispose(self) -> None:
+        await self.read_engine.dispose()
+        await self.write_engine.dispose()
+
+__engines : dict[str, ReadModelEngines] = {}
+
+def read_model_engines(url : str) -> ReadModelEngines:
+    """
+    The engines of a read-model database, shared by everything using the same url.
+    """
+    engines = __engines.get(url)
+    if engines is None:
+        engines = ReadModelEngines(url)
+        __engines[url] = engines
+    return engines
+
+async def dispose_read_model_engines() -> None:
+    for engines in __engines.values():
+        await engines.dispose()
+    __engines.clear()
@@ -0,0 +1,36 @@
+from sqlalchemy import Connection, MetaData, inspect
+
+from src.common.loggers import app_logger
+from src.infrastructure.storages.attendance_sheet import ensure_attendance_sheet
+from src.infrastructure.storages.player_search import ensure_player_search
+from src.infrastructure.storages.sql_model import Base
+
+
+def ensure_indexes(conn : Connection, metadata : MetaData = Base.metadata) -> list[str]:
+    """
+    Create the indexes declared in the model that an existing read-model database is missing,
+    create_all only adds the missing tables. Returns the names of the created indexes.
+    """
+    inspector = inspect(conn)
+    created = []
+    for table in metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+                created.append(index.name)
+    if created:
+        app_logger.info(f"Created read-model indexes {created}")
+        # refresh the planner statistics so that the new indexes get picked
+        conn.exec_driver_sql("ANALYZE")
+    return created
+
+def migrate(conn : Connection, metadata : MetaData = Base.metadata) -> None:
+    """
+    Bring a read-model database up to the declared schema.
+    """
+    metadata.create_all(conn)
+    ensure_indexes(conn, metadata)
+    ensure_attendance_sheet(conn)
+    if conn.dialect.name == "sqlite":
+        ensure_player_search(conn)
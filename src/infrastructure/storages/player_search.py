@@ -0,0 +1,54 @@
+import re
+
+from sqlalchemy import Connection, DDL, Select, column, event, func, literal_column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.storages.sql_model import Base, Player
+
+
+# FTS5 index of the player names and license numbers, its rowid is the rowid of the player row.
+# Accents are folded and the prefixes of up to 3 characters are indexed for search-as-you-type.
+event.listen(Base.metadata, "after_create", DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS player_search USING fts5("
+    "first_name, last_name, license_number, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')").execute_if(dialect="sqlite"))
+
+player_search = table("player_search", column("rowid"), column("rank"), column("player_search"))
+
+def match_query(search_query : str) -> str | None:
+    """
+    FTS5 query matching the rows holding a token starting with each word of the search query.
+    """
+    tokens = [token for token in re.split(r"\W+", search_query) if token]
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+def search_players(stmt : Select, search_query : str, limit : int) -> Select:
+    """
+    Restrict a select of players to the limit best matches of the search query.
+    An empty search query keeps the first limit players, in name order.
+    """
+    query = match_query(search_query)
+    if query is None:
+        return stmt.order_by(Player.last_name, Player.first_name, Player.id).limit(limit)
+    return (stmt.join(player_search, player_search.c.rowid == literal_column("player.rowid"))
+                .where(player_search.c.player_search.op("MATCH")(query))
+                .order_by(player_search.c.rank, Player.last_name, Player.first_name, Player.id)
+                .limit(limit))
+
+async def index_player(session : AsyncSession, player_id : str) -> None:
+    """
+    (Re)index a player row, it must have been added to the session.
+    """
+    await session.flush()
+    await session.execute(text("DELETE FROM player_search WHERE rowid = (SELECT rowid FROM player WHERE id = :player_id)"), {"player_id": player_id})
+    await session.execute(text("INSERT INTO player_search (rowid, first_name, last_name, license_number) SELECT rowid, first_name, last_name, license_number FROM player WHERE id = :player_id"), {"player_id": player_id})
+
+def ensure_player_search(conn : Connection) -> None:
+    """
+    Fill the search index of a database created before it existed.
+    """
+    indexed = conn.execute(select(func.count()).select_from(player_search)).scalar()
+    if indexed == 0:
+        conn.execute(text("INSERT INTO player_search (rowid, first_name, last_name, license_number) SELECT rowid, first_name, last_name, license_number FROM player"))
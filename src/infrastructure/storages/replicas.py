@@ -0,0 +1,105 @@
+import asyncio
+import itertools
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.common.loggers import app_logger
+from src.infrastructure.storages.engines import read_model_engines
+
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+
+read_from_primary : ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    """
+    Pin the reads of the current context to the primary, for read-your-writes.
+    """
+    token = read_from_primary.set(True)
+    try:
+        yield
+    finally:
+        read_from_primary.reset(token)
+
+async def read_consistency_middleware(request, call_next):
+    if request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary":
+        with primary_reads():
+            return await call_next(request)
+    return await call_next(request)
+
+def sqlite_path(url : str) -> str:
+    return url.split(":///")[1]
+
+class ReadReplica:
+    """
+    Read-only snapshot copy of the primary read-model database, refreshed with the SQLite backup API.
+    """
+    def __init__(self, path : str, url_prefix : str) -> None:
+        self.path = path
+        self.engine = read_model_engines(f"{url_prefix}:///{path}").read_engine
+        # position of the last projected event in the copy, unknown until this process refreshed it
+        self.position : int | None = None
+
+    def refresh(self, primary_path : str) -> int:
+        source = sqlite3.connect(primary_path)
+        target = sqlite3.connect(self.path)
+        try:
+            source.backup(target)
+            row = target.execute("SELECT position FROM last_recorded_event_position WHERE id = 1").fetchone()
+        finally:
+            target.close()
+            source.close()
+        return row[0] if row else 0
+
+class ReadRouter:
+    """
+    Routes the reads of the read facades to a replica that lags at most max_lag events behind the
+    primary, or to the primary when none does or when the reads are pinned to it.
+
+    The primary position is reported by the projector, the position of a replica is the one of its last copy.
+    """
+    def __init__(self, primary_url : str, replica_paths : list[str] | None = None, max_lag : int = 0) -> None:
+        self.primary_url = primary_url
+        self.primary_engine = read_model_engines(primary_url).read_engine
+        url_prefix = primary_url.split(":///")[0]
+        self.replicas = [ReadReplica(path, url_prefix) for path in replica_paths or []]
+        self.max_lag = max_lag
+        self.primary_position = 0
+        self.__next = itertools.count()
+        self.__stop = False
+
+    def observe_primary_position(self, position : int) -> None:
+        self.primary_position = position
+
+    def engine(self) -> AsyncEngine:
+        if read_from_primary.get():
+            return self.primary_engine
+        fresh = [replica for replica in self.replicas if replica.position is not None and self.primary_position - replica.position <= self.max_lag]
+        if not fresh:
+            return self.primary_engine
+        return fresh[next(self.__next) % len(fresh)].engine
+
+    def session_maker(self):
+        return lambda: AsyncSession(bind=self.engine(), expire_on_commit=False)
+
+    async def refresh(self) -> None:
+        primary_path = sqlite_path(self.primary_url)
+        for replica in self.replicas:
+            if replica.position is not None and replica.position >= self.primary_position:
+                continue
+            try:
+                replica.position = await asyncio.to_thread(replica.refresh, primary_path)
+            except sqlite3.Error as e:
+                app_logger.error(f"Could not refresh read replica {replica.path}: {e}")
+
+    def stop(self) -> None:
+        self.__stop = True
+
+    async def start(self, refresh_interval : float) -> None:
+        while not self.__stop and self.replicas:
+            await self.refresh()
+            await asyncio.sleep(refresh_interval)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, ForeignKey, Integer, String
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, DeclarativeBase, relationship
 
 from src.common.enums import TrainingSessionPlayerStatus
@@ -22,6 +22,10 @@ class User(Base):
 
 class Club(Base):
     __tablename__ = "club"
+    __table_args__ = (
+        Index("ix_club_owner_id", "owner_id"),
+        Index("ix_club_name", "name"),
+    )
     id: Mapped[str] = mapped_column(String, primary_key=True)
     name: Mapped[str] = mapped_column(String)
     registration_number: Mapped[str] = mapped_column(String, nullable=True)
@@ -31,6 +35,9 @@ class Club(Base):
 
 class Collective(Base):
     __tablename__ = "collective"
+    __table_args__ = (
+        Index("ix_collective_club_id_name", "club_id", "name"),
+    )
     id: Mapped[str] = mapped_column(String, primary_key=True)
     club_id: Mapped[str] = mapped_column(ForeignKey(Club.id))
     name: Mapped[str] = mapped_column(String)
@@ -40,6 +47,9 @@ class Collective(Base):
 
 class Player(Base):
     __tablename__ = "player"
+    __table_args__ = (
+        Index("ix_player_club_id_last_name_first_name_id", "club_id", "last_name", "first_name", "id"),
+    )
     id: Mapped[str] = mapped_column(String, primary_key=True)
     club_id: Mapped[str] = mapped_column(ForeignKey(Club.id), nullable=True)
     club: Mapped[Club] = relationship()
@@ -52,6 +62,9 @@ class Player(Base):
 
 class CollectivePlayer(Base):
     __tablename__ = "collective_player"
+    __table_args__ = (
+        Index("ix_collective_player_player_id", "player_id"),
+    )
     collective_id: Mapped[str] = mapped_column(ForeignKey(Collective.id), primary_key=True)
     player_id: Mapped[str] = mapped_column(ForeignKey(Player.id), primary_key=True)
     collective: Mapped[Collective] = relationship(back_populates="players")
@@ -59,6 +72,9 @@ class CollectivePlayer(Base):
 
 class TrainingSession(Base):
     __tablename__ = "training_session"
+    __table_args__ = (
+        Index("ix_training_session_club_id_start_time_id", "club_id", "start_time", "id"),
+    )
     id: Mapped[str] = mapped_column(String, primary_key=True)
     club_id: Mapped[str] = mapped_column(ForeignKey(Club.id))
     start_time: Mapped[str] = mapped_column(String)
@@ -70,6 +86,9 @@ class TrainingSession(Base):
 
 class TrainingSessionPlayer(Base):
     __tablename__ = "training_session_player"
+    __table_args__ = (
+        Index("ix_training_session_player_player_id", "player_id"),
+    )
     training_session_id: Mapped[str] = mapped_column(ForeignKey(TrainingSession.id), primary_key=True)
     training_session: Mapped[TrainingSession] = relationship()
     player_id: Mapped[str] = mapped_column(ForeignKey(Player.id), primary_key=True)
@@ -77,4 +96,42 @@ class TrainingSessionPlayer(Base):
     status: Mapped[TrainingSessionPlayerStatus] = mapped_column(String)
     reason: Mapped[str] = mapped_column(String, nullable=True)
     with_reason: Mapped[bool] = mapped_column(Boolean, default=False)
-    arrival_time: Mapped[str] = mapped_column(String, nullable=True)
\ No newline at end of file
+    arrival_time: Mapped[str] = mapped_column(String, nullable=True)
+
+class TrainingSessionAttendance(Base):
+    """
+    Attendance sheet of the training sessions, a copy of TrainingSessionPlayer joined with the player display fields
+    and stored in display order.
+    """
+    __tablename__ = "training_session_attendance"
+    __table_args__ = (
+        Index("ix_training_session_attendance_sheet", "training_session_id", "last_name", "first_name", "player_id"),
+        Index("ix_training_session_attendance_player_id", "player_id"),
+    )
+    training_session_id: Mapped[str] = mapped_column(String, primary_key=True)
+    player_id: Mapped[str] = mapped_column(String, primary_key=True)
+    club_id: Mapped[str] = mapped_column(String)
+    first_name: Mapped[str] = mapped_column(String)
+    last_name: Mapped[str] = mapped_column(String)
+    gender: Mapped[str] = mapped_column(String)
+    date_of_birth: Mapped[str] = mapped_column(String)
+    license_number: Mapped[str] = mapped_column(String, nullable=True)
+    license_type: Mapped[str] = mapped_column(String, nullable=True)
+    status: Mapped[TrainingSessionPlayerStatus] = mapped_column(String)
+    reason: Mapped[str] = mapped_column(String, nullable=True)
+    with_reason: Mapped[bool] = mapped_column(Boolean, default=False)
+    arrival_time: Mapped[str] = mapped_column(String, nullable=True)
+
+
+class PlayerSeasonAttendance(Base):
+    """
+    Attendance counters of a player over the training sessions of a season, kept up to date by the Worker.
+    """
+    __tablename__ = "player_season_attendance"
+    club_id: Mapped[str] = mapped_column(String, primary_key=True)
+    season: Mapped[str] = mapped_column(String, primary_key=True)
+    player_id: Mapped[str] = mapped_column(String, primary_key=True)
+    present: Mapped[int] = mapped_column(Integer, default=0)
+    absent: Mapped[int] = mapped_column(Integer, default=0)
+    late: Mapped[int] = mapped_column(Integer, default=0)
+    excused_absences: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,38 @@
+import asyncio
+import unittest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.common.enums import TrainingSessionPlayerStatus
+from src.infrastructure.storages.attendance_stats import count_attendance, uncount_training_session
+from src.infrastructure.storages.sql_model import Base, PlayerSeasonAttendance, TrainingSession, TrainingSessionPlayer
+
+
+class TestAttendanceStats(unittest.TestCase):
+
+    def test_counters_follow_status_changes(self) -> None:
+        async def run() -> list[tuple]:
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                autumn = TrainingSession(id="session-1", club_id="club-1", start_time="2025-10-02T18:00:00", end_time="2025-10-02T20:00:00")
+                spring = TrainingSession(id="session-2", club_id="club-1", start_time="2026-03-02T18:00:00", end_time="2026-03-02T20:00:00")
+                summer = TrainingSession(id="session-3", club_id="club-1", start_time="2026-08-20T18:00:00", end_time="2026-08-20T20:00:00")
+                session.add_all([autumn, spring, summer])
+                await count_attendance(session, autumn, "player-1", TrainingSessionPlayerStatus.ABSENT, True, 1)
+                # absent with a reason, then late
+                await count_attendance(session, autumn, "player-1", TrainingSessionPlayerStatus.ABSENT, True, -1)
+                await count_attendance(session, autumn, "player-1", TrainingSessionPlayerStatus.LATE, False, 1)
+                await count_attendance(session, spring, "player-1", TrainingSessionPlayerStatus.ABSENT, True, 1)
+                session.add(TrainingSessionPlayer(training_session_id="session-3", player_id="player-1", status=TrainingSessionPlayerStatus.PRESENT))
+                await count_attendance(session, summer, "player-1", TrainingSessionPlayerStatus.PRESENT, False, 1)
+                await session.commit()
+                await uncount_training_session(session, summer)
+                await session.commit()
+                result = await session.execute(PlayerSeasonAttendance.__table__.select().order_by(PlayerSeasonAttendance.season))
+                rows = [tuple(row) for row in result.all()]
+            await engine.dispose()
+            return rows
+
+        assert asyncio.run(run()) == [("club-1", "2025/2026", "player-1", 0, 1, 1, 1), ("club-1", "2026/2027", "player-1", 0, 0, 0, 0)]
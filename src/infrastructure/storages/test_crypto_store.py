@@ -0,0 +1,39 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from src.infrastructure.storages.crypto_store import SqliteCryptoStore
+
+
+class TestSqliteCryptoStore(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "crypto_store.db")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_keys_survive_a_restart(self) -> None:
+        store = SqliteCryptoStore(self.file_path)
+        store.add("player-1", b"key-1")
+        asyncio.run(store.add_missing_async({"player-1": b"other-key", "player-2": b"key-2"}))
+        store.close()
+
+        reopened = SqliteCryptoStore(self.file_path)
+        assert reopened.get_encryption_key("player-1") == b"key-1"
+        assert reopened.get_encryption_keys(["player-1", "player-2", "player-3"]) == {"player-1": b"key-1", "player-2": b"key-2"}
+        reopened.close()
+
+    def test_removed_keys_are_deleted(self) -> None:
+        store = SqliteCryptoStore(self.file_path)
+        store.add("player-1", b"key-1")
+        store.remove("player-1")
+        store.close()
+
+        reopened = SqliteCryptoStore(self.file_path)
+        assert reopened.get_encryption_key("player-1") is None
+        reopened.close()
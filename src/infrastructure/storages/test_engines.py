@@ -0,0 +1,52 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.infrastructure.storages.engines import ReadModelEngines
+
+
+class TestReadModelEngines(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.url = f"sqlite+aiosqlite:///{os.path.join(self.directory.name, 'read_model.db')}"
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_readers_see_the_last_commit_while_the_projector_writes(self) -> None:
+        async def run() -> tuple[int, int]:
+            engines = ReadModelEngines(self.url)
+            async with engines.write_engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE counter (value INTEGER)"))
+                await conn.execute(text("INSERT INTO counter VALUES (1)"))
+            async with engines.write_engine.connect() as writer:
+                await writer.execute(text("UPDATE counter SET value = 2"))
+                async with engines.read_engine.connect() as reader:
+                    during_write = (await reader.execute(text("SELECT value FROM counter"))).scalar()
+                await writer.commit()
+            async with engines.read_engine.connect() as reader:
+                after_write = (await reader.execute(text("SELECT value FROM counter"))).scalar()
+            await engines.dispose()
+            return during_write, after_write
+
+        assert asyncio.run(run()) == (1, 2)
+
+    def test_read_connections_cannot_write(self) -> None:
+        async def run() -> None:
+            engines = ReadModelEngines(self.url)
+            try:
+                async with engines.read_engine.begin() as conn:
+                    await conn.execute(text("CREATE TABLE counter (value INTEGER)"))
+            finally:
+                await engines.dispose()
+
+        with pytest.raises(OperationalError):
+            asyncio.run(run())
@@ -0,0 +1,28 @@
+import asyncio
+import unittest
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.infrastructure.storages.migrations import migrate
+from src.infrastructure.storages.sql_model import Base
+
+
+class TestMigrations(unittest.TestCase):
+
+    def test_indexes_are_added_to_an_existing_database(self) -> None:
+        async def run() -> tuple[set, set]:
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        await conn.exec_driver_sql(f"DROP INDEX {index.name}")
+                await conn.run_sync(migrate)
+                await conn.run_sync(migrate)
+                existing = await conn.run_sync(lambda sync_conn: {index["name"] for table in Base.metadata.sorted_tables for index in inspect(sync_conn).get_indexes(table.name)})
+            await engine.dispose()
+            return existing, {index.name for table in Base.metadata.sorted_tables for index in table.indexes}
+
+        existing, declared = asyncio.run(run())
+        assert declared <= existing
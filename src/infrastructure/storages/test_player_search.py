@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.infrastructure.storages.migrations import migrate
+from src.infrastructure.storages.player_search import index_player, match_query, search_players
+from src.infrastructure.storages.sql_model import Player
+
+
+class TestPlayerSearch(unittest.TestCase):
+
+    def search(self, search_query: str, limit: int = 20) -> list[str]:
+        async def run() -> list[str]:
+            engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+            async with engine.begin() as conn:
+                await conn.run_sync(migrate)
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                for id, first_name, last_name, license_number in [("1", "Élodie", "Dupont", "6001234"), ("2", "Elias", "Martin", "6005678"), ("3", "Jean", "Dupuis", None)]:
+                    await session.merge(Player(id=id, first_name=first_name, last_name=last_name, gender="F", date_of_birth="2010-01-01", license_number=license_number))
+                    await index_player(session, id)
+                await session.commit()
+                # re-indexing a player replaces its entry
+                await index_player(session, "1")
+                result = await session.execute(search_players(select(Player), search_query, limit))
+                ids = [player.id for player in result.scalars().all()]
+            await engine.dispose()
+            return ids
+
+        return asyncio.run(run())
+
+    def test_search_folds_accents_and_matches_prefixes(self) -> None:
+        assert self.search("elo") == ["1"]
+        assert sorted(self.search("el")) == ["1", "2"]
+        assert self.search("dup el") == ["1"]
+        assert self.search("600567") == ["2"]
+
+    def test_search_is_limited(self) -> None:
+        assert len(self.search("dup", limit=1)) == 1
+        assert self.search("") == ["1", "3", "2"]
+        assert self.search("", limit=2) == ["1", "3"]
+
+    def test_match_query_ignores_fts_syntax(self) -> None:
+        assert match_query('du"pont OR *') == '"du"* "pont"* "OR"*'
+        assert match_query(" - ") is None
@@ -0,0 +1,50 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sqlalchemy import text
+
+from src.infrastructure.storages.engines import dispose_read_model_engines
+from src.infrastructure.storages.replicas import ReadRouter, primary_reads
+
+
+class TestReadRouter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.primary_path = os.path.join(self.directory.name, "read_model.db")
+        self.replica_path = os.path.join(self.directory.name, "read_model.replica.db")
+        with sqlite3.connect(self.primary_path) as conn:
+            conn.execute("CREATE TABLE last_recorded_event_position (id INTEGER PRIMARY KEY, position INTEGER)")
+            conn.execute("INSERT INTO last_recorded_event_position VALUES (1, 10)")
+        conn.close()
+
+    def tearDown(self) -> None:
+        asyncio.run(dispose_read_model_engines())
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_reads_go_to_a_replica_within_the_lag_watermark(self) -> None:
+        router = ReadRouter(f"sqlite+aiosqlite:///{self.primary_path}", [self.replica_path], max_lag=5)
+        router.observe_primary_position(10)
+        replica = router.replicas[0]
+        assert router.engine() is router.primary_engine
+
+        asyncio.run(router.refresh())
+
+        assert replica.position == 10
+        assert router.engine() is replica.engine
+        with primary_reads():
+            assert router.engine() is router.primary_engine
+        router.observe_primary_position(16)
+        assert router.engine() is router.primary_engine
+
+        async def replica_position() -> int:
+            async with router.session_maker()() as session:
+                return (await session.execute(text("SELECT position FROM last_recorded_event_position"))).scalar()
+
+        router.observe_primary_position(12)
+        assert asyncio.run(replica_position()) == 10
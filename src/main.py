@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import JSONResponse
-from src.common.exceptions import GenericError
+from starlette.responses import JSONResponse, Response
+from src.common.exceptions import GenericError, NotModifiedError
 from src.dependencies import lifespan
 from src.infrastructure.routers.club_router import router as club_router
 from src.infrastructure.routers.auth_router import router as auth_router
@@ -10,6 +10,7 @@ from src.infrastructure.routers.player_router import router as player_router
 from src.infrastructure.routers.collective_router import router as collective_router
 from src.infrastructure.routers.public.public_router import router as public_router
 from src.infrastructure.routers.training_session_router import router as training_session_router
+from src.infrastructure.storages.replicas import read_consistency_middleware
 from starlette.middleware.sessions import SessionMiddleware
 from src.settings import settings
 
@@ -27,6 +28,7 @@ def create_app() -> FastAPI:
     )
     
     app.add_middleware(SessionMiddleware, secret_key=settings.JWT_SECRET_KEY)
+    app.middleware("http")(read_consistency_middleware)
     app.include_router(club_router)
     app.include_router(auth_router)
     app.include_router(main_router)
@@ -39,6 +41,10 @@ def create_app() -> FastAPI:
 
 app = create_app()
 
+@app.exception_handler(NotModifiedError)
+async def not_modified_handler(request: Request, exc: NotModifiedError) -> Response:
+    return Response(status_code=exc.status_code, headers={"ETag": exc.etag, "Cache-Control": "private, no-cache"})
+
 @app.exception_handler(GenericError)
 async def all_exception_handler(request: Request, exc: GenericError) -> JSONResponse:
     return JSONResponse(
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Iterator
+
+
+@dataclass
+class AttendanceMatrix:
+    """
+    Statuses of the players (rows) at the training sessions (columns) of a season, as a flat row-major list.
+    """
+    session_ids : list[str]
+    session_start_times : list[str]
+    player_ids : list[str]
+    player_names : list[tuple[str, str]]
+    cells : list[str]
+
+    def rows(self) -> Iterator[list[str]]:
+        width = len(self.session_ids)
+        for i, player_id in enumerate(self.player_ids):
+            last_name, first_name = self.player_names[i]
+            yield [player_id, last_name, first_name, *self.cells[i * width:(i + 1) * width]]
+
+    def header(self) -> list[str]:
+        return ["player_id", "last_name", "first_name", *self.session_start_times]
+
+def pivot_attendance(session_ids : list[str], session_start_times : list[str], player_column : list[str], last_name_column : list[str], first_name_column : list[str], session_column : list[str], status_column : list[str]) -> AttendanceMatrix:
+    """
+    Pivot the columns of the attendance rows of a season into a player by session matrix.
+    Cells of the sessions a player was not on are left empty, attendance rows of unknown sessions are ignored.
+    """
+    names = dict(zip(player_column, zip(last_name_column, first_name_column)))
+    player_ids = sorted(names, key=lambda player_id: (*names[player_id], player_id))
+    player_index = {player_id: i for i, player_id in enumerate(player_ids)}
+    session_index = {session_id: i for i, session_id in enumerate(session_ids)}
+    width = len(session_ids)
+    cells = [""] * (len(player_ids) * width)
+    for player_id, session_id, status in zip(player_column, session_column, status_column):
+        if session_id in session_index:
+            cells[player_index[player_id] * width + session_index[session_id]] = status
+    return AttendanceMatrix(session_ids, session_start_times, player_ids, [names[player_id] for player_id in player_ids], cells)
@@ -1,17 +1,23 @@
+import json
 from multipledispatch import dispatch
 from pydantic import BaseModel
-from sqlalchemy import or_, select
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.orm import joinedload
+from sqlalchemy import Label, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from src.common.eventsourcing.event import IEvent
+from src.common.enums import Season
 from src.common.exceptions import NotFoundError
 from src.domains.club.events import ClubCreated
 from src.domains.collective.events import CollectiveCreated, PlayerAddedToCollective, PlayerRemovedFromCollective
 from src.domains.player.events import PlayerRegistered
-from src.infrastructure.storages.sql_model import Club, Collective, CollectivePlayer, Player, TrainingSession, TrainingSessionPlayer
-from src.read_facades.dtos import ClubDTO, ClubPlayerDTO, CollectiveDTO, CollectiveListDTO, CollectivePlayerDTO, TrainingSessionDTO, TrainingSessionPlayerDTO, UserClubAccessDTO
+from src.infrastructure.storages.player_search import search_players
+from src.infrastructure.storages.engines import read_model_engines
+from src.infrastructure.storages.replicas import ReadRouter
+from src.infrastructure.storages.sql_model import Club, Collective, CollectivePlayer, Player, PlayerSeasonAttendance, TrainingSession, TrainingSessionAttendance, TrainingSessionPlayer
+from src.read_facades.attendance_report import AttendanceMatrix, pivot_attendance
+from src.read_facades.dtos import ClubDTO, ClubPlayerDTO, CollectiveAttendanceStatsDTO, CollectiveDTO, CollectiveListDTO, CollectivePlayerDTO, PlayerAttendanceStatsDTO, TrainingSessionDTO, TrainingSessionPlayerDTO, UserClubAccessDTO
 from src.read_facades.interface import IReadFacade
-from src.read_facades.pagination import PaginatedDTO, paginate
+from src.read_facades.query_cache import QueryCache, cached, club_tag
+from src.read_facades.pagination import PaginatedDTO, paginate, paginate_by_keyset
 
 
 class DBCollectiveDTO(BaseModel):
@@ -19,31 +25,49 @@ class DBCollectiveDTO(BaseModel):
     name: str
     description: str | None = None
 
+def player_collectives() -> Label:
+    """
+    JSON array of the collectives of the selected player, so that players come with their collectives in one query.
+    """
+    return (select(func.json_group_array(func.json_object("collective_id", Collective.id, "name", Collective.name, "description", Collective.description, "nb_players", Collective.number_of_players)))
+            .select_from(CollectivePlayer)
+            .join(Collective, CollectivePlayer.collective_id == Collective.id)
+            .where(CollectivePlayer.player_id == Player.id)
+            .correlate(Player)
+            .scalar_subquery()
+            .label("collectives"))
+
+def club_player_dto(player: Player, collectives: str) -> ClubPlayerDTO:
+    return ClubPlayerDTO(player_id=player.id, first_name=player.first_name, last_name=player.last_name, gender=player.gender, date_of_birth=player.date_of_birth, license_number=player.license_number, license_type=player.license_type, collectives=[CollectiveListDTO(**collective) for collective in json.loads(collectives)])
+
 class ClubReadFacade(IReadFacade):
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, read_router: ReadRouter | None = None, query_cache: QueryCache | None = None):
         self.url = url
-        self.async_engine = create_async_engine(url, 
-                                                echo=False, 
-                                                pool_size=10,
-                                                max_overflow=20,
-                                                pool_pre_ping=True,
-                                                pool_recycle=3600)
-        self.async_session_maker = async_sessionmaker(self.async_engine, expire_on_commit=False)
+        self.query_cache = query_cache
+        self.async_engine = read_model_engines(url).read_engine
+        self.async_session_maker = read_router.session_maker() if read_router else async_sessionmaker(self.async_engine, expire_on_commit=False)
 
     async def get_collective_list(self, club_id: str) -> list[CollectiveListDTO]:
+        return await cached(self.query_cache, ("collective_list", club_id), {club_tag(club_id, "collectives")}, lambda: self.__get_collective_list(club_id))
+
+    async def __get_collective_list(self, club_id: str) -> list[CollectiveListDTO]:
         async with self.async_session_maker() as session:
             result = await session.execute(select(Collective).where(Collective.club_id == club_id).order_by(Collective.name))
             return [CollectiveListDTO(collective_id=collective.id, name=collective.name, nb_players=collective.number_of_players, description=collective.description) for collective in result.scalars().all()]
 
-    async def club_players(self, club_id: str, page: int = 0, per_page: int = 10) -> PaginatedDTO[ClubPlayerDTO]:
+    async def club_players(self, club_id: str, page: int = 0, per_page: int = 10, cursor: str | None = None, with_total: bool = True) -> PaginatedDTO[ClubPlayerDTO]:
         async with self.async_session_maker() as session:
-            result = await paginate(select(Player).where(Player.club_id == club_id), page, per_page, session)
-            players_dict = {player.id : ClubPlayerDTO(player_id=player.id, first_name=player.first_name, last_name=player.last_name, gender=player.gender, date_of_birth=player.date_of_birth, license_number=player.license_number, license_type=player.license_type, collectives=[]) for player in result.items}
-            collectives = await session.execute(select(CollectivePlayer).options(joinedload(CollectivePlayer.collective)).where(CollectivePlayer.player_id.in_(players_dict.keys())))
-            for collective_player in collectives.scalars().all():
-                players_dict[collective_player.player_id].collectives.append(CollectiveListDTO(collective_id=collective_player.collective_id, name=collective_player.collective.name, nb_players=collective_player.collective.number_of_players, description=collective_player.collective.description))
-            return PaginatedDTO(total_count=result.total_items, total_page=result.total_pages, count=len(players_dict), page=page, results=list(players_dict.values()))
+            stmt = select(Player, player_collectives()).where(Player.club_id == club_id)
+            keys = [Player.last_name, Player.first_name, Player.id]
+            if cursor is None and page > 0:
+                result = await paginate(stmt.order_by(*keys), page, per_page, session)
+                next_cursor = None
+            else:
+                result = await paginate_by_keyset(stmt, keys, cursor, per_page, session, with_total=with_total and cursor is None)
+                next_cursor = result.next_cursor
+            results = [club_player_dto(player, collectives) for player, collectives in result.items]
+            return PaginatedDTO(total_count=result.total_items, total_page=result.total_pages, count=len(results), page=page, results=results, next_cursor=next_cursor)
     
     async def get_collective(self, club_id: str, collective_id: str) -> CollectiveDTO:
         async with self.async_session_maker() as session:
@@ -54,12 +78,18 @@ class ClubReadFacade(IReadFacade):
             return None
 
 
-    async def get_collective_players(self, club_id: str, collective_id: str, page: int = 0, per_page: int = 10) -> PaginatedDTO[CollectivePlayerDTO]:
+    async def get_collective_players(self, club_id: str, collective_id: str, page: int = 0, per_page: int = 10, cursor: str | None = None, with_total: bool = True) -> PaginatedDTO[CollectivePlayerDTO]:
         async with self.async_session_maker() as session:
             stmt = select(Player).join(CollectivePlayer).where(CollectivePlayer.collective_id == collective_id, Player.club_id == club_id)
-            result = await paginate(stmt, page, per_page, session)
+            keys = [Player.last_name, Player.first_name, Player.id]
+            if cursor is None and page > 0:
+                result = await paginate(stmt.order_by(*keys), page, per_page, session)
+                next_cursor = None
+            else:
+                result = await paginate_by_keyset(stmt, keys, cursor, per_page, session, with_total=with_total and cursor is None)
+                next_cursor = result.next_cursor
             results=[CollectivePlayerDTO(player_id=player.id, first_name=player.first_name, last_name=player.last_name, gender=player.gender, date_of_birth=player.date_of_birth, license_number=player.license_number, license_type=player.license_type) for player in result.items]
-            return PaginatedDTO(total_count=result.total_items, total_page=result.total_pages, count=len(results), page=page, results=results)
+            return PaginatedDTO(total_count=result.total_items, total_page=result.total_pages, count=len(results), page=page, results=results, next_cursor=next_cursor)
 
     async def get_user_club_access(self, user_id: str, club_id: str) -> UserClubAccessDTO:
         async with self.async_session_maker() as session:
@@ -69,14 +99,14 @@ class ClubReadFacade(IReadFacade):
                 return UserClubAccessDTO(club_id=club.id, name=club.name, access_level="owner", can_manage=True)
             return None
 
-    async def search_players(self, club_id: str, search_query: str) -> CollectivePlayerDTO:
+    async def search_players(self, club_id: str, search_query: str, limit: int = 20) -> list[CollectivePlayerDTO]:
         async with self.async_session_maker() as session:
-            result = await session.execute(select(Player).where(Player.club_id == club_id, or_(Player.first_name.ilike(f"%{search_query}%"), Player.last_name.ilike(f"%{search_query}%"), Player.license_number.ilike(f"%{search_query}%"))).order_by(Player.last_name, Player.first_name))
+            result = await session.execute(search_players(select(Player).where(Player.club_id == club_id), search_query, limit))
             return [CollectivePlayerDTO(player_id=player.id, first_name=player.first_name, last_name=player.last_name, gender=player.gender, date_of_birth=player.date_of_birth, license_number=player.license_number, license_type=player.license_type) for player in result.scalars().all()]
 
-    async def search_unassigned_players_in_collective(self, club_id: str, collective_id: str, search_query: str) -> list[CollectivePlayerDTO]:
+    async def search_unassigned_players_in_collective(self, club_id: str, collective_id: str, search_query: str, limit: int = 20) -> list[CollectivePlayerDTO]:
         async with self.async_session_maker() as session:
-            result = await session.execute(select(Player).where(Player.club_id == club_id, Player.id.notin_(select(CollectivePlayer.player_id).where(CollectivePlayer.collective_id == collective_id)), or_(Player.first_name.ilike(f"%{search_query}%"), Player.last_name.ilike(f"%{search_query}%"), Player.license_number.ilike(f"%{search_query}%"))).order_by(Player.last_name, Player.first_name))
+            result = await session.execute(search_players(select(Player).where(Player.club_id == club_id, Player.id.notin_(select(CollectivePlayer.player_id).where(CollectivePlayer.collective_id == collective_id))), search_query, limit))
             return [CollectivePlayerDTO(player_id=player.id, first_name=player.first_name, last_name=player.last_name, gender=player.gender, date_of_birth=player.date_of_birth, license_number=player.license_number, license_type=player.license_type) for player in result.scalars().all()]
 
     async def get_training_session(self, club_id: str, training_session_id: str) -> TrainingSessionDTO | None:
@@ -87,26 +117,71 @@ class ClubReadFacade(IReadFacade):
                 return TrainingSessionDTO(training_session_id=training_session.id, start_time=training_session.start_time, end_time=training_session.end_time, number_of_players_present=training_session.number_of_players_present, number_of_players_absent=training_session.number_of_players_absent, number_of_players_late=training_session.number_of_players_late )
             raise NotFoundError(f"Training session {training_session_id} not found")
 
-    async def get_training_session_list(self, club_id: str, page: int = 0, per_page: int = 10) -> PaginatedDTO[TrainingSessionDTO]:
+    async def get_training_session_list(self, club_id: str, page: int = 0, per_page: int = 10, cursor: str | None = None, with_total: bool = True) -> PaginatedDTO[TrainingSessionDTO]:
+        return await cached(self.query_cache, ("training_session_list", club_id, page, per_page, cursor, with_total), {club_tag(club_id, "training_sessions")}, lambda: self.__get_training_session_list(club_id, page, per_page, cursor, with_total))
+
+    async def __get_training_session_list(self, club_id: str, page: int, per_page: int, cursor: str | None, with_total: bool) -> PaginatedDTO[TrainingSessionDTO]:
+        async with self.async_session_maker() as session:
+            stmt = select(TrainingSession).where(TrainingSession.club_id == club_id)
+            keys = [TrainingSession.start_time, TrainingSession.id]
+            if cursor is None and page > 0:
+                result = await paginate(stmt.order_by(TrainingSession.start_time.desc(), TrainingSession.id.desc()), page, per_page, session)
+                next_cursor = None
+            else:
+                result = await paginate_by_keyset(stmt, keys, cursor, per_page, session, descending=True, with_total=with_total and cursor is None)
+                next_cursor = result.next_cursor
+            return PaginatedDTO(total_count=result.total_items, total_page=result.total_pages, count=len(result.items), page=page, next_cursor=next_cursor, results=[TrainingSessionDTO(training_session_id=training_session.id, start_time=training_session.start_time, end_time=training_session.end_time, number_of_players_present=training_session.number_of_players_present, number_of_players_absent=training_session.number_of_players_absent, number_of_players_late=training_session.number_of_players_late) for training_session in result.items])
+
+    async def get_training_session_players(self, club_id: str, training_session_id: str, page: int = 0, per_page: int = 10, cursor: str | None = None, with_total: bool = True) -> PaginatedDTO[TrainingSessionPlayerDTO]:
+        async with self.async_session_maker() as session:
+            stmt = select(TrainingSessionAttendance).where(TrainingSessionAttendance.training_session_id == training_session_id, TrainingSessionAttendance.club_id == club_id)
+            keys = [TrainingSessionAttendance.last_name, TrainingSessionAttendance.first_name, TrainingSessionAttendance.player_id]
+            if cursor is None and page > 0:
+                result = await paginate(stmt.order_by(*keys), page, per_page, session)
+                next_cursor = None
+            else:
+                result = await paginate_by_keyset(stmt, keys, cursor, per_page, session, with_total=with_total and cursor is None)
+                next_cursor = result.next_cursor
+            return PaginatedDTO(total_count=result.total_items, total_page=result.total_pages, count=len(result.items), page=page, next_cursor=next_cursor, results=[TrainingSessionPlayerDTO(player=ClubPlayerDTO(player_id=attendance.player_id, first_name=attendance.first_name, last_name=attendance.last_name, gender=attendance.gender, date_of_birth=attendance.date_of_birth, license_number=attendance.license_number, license_type=attendance.license_type), status=attendance.status, reason=attendance.reason, with_reason=attendance.with_reason, arrival_time=attendance.arrival_time) for attendance in result.items])
+
+    async def get_player_attendance_stats(self, club_id: str, player_id: str, season: Season) -> PlayerAttendanceStatsDTO:
+        async with self.async_session_maker() as session:
+            stats = await session.get(PlayerSeasonAttendance, {"club_id": club_id, "season": season.value, "player_id": player_id})
+            if stats is None:
+                return PlayerAttendanceStatsDTO(player_id=player_id, season=season.value)
+            return PlayerAttendanceStatsDTO(player_id=player_id, season=season.value, present=stats.present, absent=stats.absent, late=stats.late, excused_absences=stats.excused_absences)
+
+    async def get_players_attendance_stats(self, club_id: str, season: Season) -> list[PlayerAttendanceStatsDTO]:
+        async with self.async_session_maker() as session:
+            result = await session.execute(select(PlayerSeasonAttendance).where(PlayerSeasonAttendance.club_id == club_id, PlayerSeasonAttendance.season == season.value).order_by(PlayerSeasonAttendance.player_id))
+            return [PlayerAttendanceStatsDTO(player_id=stats.player_id, season=season.value, present=stats.present, absent=stats.absent, late=stats.late, excused_absences=stats.excused_absences) for stats in result.scalars().all()]
+
+    async def get_collective_attendance_stats(self, club_id: str, collective_id: str, season: Season) -> CollectiveAttendanceStatsDTO:
         async with self.async_session_maker() as session:
-            result = await paginate(select(TrainingSession).where(TrainingSession.club_id == club_id).order_by(TrainingSession.start_time.desc()), page, per_page, session)
-            return PaginatedDTO(total_count=result.total_items, total_page=result.total_pages, count=len(result.items), page=page, results=[TrainingSessionDTO(training_session_id=training_session.id, start_time=training_session.start_time, end_time=training_session.end_time, number_of_players_present=training_session.number_of_players_present, number_of_players_absent=training_session.number_of_players_absent, number_of_players_late=training_session.number_of_players_late) for training_session in result.items])
+            result = await session.execute(select(func.coalesce(func.sum(PlayerSeasonAttendance.present), 0), func.coalesce(func.sum(PlayerSeasonAttendance.absent), 0), func.coalesce(func.sum(PlayerSeasonAttendance.late), 0), func.coalesce(func.sum(PlayerSeasonAttendance.excused_absences), 0))
+                                           .join(CollectivePlayer, CollectivePlayer.player_id == PlayerSeasonAttendance.player_id)
+                                           .where(CollectivePlayer.collective_id == collective_id, PlayerSeasonAttendance.club_id == club_id, PlayerSeasonAttendance.season == season.value))
+            present, absent, late, excused_absences = result.one()
+            return CollectiveAttendanceStatsDTO(collective_id=collective_id, season=season.value, present=present, absent=absent, late=late, excused_absences=excused_absences)
 
-    async def get_training_session_players(self, club_id: str, training_session_id: str, page: int = 0, per_page: int = 10) -> PaginatedDTO[TrainingSessionPlayerDTO]:
+    async def get_season_attendance_matrix(self, club_id: str, season: Season) -> AttendanceMatrix:
         async with self.async_session_maker() as session:
-            result = await paginate(select(TrainingSessionPlayer).join(TrainingSession).options(joinedload(TrainingSessionPlayer.player), joinedload(TrainingSessionPlayer.training_session)).where(TrainingSessionPlayer.training_session_id == training_session_id, TrainingSession.club_id == club_id), page, per_page, session)
-            return PaginatedDTO(total_count=result.total_items, total_page=result.total_pages, count=len(result.items), page=page, results=[TrainingSessionPlayerDTO(training_session_id=training_session_player.training_session_id, player=ClubPlayerDTO(player_id=training_session_player.player.id, first_name=training_session_player.player.first_name, last_name=training_session_player.player.last_name, gender=training_session_player.player.gender, date_of_birth=training_session_player.player.date_of_birth, license_number=training_session_player.player.license_number, license_type=training_session_player.player.license_type), status=training_session_player.status) for training_session_player in result.items])
+            in_season = (TrainingSession.club_id == club_id, TrainingSession.start_time >= season.start_date.isoformat(), TrainingSession.start_time < season.end_date.isoformat())
+            # a single statement reads the sessions and their attendance from the same snapshot
+            rows = (await session.execute(select(TrainingSession.id, TrainingSession.start_time, TrainingSessionAttendance.player_id, TrainingSessionAttendance.last_name, TrainingSessionAttendance.first_name, TrainingSessionAttendance.status)
+                                          .outerjoin(TrainingSessionAttendance, TrainingSessionAttendance.training_session_id == TrainingSession.id)
+                                          .where(*in_season)
+                                          .order_by(TrainingSession.start_time, TrainingSession.id))).all()
+        sessions = list(dict.fromkeys((session_id, start_time) for session_id, start_time, *_ in rows))
+        attendance = [(player_id, last_name, first_name, session_id, status) for session_id, _, player_id, last_name, first_name, status in rows if player_id is not None]
+        session_ids, session_start_times = (list(column) for column in zip(*sessions)) if sessions else ([], [])
+        columns = [list(column) for column in zip(*attendance)] if attendance else [[], [], [], [], []]
+        return pivot_attendance(session_ids, session_start_times, *columns)
 
-    async def search_players_not_in_training_session(self, club_id: str, training_session_id: str, collective_id: str | None = None, search_query: str = "") -> list[ClubPlayerDTO]:
+    async def search_players_not_in_training_session(self, club_id: str, training_session_id: str, collective_id: str | None = None, search_query: str = "", limit: int = 20) -> list[ClubPlayerDTO]:
         async with self.async_session_maker() as session:
-            stmt = select(Player).where(Player.club_id == club_id, Player.id.notin_(select(TrainingSessionPlayer.player_id).where(TrainingSessionPlayer.training_session_id == training_session_id)))
+            stmt = select(Player, player_collectives()).where(Player.club_id == club_id, Player.id.notin_(select(TrainingSessionPlayer.player_id).where(TrainingSessionPlayer.training_session_id == training_session_id)))
             if collective_id:
                 stmt = stmt.where(Player.id.in_(select(CollectivePlayer.player_id).where(CollectivePlayer.collective_id == collective_id)))
-            if search_query:
-                stmt = stmt.where(or_(Player.first_name.ilike(f"%{search_query}%"), Player.last_name.ilike(f"%{search_query}%"), Player.license_number.ilike(f"%{search_query}%")))
-            result = await session.execute(stmt)
-            players_dict = {player.id : ClubPlayerDTO(player_id=player.id, first_name=player.first_name, last_name=player.last_name, gender=player.gender, date_of_birth=player.date_of_birth, license_number=player.license_number, license_type=player.license_type, collectives=[]) for player in result.scalars().all()}
-            collectives = await session.execute(select(CollectivePlayer).options(joinedload(CollectivePlayer.collective)).where(CollectivePlayer.player_id.in_(players_dict.keys())))
-            for collective_player in collectives.scalars().all():
-                players_dict[collective_player.player_id].collectives.append(CollectiveListDTO(collective_id=collective_player.collective_id, name=collective_player.collective.name, nb_players=collective_player.collective.number_of_players, description=collective_player.collective.description))
-            return list(players_dict.values())  
\ No newline at end of file
+            result = await session.execute(search_players(stmt, search_query, limit))
+            return [club_player_dto(player, collectives) for player, collectives in result.all()]
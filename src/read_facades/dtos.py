@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from src.common.enums import Gender, LicenseType, TrainingSessionPlayerStatus
 
 
@@ -84,3 +84,25 @@ class TrainingSessionDTO(BaseModel):
 class TrainingSessionPlayerDTO(BaseModel):
     player: ClubPlayerDTO
     status: TrainingSessionPlayerStatus
+    reason: str | None = None
+    with_reason: bool = False
+    arrival_time: datetime | None = None
+
+class AttendanceStatsDTO(BaseModel):
+    season: str
+    present: int = 0
+    absent: int = 0
+    late: int = 0
+    excused_absences: int = 0
+
+    @computed_field
+    @property
+    def attendance_rate(self) -> float | None:
+        sessions = self.present + self.absent + self.late
+        return (self.present + self.late) / sessions if sessions else None
+
+class PlayerAttendanceStatsDTO(AttendanceStatsDTO):
+    player_id: str
+
+class CollectiveAttendanceStatsDTO(AttendanceStatsDTO):
+    collective_id: str
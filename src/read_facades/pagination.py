@@ -1,10 +1,15 @@
-from sqlalchemy import Select, select, func
+from sqlalchemy import Select, select, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import InstrumentedAttribute
 from dataclasses import dataclass
+import base64
+import json
 import math
 
 from typing import TypeVar, Generic
 
+from src.common.exceptions import InvalidCursorError
+
 
 T = TypeVar("T")
 
@@ -14,18 +19,94 @@ class Pagination:
     total_pages : int
     items : list
 
+def with_total_count(query : Select) -> Select:
+    """
+    Add the number of rows matching the query, before any limit, as a last column of every row.
+    """
+    return query.add_columns(func.count().over().label("total_count"))
+
+def row_items(rows : list, columns : int) -> list:
+    """
+    Items of rows fetched with with_total_count: the selected entity, or a tuple of the selected columns.
+    """
+    return [row[0] if columns == 1 else tuple(row[:columns]) for row in rows]
+
 async def paginate(query : Select, page : int, per_page : int, conn : AsyncConnection) -> Pagination:
+    """
+    The total is counted by the page query itself, only an empty page past the first one needs a count query.
+    """
+    columns = len(query.column_descriptions)
+    result = await conn.execute(with_total_count(query).limit(per_page).offset(page*per_page))
+    rows = result.unique().all()
+    if rows:
+        total = rows[0][-1]
+    elif page == 0:
+        total = 0
+    else:
+        total = (await conn.execute(select(func.count()).select_from(query.subquery()))).scalar()
+
+    return Pagination(total_items=total, total_pages=math.ceil(total/per_page),items=row_items(rows, columns))
+
+@dataclass
+class KeysetPagination:
+    items : list
+    next_cursor : str | None
+    total_items : int | None = None
+    total_pages : int | None = None
+
+def encode_cursor(values : list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor : str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except ValueError as e:
+        raise InvalidCursorError(f"Invalid cursor {cursor}") from e
+    if not isinstance(values, list):
+        raise InvalidCursorError(f"Invalid cursor {cursor}")
+    return values
+
+async def paginate_by_keyset(query : Select, keys : list[InstrumentedAttribute], cursor : str | None, per_page : int, conn : AsyncConnection, descending : bool = False, with_total : bool = False) -> KeysetPagination:
+    """
+    Paginate on the values of the sort keys instead of an offset: a page starts right after the
+    last row of the previous one, identified by the cursor, so deep pages cost the same as the first.
+    The keys must identify a row (end them with the primary key) and belong to the first selected entity.
+    The total is only counted on request.
+    """
+    # without a cursor, every row matching the query is in the window of the first page
+    count_in_window = with_total and cursor is None
+    total = (await conn.execute(select(func.count()).select_from(query.subquery()))).scalar() if with_total and not count_in_window else None
+    columns = len(query.column_descriptions)
+
+    if cursor is not None:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise InvalidCursorError(f"Invalid cursor {cursor}")
+        query = query.where(tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values))
+    query = query.order_by(None).order_by(*[key.desc() if descending else key.asc() for key in keys])
+
+    if count_in_window:
+        query = with_total_count(query)
 
-    result = await conn.execute(query.limit(per_page).offset(page*per_page))
-    total = (await conn.execute(select(func.count()).select_from(query.subquery()))).scalar()
+    result = await conn.execute(query.limit(per_page + 1))
+    rows = result.unique().all()
+    if count_in_window:
+        total = rows[0][-1] if rows else 0
+    items = row_items(rows, columns)
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1] if columns == 1 else items[-1][0]
+        next_cursor = encode_cursor([getattr(last, key.key) for key in keys])
 
-    return Pagination(total_items=total, total_pages=math.ceil(total/per_page),items=result.unique().scalars().all())
+    return KeysetPagination(items=items, next_cursor=next_cursor, total_items=total, total_pages=math.ceil(total/per_page) if total is not None else None)
 
 
 @dataclass
 class PaginatedDTO(Generic[T]):
-    total_count : int
-    total_page : int
+    total_count : int | None
+    total_page : int | None
     count : int
     page : int
     results : list[T]
+    next_cursor : str | None = None
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+
+from multipledispatch import dispatch
+
+from src.common.eventsourcing.event import IEvent
+from src.domains.player.events import PlayerRegistered, PlayerRegisteredToClub, PlayerUnregisteredFromClub
+from src.read_facades.interface import IReadFacade
+
+
+@dataclass
+class PlayerMembership:
+    club_id : str | None
+    season : str | None
+    version : int
+
+class PlayerMembershipIndex(IReadFacade):
+    """
+    In-memory index of the club of every player, fed by the event store as player events are committed.
+
+    Each entry carries the version of the player stream it was built from: it can only be trusted
+    while the stream is still at that version.
+    """
+    def __init__(self) -> None:
+        self.__memberships : dict[str, PlayerMembership] = {}
+
+    def get(self, player_id : str) -> PlayerMembership | None:
+        return self.__memberships.get(player_id)
+
+    def update_read_model(self, event : IEvent) -> None:
+        self._apply(event)
+
+    @dispatch(IEvent)
+    def _apply(self, event : IEvent) -> None:
+        pass
+
+    @dispatch(PlayerRegistered)
+    def _apply(self, event : PlayerRegistered) -> None:
+        self.__memberships[event.player_id] = PlayerMembership(None, None, 0)
+
+    @dispatch(PlayerRegisteredToClub)
+    def _apply(self, event : PlayerRegisteredToClub) -> None:
+        membership = self.__memberships.get(event.player_id)
+        if membership:
+            membership.club_id = event.club_id
+            membership.season = event.season
+            membership.version += 1
+
+    @dispatch(PlayerUnregisteredFromClub)
+    def _apply(self, event : PlayerUnregisteredFromClub) -> None:
+        membership = self.__memberships.get(event.player_id)
+        if membership:
+            membership.club_id = None
+            membership.season = None
+            membership.version += 1
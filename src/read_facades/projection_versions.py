@@ -0,0 +1,26 @@
+import hashlib
+import secrets
+
+
+class ProjectionVersions:
+    """
+    Per-club counters of the changes projected into the read model, bumped by the Worker after
+    each commit touching a club. They start over with the process, the epoch tells them apart.
+    """
+    def __init__(self) -> None:
+        self.epoch = secrets.token_hex(4)
+        self.__versions : dict[str, int] = {}
+
+    def get(self, club_id : str) -> int:
+        return self.__versions.get(club_id, 0)
+
+    def bump(self, *club_ids : str) -> None:
+        for club_id in club_ids:
+            self.__versions[club_id] = self.get(club_id) + 1
+
+    def etag(self, club_id : str, resource : str) -> str:
+        """
+        Weak validator of a club resource, it changes whenever anything of the club is projected.
+        """
+        digest = hashlib.sha1(f"{club_id}:{resource}".encode("utf-8")).hexdigest()[:16]
+        return f'W/"{self.epoch}-{self.get(club_id)}-{digest}"'
@@ -1,29 +1,32 @@
+from typing import AsyncIterator
 from multipledispatch import dispatch
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from src.common.eventsourcing.event import IEvent
 from src.domains.club.events import ClubCreated, CoachAdded
 from src.domains.player.events import PlayerRegistered
 from src.domains.user.events import UserSignedUp
+from src.infrastructure.storages.engines import read_model_engines
+from src.infrastructure.storages.replicas import ReadRouter
 from src.infrastructure.storages.sql_model import Club, Player
 from src.read_facades.dtos import ClubDTO, PublicClubDTO, PublicPlayerDTO
 from src.read_facades.interface import IReadFacade
+from src.read_facades.query_cache import CLUBS_TAG, QueryCache, cached
 
 
 class PublicReadFacade(IReadFacade):
-    
-    def __init__(self, url: str):
+    stream_batch_size = 500
+
+    def __init__(self, url: str, read_router: ReadRouter | None = None, query_cache: QueryCache | None = None):
         self.url = url
-        self.async_engine = create_async_engine(url, 
-                                                echo=False, 
-                                                pool_size=10,
-                                                max_overflow=20,
-                                                pool_pre_ping=True,
-                                                pool_recycle=3600)
-        self.async_session_maker = async_sessionmaker(self.async_engine, expire_on_commit=False)
+        self.query_cache = query_cache
+        self.async_engine = read_model_engines(url).read_engine
+        self.async_session_maker = read_router.session_maker() if read_router else async_sessionmaker(self.async_engine, expire_on_commit=False)
 
     async def get_club_list(self) -> list[PublicClubDTO]:
+        return await cached(self.query_cache, ("club_list",), {CLUBS_TAG}, self.__get_club_list)
+
+    async def __get_club_list(self) -> list[PublicClubDTO]:
         async with self.async_session_maker() as session:
             result = await session.execute(select(Club).order_by(Club.name))
             return [PublicClubDTO(club_id=club.id, name=club.name, registration_number=club.registration_number, nb_players=club.number_of_players) for club in result.scalars().all()]
@@ -45,6 +48,26 @@ class PublicReadFacade(IReadFacade):
         return res
 
     async def get_player_list(self) -> list[PublicPlayerDTO]:
-        async with self.async_session_maker() as session:
-            result = await session.execute(select(Player).options(joinedload(Player.club)))
-            return [PublicPlayerDTO(player_id=player.id, first_name=player.first_name, last_name=player.last_name, club=PublicClubDTO(club_id=player.club_id, name=player.club.name, registration_number=player.club.registration_number, nb_players=player.club.number_of_players), gender=player.gender, date_of_birth=player.date_of_birth, license_number=player.license_number, license_type=player.license_type) for player in result.scalars().all()]
\ No newline at end of file
+        return [player async for player in self.iter_players()]
+
+    async def iter_players(self, club_id: str | None = None, after: str | None = None, limit: int | None = None) -> AsyncIterator[PublicPlayerDTO]:
+        """
+        Players of the clubs in id order, read in keyset pages of stream_batch_size rows. Each page is
+        read with its own short session, so a slow download does not hold a pooled connection between pages.
+        """
+        stmt = select(Player, Club).join(Player.club).order_by(Player.id)
+        if club_id is not None:
+            stmt = stmt.where(Player.club_id == club_id)
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = self.stream_batch_size if remaining is None else min(self.stream_batch_size, remaining)
+            page_stmt = stmt.where(Player.id > after) if after is not None else stmt
+            async with self.async_session_maker() as session:
+                rows = (await session.execute(page_stmt.limit(page_size))).all()
+            for player, club in rows:
+                yield PublicPlayerDTO(player_id=player.id, first_name=player.first_name, last_name=player.last_name, club=PublicClubDTO(club_id=club.id, name=club.name, registration_number=club.registration_number, nb_players=club.number_of_players), gender=player.gender, date_of_birth=player.date_of_birth, license_number=player.license_number, license_type=player.license_type)
+            if len(rows) < page_size:
+                return
+            after = rows[-1][0].id
+            if remaining is not None:
+                remaining -= len(rows)
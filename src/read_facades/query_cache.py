@@ -0,0 +1,103 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from src.infrastructure.storages.replicas import primary_reads
+
+T = TypeVar("T")
+
+CLUBS_TAG = "clubs"
+
+def club_tag(club_id : str, entity : str) -> str:
+    return f"club:{club_id}:{entity}"
+
+@dataclass
+class QueryCacheStats:
+    hits : int = 0
+    misses : int = 0
+    invalidations : int = 0
+    evictions : int = 0
+    size : int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+@dataclass
+class _Entry:
+    value : Any
+    tags : frozenset[str]
+    expires_at : float
+
+class QueryCache:
+    """
+    LRU cache of read-facade query results, with a TTL, invalidated by tag when the projector
+    commits events touching the cached data.
+
+    Results are loaded from the primary, so a cached result is never older than the last
+    invalidation and can serve reads pinned to the primary. A result loaded while one of its
+    tags was invalidated is returned but not cached, it may have been read before the
+    invalidating commit.
+    """
+    def __init__(self, max_entries : int = 1024, ttl : float = 60.0, clock : Callable[[], float] = time.monotonic) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = QueryCacheStats()
+        self.__entries : OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.__keys_by_tag : dict[str, set[Hashable]] = {}
+        self.__generations : dict[str, int] = {}
+
+    async def get_or_load(self, key : Hashable, tags : set[str], load : Callable[[], Awaitable[T]]) -> T:
+        entry = self.__entries.get(key)
+        if entry is not None and entry.expires_at > self.clock():
+            self.__entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.value
+        self.stats.misses += 1
+        generations = {tag: self.__generations.get(tag, 0) for tag in tags}
+        with primary_reads():
+            value = await load()
+        if all(self.__generations.get(tag, 0) == generation for tag, generation in generations.items()):
+            self.__put(key, _Entry(value, frozenset(tags), self.clock() + self.ttl))
+        return value
+
+    def __put(self, key : Hashable, entry : _Entry) -> None:
+        self.__remove(key)
+        self.__entries[key] = entry
+        for tag in entry.tags:
+            self.__keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self.__entries) > self.max_entries:
+            self.__remove(next(iter(self.__entries)))
+            self.stats.evictions += 1
+        self.stats.size = len(self.__entries)
+
+    def __remove(self, key : Hashable) -> None:
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self.__keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__keys_by_tag[tag]
+        self.stats.size = len(self.__entries)
+
+    def invalidate(self, *tags : str) -> None:
+        for tag in tags:
+            self.__generations[tag] = self.__generations.get(tag, 0) + 1
+            for key in list(self.__keys_by_tag.get(tag, ())):
+                self.__remove(key)
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        for key in list(self.__entries):
+            self.__remove(key)
+
+async def cached(query_cache : QueryCache | None, key : Hashable, tags : set[str], load : Callable[[], Awaitable[T]]) -> T:
+    if query_cache is None:
+        return await load()
+    return await query_cache.get_or_load(key, tags, load)
@@ -0,0 +1,26 @@
+import unittest
+
+from src.read_facades.attendance_report import pivot_attendance
+
+
+class TestAttendanceReport(unittest.TestCase):
+
+    def test_attendance_columns_are_pivoted_into_a_player_by_session_matrix(self) -> None:
+        matrix = pivot_attendance(
+            ["session-1", "session-2", "session-3"], ["2025-10-01T18:00:00", "2025-10-08T18:00:00", "2025-10-15T18:00:00"],
+            ["player-2", "player-1", "player-2", "player-1"],
+            ["Martin", "Bernard", "Martin", "Bernard"],
+            ["Léa", "Tom", "Léa", "Tom"],
+            ["session-1", "session-1", "session-3", "session-2"],
+            ["PRESENT", "ABSENT", "LATE", "PRESENT"])
+
+        assert matrix.header() == ["player_id", "last_name", "first_name", "2025-10-01T18:00:00", "2025-10-08T18:00:00", "2025-10-15T18:00:00"]
+        assert list(matrix.rows()) == [["player-1", "Bernard", "Tom", "ABSENT", "PRESENT", ""], ["player-2", "Martin", "Léa", "PRESENT", "", "LATE"]]
+
+    def test_a_season_without_attendance_has_no_rows(self) -> None:
+        matrix = pivot_attendance(["session-1"], ["2025-10-01T18:00:00"], [], [], [], [], [])
+        assert list(matrix.rows()) == []
+
+    def test_attendance_of_unknown_sessions_is_ignored(self) -> None:
+        matrix = pivot_attendance(["session-1"], ["2025-10-01T18:00:00"], ["player-1", "player-1"], ["Bernard", "Bernard"], ["Tom", "Tom"], ["session-1", "session-2"], ["PRESENT", "LATE"])
+        assert list(matrix.rows()) == [["player-1", "Bernard", "Tom", "PRESENT"]]
@@ -0,0 +1,125 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.common.enums import Season, TrainingSessionPlayerStatus
+from src.infrastructure.storages.attendance_sheet import record_attendance, remove_attendance, update_attendance_player
+from src.infrastructure.storages.engines import dispose_read_model_engines, read_model_engines
+from src.infrastructure.storages.migrations import migrate
+from src.infrastructure.storages.sql_model import Club, Collective, CollectivePlayer, Player, PlayerSeasonAttendance, TrainingSession, TrainingSessionAttendance, TrainingSessionPlayer
+from src.read_facades.club_read_facade import ClubReadFacade
+
+
+class TestClubReadFacade(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.url = f"sqlite+aiosqlite:///{os.path.join(self.directory.name, 'read_model.db')}"
+
+    def tearDown(self) -> None:
+        asyncio.run(dispose_read_model_engines())
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_club_players_come_with_their_collectives(self) -> None:
+        async def run():
+            write_engine = read_model_engines(self.url).write_engine
+            async with write_engine.begin() as conn:
+                await conn.run_sync(migrate)
+            async with async_sessionmaker(write_engine)() as session:
+                session.add(Club(id="club-1", name="Club 1"))
+                session.add_all([Collective(id="u13", club_id="club-1", name="U13", number_of_players=2), Collective(id="u15", club_id="club-1", name="U15", number_of_players=1)])
+                session.add_all([Player(id=f"player-{i}", club_id="club-1", first_name="First", last_name=f"Last {i}", gender="M", date_of_birth="2010-01-01") for i in range(3)])
+                session.add_all([CollectivePlayer(collective_id="u13", player_id="player-0"), CollectivePlayer(collective_id="u15", player_id="player-0"), CollectivePlayer(collective_id="u13", player_id="player-1")])
+                await session.commit()
+            facade = ClubReadFacade(self.url)
+            first_page = await facade.club_players("club-1", per_page=2)
+            second_page = await facade.club_players("club-1", per_page=2, cursor=first_page.next_cursor)
+            offset_page = await facade.club_players("club-1", page=1, per_page=2)
+            return first_page, second_page, offset_page
+
+        first_page, second_page, offset_page = asyncio.run(run())
+        assert first_page.total_count == 3
+        assert [player.player_id for player in first_page.results] == ["player-0", "player-1"]
+        assert sorted(collective.name for collective in first_page.results[0].collectives) == ["U13", "U15"]
+        assert [collective.nb_players for collective in first_page.results[1].collectives] == [2]
+        assert [player.player_id for player in second_page.results] == ["player-2"]
+        assert second_page.results[0].collectives == []
+        assert offset_page.total_count == 3
+        assert [player.player_id for player in offset_page.results] == ["player-2"]
+
+    def test_attendance_stats_are_read_per_player_and_rolled_up_per_collective(self) -> None:
+        async def run():
+            write_engine = read_model_engines(self.url).write_engine
+            async with write_engine.begin() as conn:
+                await conn.run_sync(migrate)
+            async with async_sessionmaker(write_engine)() as session:
+                session.add(Club(id="club-1", name="Club 1"))
+                session.add(Collective(id="u13", club_id="club-1", name="U13", number_of_players=2))
+                session.add_all([Player(id=f"player-{i}", club_id="club-1", first_name="First", last_name=f"Last {i}", gender="M", date_of_birth="2010-01-01") for i in range(3)])
+                session.add_all([CollectivePlayer(collective_id="u13", player_id="player-0"), CollectivePlayer(collective_id="u13", player_id="player-1")])
+                session.add_all([PlayerSeasonAttendance(club_id="club-1", season="2025/2026", player_id="player-0", present=6, absent=2, late=0, excused_absences=1),
+                                 PlayerSeasonAttendance(club_id="club-1", season="2025/2026", player_id="player-1", present=3, absent=0, late=1, excused_absences=0),
+                                 PlayerSeasonAttendance(club_id="club-1", season="2025/2026", player_id="player-2", present=1, absent=1, late=0, excused_absences=0)])
+                await session.commit()
+            facade = ClubReadFacade(self.url)
+            season = Season(2025, 2026)
+            return (await facade.get_player_attendance_stats("club-1", "player-0", season),
+                    await facade.get_player_attendance_stats("club-1", "player-0", Season(2024, 2025)),
+                    await facade.get_collective_attendance_stats("club-1", "u13", season))
+
+        player, previous_season, collective = asyncio.run(run())
+        assert (player.present, player.absent, player.excused_absences, player.attendance_rate) == (6, 2, 1, 0.75)
+        assert previous_season.attendance_rate is None
+        assert (collective.present, collective.absent, collective.late, collective.attendance_rate) == (9, 2, 1, 10 / 12)
+
+    def test_season_attendance_is_read_as_a_matrix(self) -> None:
+        async def run():
+            write_engine = read_model_engines(self.url).write_engine
+            async with write_engine.begin() as conn:
+                await conn.run_sync(migrate)
+            async with async_sessionmaker(write_engine)() as session:
+                session.add(Club(id="club-1", name="Club 1"))
+                session.add_all([TrainingSession(id=session_id, club_id="club-1", start_time=start_time, end_time=start_time) for session_id, start_time in [("s-1", "2025-09-01T18:00:00"), ("s-2", "2026-02-01T18:00:00"), ("s-old", "2025-05-01T18:00:00")]])
+                session.add_all([TrainingSessionAttendance(training_session_id=session_id, player_id="player-1", club_id="club-1", first_name="Tom", last_name="Bernard", gender="M", date_of_birth="2010-01-01", status=status) for session_id, status in [("s-2", "LATE"), ("s-old", "PRESENT")]])
+                await session.commit()
+            return await ClubReadFacade(self.url).get_season_attendance_matrix("club-1", Season(2025, 2026))
+
+        matrix = asyncio.run(run())
+        assert matrix.session_ids == ["s-1", "s-2"]
+        assert list(matrix.rows()) == [["player-1", "Bernard", "Tom", "", "LATE"]]
+
+    def test_attendance_sheet_follows_the_projection_in_display_order(self) -> None:
+        async def run():
+            write_engine = read_model_engines(self.url).write_engine
+            async with write_engine.begin() as conn:
+                await conn.run_sync(migrate)
+            async with async_sessionmaker(write_engine, expire_on_commit=False)() as session:
+                session.add(Club(id="club-1", name="Club 1"))
+                session.add(TrainingSession(id="session-1", club_id="club-1", start_time="2025-10-02T18:00:00", end_time="2025-10-02T20:00:00"))
+                session.add_all([Player(id=player_id, club_id="club-1", first_name="First", last_name=last_name, gender="M", date_of_birth="2010-01-01") for player_id, last_name in [("player-1", "Martin"), ("player-2", "Bernard"), ("player-3", "Durand")]])
+                session.add(TrainingSessionPlayer(training_session_id="session-1", player_id="player-1", status=TrainingSessionPlayerStatus.PRESENT))
+                await record_attendance(session, "session-1", "player-1")
+                session.add(TrainingSessionPlayer(training_session_id="session-1", player_id="player-2", status=TrainingSessionPlayerStatus.LATE, reason="bus", with_reason=True, arrival_time="2025-10-02T18:20:00"))
+                await record_attendance(session, "session-1", "player-2")
+                session.add(TrainingSessionPlayer(training_session_id="session-1", player_id="player-3", status=TrainingSessionPlayerStatus.ABSENT))
+                await record_attendance(session, "session-1", "player-3")
+                await session.commit()
+
+                (await session.get(Player, "player-1")).last_name = "Aubert"
+                await update_attendance_player(session, "player-1")
+                await remove_attendance(session, "session-1", "player-3")
+                await session.commit()
+            facade = ClubReadFacade(self.url)
+            return await facade.get_training_session_players("club-1", "session-1"), await facade.get_training_session_players("club-2", "session-1")
+
+        sheet, other_club = asyncio.run(run())
+        assert [(row.player.last_name, row.status) for row in sheet.results] == [("Aubert", TrainingSessionPlayerStatus.PRESENT), ("Bernard", TrainingSessionPlayerStatus.LATE)]
+        assert sheet.results[1].reason == "bus"
+        assert sheet.results[1].arrival_time.minute == 20
+        assert sheet.total_count == 2
+        assert other_club.results == []
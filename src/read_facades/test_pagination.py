@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.common.exceptions import InvalidCursorError
+from src.infrastructure.storages.sql_model import Base, Club, TrainingSession
+from src.read_facades.pagination import paginate_by_keyset
+
+
+class TestKeysetPagination(unittest.TestCase):
+
+    async def create_session_maker(self) -> async_sessionmaker:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_maker() as session:
+            session.add(Club(id="club", name="Club"))
+            # several sessions share a start time, the id breaks the ties
+            session.add_all([TrainingSession(id=f"ts-{i:02}", club_id="club", start_time=f"2025-10-{1 + i // 3:02}T18:00:00", end_time="") for i in range(25)])
+            await session.commit()
+        return session_maker
+
+    def test_pages_follow_each_other_without_gaps_or_duplicates(self) -> None:
+        async def run() -> list:
+            session_maker = await self.create_session_maker()
+            pages = []
+            cursor = None
+            async with session_maker() as session:
+                while True:
+                    page = await paginate_by_keyset(select(TrainingSession), [TrainingSession.start_time, TrainingSession.id], cursor, 10, session, descending=True, with_total=cursor is None)
+                    pages.append(page)
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        return pages
+
+        pages = asyncio.run(run())
+        assert [len(page.items) for page in pages] == [10, 10, 5]
+        assert pages[0].total_items == 25 and pages[0].total_pages == 3
+        assert pages[1].total_items is None
+        ids = [training_session.id for page in pages for training_session in page.items]
+        assert ids == sorted(ids, key=lambda id: (f"2025-10-{1 + int(id[3:]) // 3:02}", id), reverse=True)
+
+    def test_an_invalid_cursor_is_rejected(self) -> None:
+        async def run() -> None:
+            session_maker = await self.create_session_maker()
+            async with session_maker() as session:
+                await paginate_by_keyset(select(TrainingSession), [TrainingSession.start_time, TrainingSession.id], "not-a-cursor", 10, session)
+
+        with pytest.raises(InvalidCursorError):
+            asyncio.run(run())
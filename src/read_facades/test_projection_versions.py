@@ -0,0 +1,18 @@
+import unittest
+
+from src.read_facades.projection_versions import ProjectionVersions
+
+
+class TestProjectionVersions(unittest.TestCase):
+
+    def test_etags_change_with_the_club_version_only(self) -> None:
+        versions = ProjectionVersions()
+        etag = versions.etag("club-1", "/players?page=0")
+        other_club_etag = versions.etag("club-2", "/players?page=0")
+
+        versions.bump("club-2")
+
+        assert versions.etag("club-1", "/players?page=0") == etag
+        assert versions.etag("club-2", "/players?page=0") != other_club_etag
+        assert versions.etag("club-1", "/players?page=1") != etag
+        assert ProjectionVersions().etag("club-1", "/players?page=0") != etag
@@ -0,0 +1,52 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.infrastructure.storages.engines import dispose_read_model_engines, read_model_engines
+from src.infrastructure.storages.migrations import migrate
+from src.infrastructure.storages.sql_model import Club, Player
+from src.read_facades.public_read_facade import PublicReadFacade
+
+
+class TestPublicReadFacade(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.url = f"sqlite+aiosqlite:///{os.path.join(self.directory.name, 'read_model.db')}"
+
+    def tearDown(self) -> None:
+        asyncio.run(dispose_read_model_engines())
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_players_are_streamed_in_batches_with_filters(self) -> None:
+        async def run() -> tuple[list[str], list[str], list[str]]:
+            write_engine = read_model_engines(self.url).write_engine
+            async with write_engine.begin() as conn:
+                await conn.run_sync(migrate)
+            async with async_sessionmaker(write_engine)() as session:
+                session.add_all([Club(id="club-1", name="Club 1"), Club(id="club-2", name="Club 2")])
+                session.add_all([Player(id=f"player-{i:02}", club_id=f"club-{i % 2 + 1}", first_name="First", last_name="Last", gender="M", date_of_birth="2010-01-01") for i in range(12)])
+                session.add(Player(id="player-free", club_id=None, first_name="First", last_name="Last", gender="M", date_of_birth="2010-01-01"))
+                await session.commit()
+            facade = PublicReadFacade(self.url)
+            facade.stream_batch_size = 5
+            everyone = [player.player_id async for player in facade.iter_players()]
+            club_2 = [player.player_id async for player in facade.iter_players(club_id="club-2")]
+            page = [player.player_id async for player in facade.iter_players(after="player-03", limit=3)]
+            long_page = [player.player_id async for player in facade.iter_players(after="player-03", limit=7)]
+            checked_out = []
+            async for _ in facade.iter_players():
+                checked_out.append(facade.async_engine.pool.checkedout())
+            return everyone, club_2, page, long_page, checked_out
+
+        everyone, club_2, page, long_page, checked_out = asyncio.run(run())
+        assert everyone == [f"player-{i:02}" for i in range(12)]
+        assert club_2 == [f"player-{i:02}" for i in range(1, 12, 2)]
+        assert page == ["player-04", "player-05", "player-06"]
+        assert long_page == [f"player-{i:02}" for i in range(4, 11)]
+        assert set(checked_out) == {0}
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+
+from src.infrastructure.storages.replicas import read_from_primary
+from src.read_facades.query_cache import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.now = 0.0
+        self.loads = 0
+        self.cache = QueryCache(max_entries=2, ttl=10.0, clock=lambda: self.now)
+
+    async def load(self) -> int:
+        self.loads += 1
+        return self.loads
+
+    def get(self, key: str, tag: str) -> int:
+        return asyncio.run(self.cache.get_or_load(key, {tag}, self.load))
+
+    def test_results_are_cached_until_their_tag_is_invalidated(self) -> None:
+        assert self.get("a", "club:1:collectives") == 1
+        assert self.get("a", "club:1:collectives") == 1
+        assert self.get("b", "club:2:collectives") == 2
+
+        self.cache.invalidate("club:1:collectives")
+
+        assert self.get("a", "club:1:collectives") == 3
+        assert self.get("b", "club:2:collectives") == 2
+        assert self.cache.stats.hits == 2 and self.cache.stats.misses == 3
+        assert self.cache.stats.hit_ratio == 0.4
+
+    def test_results_expire_and_are_bounded(self) -> None:
+        self.get("a", "t")
+        self.get("b", "t")
+        self.get("c", "t")
+        assert self.cache.stats.size == 2
+        assert self.get("a", "t") == 4
+
+        self.now = 11.0
+        assert self.get("a", "t") == 5
+
+    def test_a_result_loaded_across_an_invalidation_is_not_cached(self) -> None:
+        async def load_during_invalidation() -> int:
+            self.cache.invalidate("t")
+            return await self.load()
+
+        asyncio.run(self.cache.get_or_load("a", {"t"}, load_during_invalidation))
+        assert self.get("a", "t") == 2
+
+    def test_results_are_loaded_from_the_primary(self) -> None:
+        async def load_pinned() -> bool:
+            return read_from_primary.get()
+
+        assert asyncio.run(self.cache.get_or_load("a", {"t"}, load_pinned))
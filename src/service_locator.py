@@ -10,6 +10,8 @@ from src.infrastructure.session_manager import SessionManager
 from src.infrastructure.websocket_manager import WebSocketManager
 from src.read_facades.club_read_facade import ClubReadFacade
 from src.read_facades.public_read_facade import PublicReadFacade
+from src.read_facades.projection_versions import ProjectionVersions
+from src.read_facades.query_cache import QueryCache
 
 class ServiceLocator:
     __global = {}
@@ -94,4 +96,20 @@ class ServiceLocator:
     def websocket_manager(self, websocket_manager : WebSocketManager) -> None:
         self.__global["websocket_manager"] = websocket_manager
 
+    @property
+    def query_cache(self) -> QueryCache:
+        return self.__global["query_cache"]
+
+    @query_cache.setter
+    def query_cache(self, query_cache : QueryCache) -> None:
+        self.__global["query_cache"] = query_cache
+
+    @property
+    def projection_versions(self) -> ProjectionVersions:
+        return self.__global["projection_versions"]
+
+    @projection_versions.setter
+    def projection_versions(self, projection_versions : ProjectionVersions) -> None:
+        self.__global["projection_versions"] = projection_versions
+
 service_locator = ServiceLocator()
\ No newline at end of file
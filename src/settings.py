@@ -13,6 +13,15 @@ class Settings(BaseSettings):
     JWT_EXPIRATION_TIME: int = 3600
     APP_NAME: str = "Handball App Backend"
     APP_VERSION: str = "1.0.0"
+    AGGREGATE_CACHE_MAX_EVENTS: int = 50_000
+    EVENT_STORE_MAX_BATCH_DELAY: float = 0.005
+    EVENT_STORE_MAX_BATCH_SIZE: int = 1000
+    READ_REPLICA_PATHS: list[str] = []
+    READ_REPLICA_MAX_LAG: int = 50
+    READ_REPLICA_REFRESH_INTERVAL: float = 1.0
+    QUERY_CACHE_MAX_ENTRIES: int = 1024
+    QUERY_CACHE_TTL: float = 60.0
+    ADMIN_USER_IDS: list[str] = []
 
 settings = Settings()
 
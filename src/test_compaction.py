@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime
+import os
+import tempfile
+import unittest
+
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.common.enums import LicenseType, Season, TrainingSessionPlayerStatus
+from src.common.eventsourcing.compaction import CompactionPolicy
+from src.common.eventsourcing.event_stores import JsonLinesEventStore
+from src.common.eventsourcing.repositories import EventStoreRepository
+from src.compaction import compact
+from src.domains.federation.model import Federation
+from src.domains.player.model import Player
+from src.domains.training_session.model import TrainingSession, TrainingSessionCreate
+
+
+class TestCompaction(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "event_store.jsonl")
+        self.archive_dir = os.path.join(self.directory.name, "archive")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def create_training_session(self, repo: EventStoreRepository[TrainingSession], start_time: datetime) -> TrainingSession:
+        training_session = TrainingSession(create=TrainingSessionCreate(actor_id=SYSTEM_ACTOR_ID, club_id="club", start_time=start_time, end_time=start_time.replace(hour=20)))
+        training_session.change_player_status(SYSTEM_ACTOR_ID, "player-1", TrainingSessionPlayerStatus.PRESENT)
+        training_session.change_player_status(SYSTEM_ACTOR_ID, "player-2", TrainingSessionPlayerStatus.ABSENT, reason="injured", with_reason=True)
+        training_session.change_player_status(SYSTEM_ACTOR_ID, "player-2", TrainingSessionPlayerStatus.LATE, arrival_time=start_time.replace(hour=19, minute=15))
+        asyncio.run(repo.save(training_session, -1))
+        return training_session
+
+    def test_closed_season_streams_are_replaced_by_snapshots(self) -> None:
+        store = JsonLinesEventStore(self.file_path, [])
+        training_session_repo = EventStoreRepository(store, TrainingSession)
+        federation_repo = EventStoreRepository(store, Federation)
+        old_session = self.create_training_session(training_session_repo, datetime(2023, 10, 2, 18))
+        active_session = self.create_training_session(training_session_repo, datetime(2025, 10, 2, 18))
+        federation = Federation()
+        federation.register_player_license("player-1", "L1", LicenseType.A, SYSTEM_ACTOR_ID)
+        federation.register_player_license("player-2", "L2", LicenseType.B, SYSTEM_ACTOR_ID)
+        federation.get_uncommitted_changes()[0].triggered_at = datetime(2024, 1, 10).isoformat()
+        asyncio.run(federation_repo.save(federation, -1))
+
+        report = compact(self.file_path, self.archive_dir, Season(2025, 2026))
+
+        assert report.compacted_streams == 2
+        assert report.archived_events == 5
+        assert report.segments == {"training_session-2023-2024", "FFHB-2024-2025"}
+        with open(os.path.join(self.archive_dir, "training_session-2023-2024.jsonl")) as f:
+            assert len(f.readlines()) == 4
+
+        store = JsonLinesEventStore(self.file_path, [])
+        assert asyncio.run(store.get_last_commit_position()) == 7
+        training_session_repo = EventStoreRepository(store, TrainingSession)
+        compacted = asyncio.run(training_session_repo.get_by_id(old_session.id))
+        assert compacted.version == 3
+        assert compacted.club_id == "club"
+        assert compacted.players == {"player-1": TrainingSessionPlayerStatus.PRESENT, "player-2": TrainingSessionPlayerStatus.LATE}
+        assert compacted.attendance["player-2"].arrival_time == datetime(2023, 10, 2, 19, 15).isoformat()
+        assert asyncio.run(training_session_repo.get_by_id(active_session.id)).version == 3
+
+        compacted.remove_player(SYSTEM_ACTOR_ID, "player-1")
+        asyncio.run(training_session_repo.save(compacted, compacted.version))
+        assert asyncio.run(training_session_repo.get_by_id(old_session.id)).version == 4
+
+        federation = asyncio.run(EventStoreRepository(store, Federation).get_singleton_aggregate())
+        assert federation.version == 1
+        assert set(federation.player_licenses) == {"L1", "L2"}
+
+    def test_compaction_is_idempotent(self) -> None:
+        store = JsonLinesEventStore(self.file_path, [])
+        self.create_training_session(EventStoreRepository(store, TrainingSession), datetime(2023, 10, 2, 18))
+
+        compact(self.file_path, self.archive_dir, Season(2025, 2026))
+        report = compact(self.file_path, self.archive_dir, Season(2025, 2026))
+
+        assert report.compacted_streams == 0
+        with open(self.file_path) as f:
+            assert len(f.readlines()) == 1
+
+    def test_policies_only_accept_aggregates_taking_snapshots(self) -> None:
+        with self.assertRaises(TypeError):
+            class PlayerCompactionPolicy(CompactionPolicy):
+                aggregate_type = Player
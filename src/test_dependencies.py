@@ -0,0 +1,27 @@
+import asyncio
+import unittest
+
+from fastapi import HTTPException
+
+from src.dependencies import check_admin_access
+from src.infrastructure.session_manager import Session
+from src.settings import settings
+
+
+class TestCheckAdminAccess(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.admin_user_ids = settings.ADMIN_USER_IDS
+        settings.ADMIN_USER_IDS = ["admin-1"]
+
+    def tearDown(self) -> None:
+        settings.ADMIN_USER_IDS = self.admin_user_ids
+        super().tearDown()
+
+    def test_only_admin_users_are_let_through(self) -> None:
+        admin = Session(user_id="admin-1")
+        assert asyncio.run(check_admin_access(admin)) is admin
+        with self.assertRaises(HTTPException) as raised:
+            asyncio.run(check_admin_access(Session(user_id="user-1", club_id="club-1")))
+        assert raised.exception.status_code == 403
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.common.constants import SYSTEM_ACTOR_ID
+from src.common.eventsourcing.event import IEvent
+from src.common.eventsourcing.event_stores import JsonLinesEventStore
+from src.domains.collective.events import CollectiveCreated
+from src.domains.training_session.events import TrainingSessionCreated
+from src.infrastructure.storages.engines import dispose_read_model_engines
+from src.infrastructure.websocket_manager import WebSocketManager
+from src.service_locator import service_locator
+from src.worker import Worker
+
+
+class RecordingWebSocketManager(WebSocketManager):
+    def __init__(self) -> None:
+        super().__init__()
+        self.sent : list[tuple[str, str]] = []
+
+    async def send_message(self, club_id: str, message: Any) -> None:
+        self.sent.append((club_id, message["type"]))
+
+class FailingWorker(Worker):
+    """
+    Worker failing to commit the projection of its n-th event.
+    """
+    fail_at : int | None = None
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.saves = 0
+
+    async def save_last_recorded_event_position(self, session: AsyncSession) -> None:
+        self.saves += 1
+        if self.saves == self.fail_at:
+            raise RuntimeError("projection failed")
+        await super().save_last_recorded_event_position(session)
+
+def training_session_created(training_session_id: str, club_id: str) -> TrainingSessionCreated:
+    return TrainingSessionCreated(actor_id=SYSTEM_ACTOR_ID, training_session_id=training_session_id, club_id=club_id, start_time="2025-10-02T18:00:00", end_time="2025-10-02T20:00:00")
+
+def collective_created(collective_id: str, club_id: str) -> CollectiveCreated:
+    return CollectiveCreated(actor_id=SYSTEM_ACTOR_ID, collective_id=collective_id, club_id=club_id, name=collective_id)
+
+
+class TestWorkerNotifications(unittest.TestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = JsonLinesEventStore(os.path.join(self.directory.name, "event_store.jsonl"), [])
+        self.url = f"sqlite+aiosqlite:///{os.path.join(self.directory.name, 'read_model.db')}"
+        self.websocket_manager = RecordingWebSocketManager()
+        service_locator.websocket_manager = self.websocket_manager
+
+    def tearDown(self) -> None:
+        asyncio.run(dispose_read_model_engines())
+        self.directory.cleanup()
+        super().tearDown()
+
+    def project(self, events: list[tuple[str, IEvent]], fail_at: int | None = None) -> None:
+        async def run() -> None:
+            for stream_id, event in events:
+                await self.store.save_events(stream_id, [event], -1)
+            worker = FailingWorker(self.store, self.url)
+            worker.fail_at = fail_at
+            await worker.init_db()
+            await worker.callback()
+        asyncio.run(run())
+
+    def test_each_message_is_sent_once_per_club_after_the_batch(self) -> None:
+        self.project([
+            ("training_session-1", training_session_created("1", "club-1")),
+            ("training_session-2", training_session_created("2", "club-1")),
+            ("collective-1", collective_created("1", "club-1")),
+            ("training_session-3", training_session_created("3", "club-2")),
+            ("collective-2", collective_created("2", "club-1"))])
+
+        assert self.websocket_manager.sent == [
+            ("club-1", "club_training_session_list_updated"),
+            ("club-1", "club_collective_list_updated"),
+            ("club-2", "club_training_session_list_updated")]
+
+    def test_messages_of_a_failed_projection_are_dropped_and_committed_ones_flushed(self) -> None:
+        self.project([
+            ("training_session-1", training_session_created("1", "club-1")),
+            ("collective-1", collective_created("1", "club-2")),
+            ("training_session-2", training_session_created("2", "club-3"))], fail_at=2)
+
+        assert self.websocket_manager.sent == [("club-1", "club_training_session_list_updated")]
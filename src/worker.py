@@ -2,13 +2,14 @@ import os
 import threading
 import asyncio
 from time import sleep
+from typing import Callable
 
 from multipledispatch import dispatch
 from src.common.enums import TrainingSessionPlayerStatus
 from src.common.eventsourcing.event import IEvent
 from src.common.loggers import app_logger
 from src.common.eventsourcing.event_stores import IEventStore
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from sqlalchemy import select
 
 from src.domains.club import events as club_events
@@ -16,19 +17,28 @@ from src.domains.player import events as player_events
 from src.domains.user import events as user_events
 from src.domains.collective import events as collective_events
 from src.domains.training_session import events as training_session_events
+from src.infrastructure.storages.attendance_stats import count_attendance, uncount_training_session
+from src.infrastructure.storages.attendance_sheet import record_attendance, record_training_session_attendance, remove_attendance, update_attendance_player
+from src.infrastructure.storages.migrations import migrate
+from src.infrastructure.storages.player_search import index_player
+from src.infrastructure.storages.engines import read_model_engines
 from src.infrastructure.storages.sql_model import Club, Collective, CollectivePlayer, LastRecordedEventPosition, Base, Player, TrainingSession, TrainingSessionPlayer, User
+from src.read_facades.projection_versions import ProjectionVersions
+from src.read_facades.query_cache import CLUBS_TAG, QueryCache, club_tag
 from src.service_locator import service_locator
 
 class Worker:
-    def __init__(self, event_store: IEventStore, url: str):
+    def __init__(self, event_store: IEventStore, url: str, on_position_recorded: Callable[[int], None] | None = None, query_cache: QueryCache | None = None, projection_versions: ProjectionVersions | None = None):
         self.event_store = event_store
         self.url = url
-        self.async_engine = create_async_engine(url, 
-                                                echo=False, 
-                                                pool_size=10,
-                                                max_overflow=20,
-                                                pool_pre_ping=True,
-                                                pool_recycle=3600)
+        self.on_position_recorded = on_position_recorded
+        self.query_cache = query_cache
+        self.projection_versions = projection_versions
+        self.__invalidated_tags : set[str] = set()
+        self.__touched_clubs : set[str] = set()
+        self.__pending_notifications : dict[str, list[str]] = {}
+        self.__notifications : dict[str, list[str]] = {}
+        self.async_engine = read_model_engines(url).write_engine
         self.async_session_maker = async_sessionmaker(self.async_engine, expire_on_commit=False)
         self.__stop = False
         self.__last_recorded_event_position = 0
@@ -37,31 +47,78 @@ class Worker:
         metadata = Base.metadata
         db_path = self.url.split(":///")[1]
         app_logger.info(f"DB path: {db_path}")
-        if os.path.exists(db_path):
-            os.remove(db_path)
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
 
         # 2. Recreate schema
         async with self.async_engine.begin() as conn:
-            await conn.run_sync(metadata.create_all)
+            await conn.run_sync(migrate, metadata)
 
     async def callback(self) -> None:
         current_commit_position = await self.event_store.get_last_commit_position()
         if current_commit_position != self.__last_recorded_event_position:
-            subscription = await self.event_store.get_all_events_from_position(self.__last_recorded_event_position)
             try:
                 async with self.async_session_maker() as session:
-                    if len(subscription) == 0:
-                        return
-                    for event in subscription:
+                    async for event in self.event_store.iter_all_events_from_position(self.__last_recorded_event_position):
                         app_logger.debug(f"Processing event {event.event_id} : {event.type}")
                         self.__last_recorded_event_position = self.__last_recorded_event_position+1
                         await self.handle(event, session)
+                        # the position is committed with the projection, a single write connection is shared
+                        await self.save_last_recorded_event_position(session)
                         await session.commit()
-                        await self.save_last_recorded_event_position()
+                        self.flush_invalidations()
+                        self.commit_notifications()
+                        if self.on_position_recorded:
+                            self.on_position_recorded(self.__last_recorded_event_position)
                         if current_commit_position == self.__last_recorded_event_position:
                             break
             except Exception as e:
                 app_logger.error(e)
+            finally:
+                self.__pending_notifications.clear()
+                await self.flush_notifications()
+
+    def invalidate(self, *tags: str) -> None:
+        """
+        Mark cached query results as stale, they are dropped once the projection is committed.
+        """
+        self.__invalidated_tags.update(tags)
+
+    def invalidate_club(self, club_id: str, *entities: str) -> None:
+        """
+        Mark the club as changed, and its cached query results on the given entities as stale.
+        """
+        self.__touched_clubs.add(club_id)
+        self.invalidate(*[club_tag(club_id, entity) for entity in entities])
+
+    def flush_invalidations(self) -> None:
+        if self.query_cache and self.__invalidated_tags:
+            self.query_cache.invalidate(*self.__invalidated_tags)
+        if self.projection_versions and self.__touched_clubs:
+            self.projection_versions.bump(*self.__touched_clubs)
+        self.__invalidated_tags.clear()
+        self.__touched_clubs.clear()
+
+    def notify(self, club_id: str, message_type: str) -> None:
+        """
+        Queue a message to the websockets of the club, it is sent once, after the batch of events is committed.
+        """
+        message_types = self.__pending_notifications.setdefault(club_id, [])
+        if message_type not in message_types:
+            message_types.append(message_type)
+
+    def commit_notifications(self) -> None:
+        for club_id, message_types in self.__pending_notifications.items():
+            committed = self.__notifications.setdefault(club_id, [])
+            committed.extend(message_type for message_type in message_types if message_type not in committed)
+        self.__pending_notifications.clear()
+
+    async def flush_notifications(self) -> None:
+        notifications, self.__notifications = self.__notifications, {}
+        for club_id, message_types in notifications.items():
+            for message_type in message_types:
+                await service_locator.websocket_manager.send_message(club_id, {"type": message_type})
 
     async def get_last_recorded_event_position(self) -> None:
         async with self.async_session_maker() as session:
@@ -72,10 +129,8 @@ class Worker:
             else:
                 self.__last_recorded_event_position = 0
 
-    async def save_last_recorded_event_position(self) -> None:
-        async with self.async_session_maker() as session:
-            await session.merge(LastRecordedEventPosition(id=1, position=self.__last_recorded_event_position))
-            await session.commit()
+    async def save_last_recorded_event_position(self, session: AsyncSession) -> None:
+        await session.merge(LastRecordedEventPosition(id=1, position=self.__last_recorded_event_position))
 
     def stop(self) -> None:
         self.__stop = True
@@ -100,6 +155,8 @@ class Worker:
         club = Club(id=event.club_id, name=event.name, registration_number=event.registration_number, owner_id=event.owner_id)
         session.add(club)
         await session.merge(club)
+        self.invalidate(CLUBS_TAG)
+        self.invalidate_club(event.club_id)
 
     @dispatch(club_events.ClubOwnerChanged, AsyncSession)
     async def handle(self, event: club_events.ClubOwnerChanged, session: AsyncSession) -> None:
@@ -108,6 +165,8 @@ class Worker:
         if club:
             club.owner_id = event.new_owner_id
             await session.merge(club)
+        self.invalidate(CLUBS_TAG)
+        self.invalidate_club(event.club_id)
 
 
     @dispatch(user_events.UserSignedUp, AsyncSession)
@@ -132,6 +191,8 @@ class Worker:
         app_logger.info(f"PlayerRegistered: {event.player_id}")
         player = Player(id=event.player_id, first_name=event.first_name, last_name=event.last_name, gender=event.gender, date_of_birth=event.date_of_birth, license_number=event.license_number)
         await session.merge(player)
+        await index_player(session, event.player_id)
+        await update_attendance_player(session, event.player_id)
 
     @dispatch(player_events.PlayerRegisteredToClub, AsyncSession)
     async def handle(self, event: player_events.PlayerRegisteredToClub, session: AsyncSession) -> None:
@@ -142,11 +203,14 @@ class Worker:
             player.season = event.season
             player.license_type = event.license_type
             await session.merge(player)
+            await update_attendance_player(session, event.player_id)
         club = await session.get(Club, event.club_id)
         if club:
             club.number_of_players = club.number_of_players + 1
             await session.merge(club)
-        await service_locator.websocket_manager.send_message(event.club_id, {"type": "club_player_list_updated"})
+        self.invalidate(CLUBS_TAG)
+        self.invalidate_club(event.club_id)
+        self.notify(event.club_id, "club_player_list_updated")
 
     @dispatch(player_events.PlayerUnregisteredFromClub, AsyncSession)
     async def handle(self, event: player_events.PlayerUnregisteredFromClub, session: AsyncSession) -> None:
@@ -159,14 +223,17 @@ class Worker:
         if club:
             club.number_of_players = club.number_of_players - 1
             await session.merge(club)
-        await service_locator.websocket_manager.send_message(event.club_id, {"type": "club_player_list_updated"})
+        self.invalidate(CLUBS_TAG)
+        self.invalidate_club(event.club_id)
+        self.notify(event.club_id, "club_player_list_updated")
     @dispatch(collective_events.CollectiveCreated, AsyncSession)
     async def handle(self, event: collective_events.CollectiveCreated, session: AsyncSession) -> None:
         app_logger.info(f"CollectiveCreated: {event.collective_id}")
         collective = Collective(id=event.collective_id, club_id=event.club_id, name=event.name, description=event.description)
         session.add(collective)
         await session.merge(collective)
-        await service_locator.websocket_manager.send_message(event.club_id, {"type": "club_collective_list_updated"})
+        self.invalidate_club(event.club_id, "collectives")
+        self.notify(event.club_id, "club_collective_list_updated")
 
     @dispatch(collective_events.PlayerAddedToCollective, AsyncSession)
     async def handle(self, event: collective_events.PlayerAddedToCollective, session: AsyncSession) -> None:
@@ -181,7 +248,8 @@ class Worker:
         if collective:
             collective.number_of_players = collective.number_of_players + 1
             await session.merge(collective)
-        await service_locator.websocket_manager.send_message(collective.club_id, {"type": "club_collective_list_updated"})
+        self.invalidate_club(collective.club_id, "collectives")
+        self.notify(collective.club_id, "club_collective_list_updated")
 
     @dispatch(collective_events.PlayerRemovedFromCollective, AsyncSession)
     async def handle(self, event: collective_events.PlayerRemovedFromCollective, session: AsyncSession) -> None:
@@ -195,7 +263,8 @@ class Worker:
         if collective:
             collective.number_of_players = collective.number_of_players - 1
             await session.merge(collective)
-        await service_locator.websocket_manager.send_message(collective.club_id, {"type": "club_collective_list_updated"})
+        self.invalidate_club(collective.club_id, "collectives")
+        self.notify(collective.club_id, "club_collective_list_updated")
 
     @dispatch(training_session_events.TrainingSessionCreated, AsyncSession)
     async def handle(self, event: training_session_events.TrainingSessionCreated, session: AsyncSession) -> None:
@@ -203,7 +272,8 @@ class Worker:
         training_session = TrainingSession(id=event.training_session_id, club_id=event.club_id, start_time=event.start_time, end_time=event.end_time)
         session.add(training_session)
         await session.merge(training_session)
-        await service_locator.websocket_manager.send_message(event.club_id, {"type": "club_training_session_list_updated"})
+        self.invalidate_club(event.club_id, "training_sessions")
+        self.notify(event.club_id, "club_training_session_list_updated")
 
     @dispatch(training_session_events.PlayerTrainingSessionStatusChangedToPresent, AsyncSession)
     async def handle(self, event: training_session_events.PlayerTrainingSessionStatusChangedToPresent, session: AsyncSession) -> None:
@@ -218,6 +288,7 @@ class Worker:
                     training_session.number_of_players_absent -= 1
                 case TrainingSessionPlayerStatus.LATE:
                     training_session.number_of_players_late -= 1
+            await count_attendance(session, training_session, event.player_id, training_session_player.status, training_session_player.with_reason, -1)
             await session.merge(training_session_player)
             training_session_player.status = TrainingSessionPlayerStatus.PRESENT
             training_session_player.reason = None
@@ -229,11 +300,14 @@ class Worker:
             session.add(training_session_player)
             await session.merge(training_session_player)
         app_logger.info(f"PlayerTrainingSessionStatusChangedToPresent: {event.training_session_id}")
+        await record_attendance(session, event.training_session_id, event.player_id)
+        await count_attendance(session, training_session, event.player_id, TrainingSessionPlayerStatus.PRESENT, False, 1)
         
         training_session.number_of_players_present += 1
         await session.merge(training_session)
-        await service_locator.websocket_manager.send_message(training_session.club_id, {"type": "club_training_session_updated"})
-        await service_locator.websocket_manager.send_message(training_session.club_id, {"type": "club_training_session_list_updated"})
+        self.notify(training_session.club_id, "club_training_session_updated")
+        self.invalidate_club(training_session.club_id, "training_sessions")
+        self.notify(training_session.club_id, "club_training_session_list_updated")
         
     @dispatch(training_session_events.PlayerTrainingSessionStatusChangedToAbsent, AsyncSession)
     async def handle(self, event: training_session_events.PlayerTrainingSessionStatusChangedToAbsent, session: AsyncSession) -> None:
@@ -248,6 +322,7 @@ class Worker:
                     return
                 case TrainingSessionPlayerStatus.LATE:
                     training_session.number_of_players_late -= 1
+            await count_attendance(session, training_session, event.player_id, training_session_player.status, training_session_player.with_reason, -1)
             await session.merge(training_session_player)
             training_session_player.status = TrainingSessionPlayerStatus.ABSENT
             training_session_player.reason = event.reason
@@ -259,11 +334,14 @@ class Worker:
             session.add(training_session_player)
             await session.merge(training_session_player)
         app_logger.info(f"PlayerTrainingSessionStatusChangedToAbsent: {event.training_session_id}")
+        await record_attendance(session, event.training_session_id, event.player_id)
+        await count_attendance(session, training_session, event.player_id, TrainingSessionPlayerStatus.ABSENT, event.with_reason, 1)
         
         training_session.number_of_players_absent += 1
         await session.merge(training_session)
-        await service_locator.websocket_manager.send_message(training_session.club_id, {"type": "club_training_session_updated"})
-        await service_locator.websocket_manager.send_message(training_session.club_id, {"type": "club_training_session_list_updated"})
+        self.notify(training_session.club_id, "club_training_session_updated")
+        self.invalidate_club(training_session.club_id, "training_sessions")
+        self.notify(training_session.club_id, "club_training_session_list_updated")
     
     @dispatch(training_session_events.PlayerTrainingSessionStatusChangedToLate, AsyncSession)
     async def handle(self, event: training_session_events.PlayerTrainingSessionStatusChangedToLate, session: AsyncSession) -> None:
@@ -278,6 +356,7 @@ class Worker:
                     training_session.number_of_players_absent -= 1
                 case TrainingSessionPlayerStatus.LATE:
                     training_session.number_of_players_late -= 1
+            await count_attendance(session, training_session, event.player_id, training_session_player.status, training_session_player.with_reason, -1)
             await session.merge(training_session_player)
             training_session_player.status = TrainingSessionPlayerStatus.LATE
             training_session_player.reason = event.reason
@@ -289,11 +368,14 @@ class Worker:
             session.add(training_session_player)
             await session.merge(training_session_player)
         app_logger.info(f"PlayerTrainingSessionStatusChangedToLate: {event.training_session_id}")
+        await record_attendance(session, event.training_session_id, event.player_id)
+        await count_attendance(session, training_session, event.player_id, TrainingSessionPlayerStatus.LATE, event.with_reason, 1)
         
         training_session.number_of_players_late += 1
         await session.merge(training_session)
-        await service_locator.websocket_manager.send_message(training_session.club_id, {"type": "club_training_session_updated"})
-        await service_locator.websocket_manager.send_message(training_session.club_id, {"type": "club_training_session_list_updated"})
+        self.notify(training_session.club_id, "club_training_session_updated")
+        self.invalidate_club(training_session.club_id, "training_sessions")
+        self.notify(training_session.club_id, "club_training_session_list_updated")
 
     @dispatch(training_session_events.PlayerRemovedFromTrainingSession, AsyncSession)
     async def handle(self, event: training_session_events.PlayerRemovedFromTrainingSession, session: AsyncSession) -> None:
@@ -308,10 +390,31 @@ class Worker:
                     training_session.number_of_players_absent -= 1
                 case TrainingSessionPlayerStatus.LATE:
                     training_session.number_of_players_late -= 1
+            await count_attendance(session, training_session, event.player_id, training_session_player.status, training_session_player.with_reason, -1)
             await session.delete(training_session_player)
+            await remove_attendance(session, event.training_session_id, event.player_id)
             await session.commit()
             app_logger.info(f"PlayerRemovedFromTrainingSession: {event.training_session_id}")
         
             await session.merge(training_session)
-            await service_locator.websocket_manager.send_message(training_session.club_id, {"type": "club_training_session_updated"})
-            await service_locator.websocket_manager.send_message(training_session.club_id, {"type": "club_training_session_list_updated"})
+            self.notify(training_session.club_id, "club_training_session_updated")
+            self.invalidate_club(training_session.club_id, "training_sessions")
+            self.notify(training_session.club_id, "club_training_session_list_updated")
+
+    @dispatch(training_session_events.TrainingSessionSnapshotTaken, AsyncSession)
+    async def handle(self, event: training_session_events.TrainingSessionSnapshotTaken, session: AsyncSession) -> None:
+        app_logger.info(f"TrainingSessionSnapshotTaken: {event.training_session_id}")
+        self.invalidate_club(event.club_id, "training_sessions")
+        statuses = [TrainingSessionPlayerStatus(attendance.status) for attendance in event.attendance]
+        training_session = TrainingSession(id=event.training_session_id, club_id=event.club_id, start_time=event.start_time, end_time=event.end_time,
+                                           number_of_players_present=statuses.count(TrainingSessionPlayerStatus.PRESENT),
+                                           number_of_players_absent=statuses.count(TrainingSessionPlayerStatus.ABSENT),
+                                           number_of_players_late=statuses.count(TrainingSessionPlayerStatus.LATE))
+        previous_training_session = await session.get(TrainingSession, event.training_session_id)
+        if previous_training_session:
+            await uncount_training_session(session, previous_training_session)
+        await session.merge(training_session)
+        for attendance in event.attendance:
+            await session.merge(TrainingSessionPlayer(training_session_id=event.training_session_id, player_id=attendance.player_id, status=TrainingSessionPlayerStatus(attendance.status), reason=attendance.reason, with_reason=attendance.with_reason, arrival_time=attendance.arrival_time))
+            await count_attendance(session, training_session, attendance.player_id, attendance.status, attendance.with_reason, 1)
+        await record_training_session_attendance(session, event.training_session_id)